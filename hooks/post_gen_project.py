@@ -36,6 +36,7 @@ DATABASE_ENGINE = "{{ cookiecutter.database_engine }}"
 if not USE_CELERY:
     remove_file("{{ cookiecutter.project_slug }}/config/celery.py")
     remove_file("{{ cookiecutter.project_slug }}/apps/core/tasks.py")
+    remove_file("{{ cookiecutter.project_slug }}/apps/accounts/tasks.py")
     print("✓ Removed Celery configuration (not selected)")
 
 # Update settings if SQLite is selected
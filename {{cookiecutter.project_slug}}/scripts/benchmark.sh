@@ -0,0 +1,80 @@
+#!/bin/bash
+#
+# Compare the sync (WSGI) and async (ASGI) server profiles of {{ cookiecutter.project_name }}
+#
+# Usage: ./scripts/benchmark.sh [path ...]
+# Example: SESSION_ID=<sessionid cookie> ./scripts/benchmark.sh /dashboard/stats/ /pages/terms/
+#
+# For each SERVER_MODE the script starts gunicorn with config/gunicorn.py,
+# runs wrk against every path and reports requests/sec, latency and the total
+# RSS of the gunicorn processes. It then opens SSE_CLIENTS concurrent
+# /dashboard/events/ streams and counts how many are still open after
+# SSE_HOLD seconds.
+#
+# Requirements: wrk, curl. Run from the project root with the virtualenv active.
+
+set -e
+
+PORT="${PORT:-8765}"
+DURATION="${DURATION:-30s}"
+CONNECTIONS="${CONNECTIONS:-200}"
+THREADS="${THREADS:-4}"
+SSE_CLIENTS="${SSE_CLIENTS:-500}"
+SSE_HOLD="${SSE_HOLD:-10}"
+if [ "$#" -eq 0 ]; then
+    set -- /dashboard/stats/ /pages/terms/
+fi
+PATHS=("$@")
+
+cd "$(dirname "$0")/../{{ cookiecutter.project_slug }}"
+
+HEADERS=()
+if [ -n "${SESSION_ID}" ]; then
+    HEADERS=(-H "Cookie: sessionid=${SESSION_ID}")
+fi
+
+rss_mb() {
+    # Total resident memory of the master and all workers
+    local pids
+    pids="$(pgrep -d, -f "gunicorn.*config/gunicorn.py" || true)"
+    [ -z "${pids}" ] && echo 0 && return
+    ps -o rss= -p "${pids}" | awk '{ sum += $1 } END { printf "%.0f", sum / 1024 }'
+}
+
+for mode in sync async; do
+    echo "=== SERVER_MODE=${mode} ==="
+    SERVER_MODE="${mode}" PORT="${PORT}" gunicorn --config config/gunicorn.py \
+        --log-level warning --access-logfile /dev/null &
+    server_pid=$!
+    trap 'kill ${server_pid} 2>/dev/null' EXIT
+
+    until curl -s -o /dev/null "http://127.0.0.1:${PORT}/"; do sleep 1; done
+
+    for path in "${PATHS[@]}"; do
+        echo "--- ${path}"
+        wrk -t"${THREADS}" -c"${CONNECTIONS}" -d"${DURATION}" --latency "${HEADERS[@]}" \
+            "http://127.0.0.1:${PORT}${path}" | grep -E "Requests/sec|Latency|99%|Non-2xx|Socket errors"
+    done
+    echo "RSS: $(rss_mb) MB"
+
+    echo "--- ${SSE_CLIENTS} concurrent /dashboard/events/ streams"
+    sse_pids=()
+    for _ in $(seq "${SSE_CLIENTS}"); do
+        curl -s -N "${HEADERS[@]}" -o /dev/null --max-time $((SSE_HOLD + 5)) \
+            "http://127.0.0.1:${PORT}/dashboard/events/" &
+        sse_pids+=($!)
+    done
+    sleep "${SSE_HOLD}"
+    open=0
+    for pid in "${sse_pids[@]}"; do
+        kill -0 "${pid}" 2>/dev/null && open=$((open + 1))
+    done
+    echo "Open after ${SSE_HOLD}s: ${open}/${SSE_CLIENTS} (sync mode closes each stream after one event)"
+    echo "RSS: $(rss_mb) MB"
+    kill "${sse_pids[@]}" 2>/dev/null || true
+
+    kill "${server_pid}"
+    wait "${server_pid}" 2>/dev/null || true
+    trap - EXIT
+    echo
+done
@@ -65,6 +65,9 @@ sudo -u app bash << EOF
     
     # Compile translations
     python manage.py compilemessages || true
+    
+    # Export static pages for nginx (only when PAGE_EXPORT_ROOT is set)
+    python manage.py export_pages || true
 EOF
 
 # Reload systemd and restart services
@@ -5,3 +5,7 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"
     verbose_name = "Accounts"
+
+    def ready(self):
+        # キャッシュ無効化・アバター変換のシグナルを登録
+        from . import avatars, user_cache  # noqa: F401
@@ -0,0 +1,197 @@
+"""
+Avatar processing.
+
+アップロードされたアバター画像を、リクエストの外（Celery、無い構成ではプロセス内のスレッド）で
+正方形に切り抜き、AVATAR_SIZES の各サイズのWebPに変換する。
+
+- 向きは EXIF の Orientation を反映してから、EXIF を含めずに書き出す（位置情報などを残さない）
+- 変換後のファイルは avatars/<pk>/<トークン>-<サイズ>.webp に保存し、User.avatar は
+  最大サイズを指す。他のサイズのパスは名前から求まるため、表示時にストレージを参照しない
+- トークンは元のファイル名から決まり、画像を変更するとURLも変わる（長期キャッシュできる）
+- 変換が終わるまでは元の画像をそのまま表示する
+
+テンプレートでは {% raw %}{% avatar_url user 64 as url %}{% endraw %}（accounts_tags）で参照する。
+"""
+import functools
+import hashlib
+import io
+import logging
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.core import background
+
+logger = logging.getLogger(__name__)
+
+AVATAR_DIR = 'avatars/{pk}/'
+# データベースの正規表現検索（unprocessed_users）と共用するため、名前付きグループは使わない
+PROCESSED_PATTERN = r'^avatars/[0-9]+/[0-9a-f]{12}-[0-9]+\.webp$'
+_PROCESSED = re.compile(PROCESSED_PATTERN)
+
+
+
+def is_processed(name):
+    """
+    変換済みのアバターのファイル名かどうか
+    """
+    return bool(name) and _PROCESSED.match(name) is not None
+
+
+def variant_name(name, size):
+    """
+    変換済みのアバターの指定サイズのファイル名
+    """
+    return f"{name.rsplit('-', 1)[0]}-{size}.webp"
+
+
+def pick_size(size):
+    """
+    指定サイズ以上で最小の生成サイズ（無ければ最大のサイズ）
+    """
+    sizes = settings.AVATAR_SIZES
+    return next((candidate for candidate in sizes if candidate >= size), sizes[-1])
+
+
+@functools.lru_cache(maxsize=4096)
+def _variant_url(name, size):
+    return User._meta.get_field('avatar').storage.url(variant_name(name, size))
+
+
+@receiver(setting_changed)
+def _clear_url_cache(setting, **kwargs):
+    if setting in ('MEDIA_URL', 'STORAGES', 'AVATAR_SIZES'):
+        _variant_url.cache_clear()
+
+
+def avatar_url(user, size):
+    """
+    表示サイズ size（px）に合うアバターのURL。アバターが無ければ空文字列
+
+    URLはプロセス内でファイル名・サイズごとにキャッシュする。
+    """
+    name = user.avatar.name if user.avatar else ''
+    if not name:
+        return ''
+    if not is_processed(name) or not name.endswith(f'-{settings.AVATAR_SIZES[-1]}.webp'):
+        # 変換前（アップロード直後）と AVATAR_SIZES の変更前に変換した画像はそのまま使う
+        return user.avatar.url
+    return _variant_url(name, pick_size(size))
+
+
+def render_avatars(fp, sizes):
+    """
+    画像を正方形に切り抜き、各サイズのWebPに変換する（EXIF は含めない）
+
+    Returns:
+        {サイズ: WebPのバイト列}
+    """
+    from PIL import Image, ImageOps
+
+    largest = max(sizes)
+    with Image.open(fp) as image:
+        # JPEG は縮小した解像度で読み込む（大きな写真のデコードを省く）
+        image.draft('RGB', (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P', 'PA') else 'RGB')
+        image = ImageOps.fit(image, (largest, largest), Image.Resampling.LANCZOS)
+
+    rendered = {}
+    for size in sizes:
+        resized = image if size == largest else image.resize((size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        resized.save(output, 'WEBP', quality=settings.AVATAR_WEBP_QUALITY, method=6)
+        rendered[size] = output.getvalue()
+    return rendered
+
+
+def process_avatar(pk, name):
+    """
+    アバターを変換して User.avatar を差し替える
+
+    変換中に別の画像がアップロードされた場合は何もしない。
+
+    Returns:
+        差し替えた場合は True
+    """
+    field = User._meta.get_field('avatar')
+    storage = field.storage
+    token = hashlib.sha256(name.encode()).hexdigest()[:12]
+    directory = AVATAR_DIR.format(pk=pk)
+
+    saved = []
+    try:
+        with storage.open(name, 'rb') as source:
+            rendered = render_avatars(source, settings.AVATAR_SIZES)
+        for size, content in sorted(rendered.items()):
+            path = f'{directory}{token}-{size}.webp'
+            if storage.exists(path):
+                storage.delete(path)
+            saved.append(storage.save(path, ContentFile(content)))
+    except FileNotFoundError:
+        return False
+    except Exception:
+        logger.exception("アバターを変換できませんでした: user=%s", pk)
+        for path in saved:
+            storage.delete(path)
+        return False
+
+    updated = User._default_manager.filter(pk=pk, avatar=name).update(
+        avatar=saved[-1], updated_at=timezone.now(),
+    )
+    if not updated:
+        for path in saved:
+            storage.delete(path)
+        return False
+
+    from apps.accounts.user_cache import invalidate_cached_user
+
+    invalidate_cached_user(pk)
+    # 元の画像と以前のアバターを削除する
+    storage.delete(name)
+    _, files = storage.listdir(directory)
+    for filename in files:
+        if not filename.startswith(f'{token}-'):
+            storage.delete(directory + filename)
+    return True
+
+
+def unprocessed_users():
+    """
+    変換前のアバターを持つユーザー
+    """
+    return (
+        User._default_manager
+        .exclude(avatar__isnull=True)
+        .exclude(avatar='')
+        .exclude(avatar__regex=PROCESSED_PATTERN)
+    )
+
+
+def schedule_processing(user):
+    """
+    コミット後にアバターの変換を予約する
+    """
+    pk, name = user.pk, user.avatar.name
+    try:
+        from apps.accounts.tasks import process_avatar_task
+    except ImportError:
+        # Celeryを使わない構成では、リクエストを待たせないようプロセス内のスレッドで変換する
+        transaction.on_commit(lambda: background.submit('avatar', process_avatar, pk, name))
+        return
+    transaction.on_commit(lambda: process_avatar_task.delay(pk, name))
+
+
+@receiver(post_save, sender=User)
+def _process_on_upload(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'avatar' not in update_fields:
+        return
+    if instance.avatar and not is_processed(instance.avatar.name):
+        schedule_processing(instance)
@@ -0,0 +1,18 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+
+from .user_cache import get_cached_user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    セッションからのユーザー取得をキャッシュ経由で行う認証バックエンド
+    """
+
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        # ModelBackend.aget_user はキャッシュを経由しないため、同期版に委ねる
+        return await sync_to_async(self.get_user)(user_id)
@@ -1,3 +1,5 @@
+import unicodedata
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm
 from django.contrib.auth import authenticate
@@ -98,7 +100,7 @@ class SignupForm(TurnstileMixin, UserCreationForm):
     
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
+        if email and User.objects.with_email(email).exists():
             raise forms.ValidationError(_("このメールアドレスは既に使用されています。"))
         return email
     
@@ -124,6 +126,19 @@ class CustomPasswordResetForm(TurnstileMixin, PasswordResetForm):
         })
     )
 
+    def get_users(self, email):
+        # 標準の email__iexact（UPPER）ではインデックスを使えないため、LOWER(email) で検索する
+        active_users = User.objects.with_email(email).filter(is_active=True)
+        return (
+            user for user in active_users
+            if user.has_usable_password() and _same_email(email, user.email)
+        )
+
+
+def _same_email(email1, email2):
+    # データベースの LOWER と異なる大文字・小文字の対応（Unicode）で一致させない
+    return unicodedata.normalize('NFKC', email1).casefold() == unicodedata.normalize('NFKC', email2).casefold()
+
 
 class ProfileForm(forms.ModelForm):
     """
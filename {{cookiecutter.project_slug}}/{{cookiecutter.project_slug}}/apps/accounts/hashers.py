@@ -0,0 +1,56 @@
+"""
+Password hashers with configurable cost.
+
+Django標準のハッシャーのコストを設定から読み込む。値はホストで
+`python manage.py calibrate_password_hasher` を実行して、目標の計算時間に合わせて決める。
+アルゴリズム名は標準と同じなので、既存のハッシュはそのまま検証できる。
+コストを変更すると、次回ログイン時にバックグラウンドでハッシュを更新する（apps.accounts.rehash）。
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(name, default):
+    value = getattr(settings, name, None)
+    return int(value) if value else default
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id（PASSWORD_ARGON2_TIME_COST / MEMORY_COST / PARALLELISM）
+    """
+
+    @property
+    def time_cost(self):
+        return _cost('PASSWORD_ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _cost('PASSWORD_ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _cost('PASSWORD_ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt（PASSWORD_SCRYPT_WORK_FACTOR）
+    """
+    # OpenSSL の既定の上限（32MiB）では work_factor 2**15 以上を計算できない。
+    # 確保するメモリは 128 * work_factor * block_size バイトで、この値は上限のみ
+    maxmem = 1024 ** 3
+
+    @property
+    def work_factor(self):
+        return _cost('PASSWORD_SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256（PASSWORD_PBKDF2_ITERATIONS）
+    """
+
+    @property
+    def iterations(self):
+        return _cost('PASSWORD_PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
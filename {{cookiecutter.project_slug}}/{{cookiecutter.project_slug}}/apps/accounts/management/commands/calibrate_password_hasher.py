@@ -0,0 +1,136 @@
+"""
+Calibrate password hashing cost on this host.
+"""
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError
+
+PASSWORD = "calibrate-password-hasher"
+
+
+class Command(BaseCommand):
+    help = "パスワードハッシュの計算時間を計測し、目標時間に収まるコスト設定を出力します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm",
+            choices=["argon2", "scrypt", "pbkdf2"],
+            default=settings.PASSWORD_HASHER,
+            help="計測するアルゴリズム（デフォルト: PASSWORD_HASHER）",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250,
+            help="1回のハッシュ計算の目標時間（ミリ秒）",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="同時に計算する数。ピーク時の同時ログイン数（ワーカー数）に合わせる",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=3,
+            help="設定ごとの計測回数（中央値を使う）",
+        )
+
+    def handle(self, *args, **options):
+        self.concurrency = max(1, options["concurrency"])
+        self.samples = max(1, options["samples"])
+        target = options["target_ms"] / 1000
+        algorithm = options["algorithm"]
+
+        calibrate = getattr(self, f"calibrate_{algorithm}")
+        try:
+            params, latency = calibrate(target)
+        except ValueError as e:
+            # ライブラリ未インストール（argon2-cffi など）
+            raise CommandError(str(e))
+
+        if latency > target:
+            self.stderr.write(self.style.WARNING(
+                f"最小のコストでも目標時間を超えています（{latency * 1000:.0f}ms）"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"{algorithm}: {latency * 1000:.0f}ms / 回（同時 {self.concurrency}）"
+        ))
+        self.stdout.write(f"PASSWORD_HASHER={algorithm}")
+        for name, value in params.items():
+            self.stdout.write(f"{name}={value}")
+
+    def measure(self, hasher):
+        """
+        concurrency 個のスレッドで同時にハッシュを計算し、1回あたりの時間（秒）の中央値を返す
+        """
+        hasher = hasher()
+        salt = hasher.salt()
+        results = []
+
+        def run():
+            started = time.perf_counter()
+            hasher.encode(PASSWORD, salt)
+            results.append(time.perf_counter() - started)
+
+        for _ in range(self.samples):
+            threads = [threading.Thread(target=run) for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return statistics.median(results)
+
+    def search(self, base, name, candidates, target, **fixed):
+        """
+        目標時間に収まる最大のコストを探す（候補は昇順）
+        """
+        best = None
+        for value in candidates:
+            params = dict(fixed, **{name: value})
+            latency = self.measure(type(base.__name__, (base,), params))
+            self.stdout.write(f"  {name}={value}: {latency * 1000:.0f}ms")
+            if best is not None and latency > target:
+                break
+            best = (value, latency)
+            if latency > target:
+                break
+        return best
+
+    def calibrate_argon2(self, target):
+        base = hashers.Argon2PasswordHasher
+        base()._load_library()
+        # メモリ量と並列数は現在の設定のまま、反復回数で調整する
+        memory_cost = int(settings.PASSWORD_ARGON2_MEMORY_COST or base.memory_cost)
+        parallelism = int(settings.PASSWORD_ARGON2_PARALLELISM or base.parallelism)
+        time_cost, latency = self.search(
+            base, "time_cost", range(1, 21), target,
+            memory_cost=memory_cost, parallelism=parallelism,
+        )
+        return {
+            "PASSWORD_ARGON2_TIME_COST": time_cost,
+            "PASSWORD_ARGON2_MEMORY_COST": memory_cost,
+            "PASSWORD_ARGON2_PARALLELISM": parallelism,
+        }, latency
+
+    def calibrate_scrypt(self, target):
+        base = hashers.ScryptPasswordHasher
+        work_factor, latency = self.search(
+            base, "work_factor", [2 ** n for n in range(10, 21)], target, maxmem=1024 ** 3,
+        )
+        return {"PASSWORD_SCRYPT_WORK_FACTOR": work_factor}, latency
+
+    def calibrate_pbkdf2(self, target):
+        base = hashers.PBKDF2PasswordHasher
+        # 計算時間は反復回数に比例するので、1回の計測から見積もって確認する
+        sample = 100_000
+        latency = self.measure(type(base.__name__, (base,), {"iterations": sample}))
+        iterations = max(sample, int(sample * target / latency) // 10_000 * 10_000)
+        latency = self.measure(type(base.__name__, (base,), {"iterations": iterations}))
+        self.stdout.write(f"  iterations={iterations}: {latency * 1000:.0f}ms")
+        return {"PASSWORD_PBKDF2_ITERATIONS": iterations}, latency
@@ -0,0 +1,111 @@
+"""
+Resolve case-insensitive duplicate emails and normalize stored emails.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+from apps.accounts.models import User
+from apps.accounts.user_cache import invalidate_cached_user
+
+
+class Command(BaseCommand):
+    help = (
+        "大文字・小文字だけが異なるメールアドレスの重複を解消し、ドメイン部分を小文字に揃えます。"
+        "LOWER(email) の一意制約を追加する前に実行してください"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="1トランザクションで処理する件数",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="対象のデータベース",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="変更内容を表示するだけで保存しない",
+        )
+
+    def handle(self, *args, **options):
+        self.manager = User._default_manager.using(options["database"])
+        self.database = options["database"]
+        self.batch_size = options["batch_size"]
+        self.dry_run = options["dry_run"]
+
+        # 正規化で完全一致の重複が生まれないよう、先に重複を解消する
+        renamed = self.dedupe()
+        normalized = self.normalize()
+        suffix = "（dry-run）" if self.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"重複 {renamed}件のメールアドレスを変更し、{normalized}件を正規化しました{suffix}"
+        ))
+
+    def dedupe(self):
+        """
+        重複ごとに最後にログインしたユーザー（同じなら古いユーザー）を残し、
+        他のユーザーのメールアドレスを "<ローカル部>+duplicate-<pk>@<ドメイン>" に変更する
+        """
+        keys = list(
+            self.manager.annotate(email_lower=Lower("email"))
+            .values("email_lower")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .order_by("email_lower")
+            .values_list("email_lower", flat=True)
+        )
+        renamed = 0
+        for start in range(0, len(keys), self.batch_size):
+            with transaction.atomic(using=self.database):
+                for key in keys[start:start + self.batch_size]:
+                    users = list(
+                        self.manager.filter(email__lower=key)
+                        .order_by(F("last_login").desc(nulls_last=True), "pk")
+                        .values_list("pk", "email")
+                    )
+                    for pk, email in users[1:]:
+                        new_email = self.duplicate_email(pk, email)
+                        self.stdout.write(f"  {email} (id={pk}) -> {new_email}")
+                        if not self.dry_run:
+                            self.manager.filter(pk=pk).update(email=new_email)
+                            invalidate_cached_user(pk)
+                        renamed += 1
+        return renamed
+
+    def normalize(self):
+        """
+        ドメイン部分の小文字化と前後の空白の除去（主キー順にバッチ処理）
+        """
+        normalized = 0
+        last_pk = None
+        while True:
+            batch = self.manager.order_by("pk").values_list("pk", "email")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch[:self.batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            with transaction.atomic(using=self.database):
+                for pk, email in rows:
+                    new_email = User.objects.normalize_email(email.strip())
+                    if new_email == email:
+                        continue
+                    if not self.dry_run:
+                        self.manager.filter(pk=pk).update(email=new_email)
+                        invalidate_cached_user(pk)
+                    normalized += 1
+        return normalized
+
+    @staticmethod
+    def duplicate_email(pk, email):
+        local, _, domain = email.rpartition("@")
+        return f"{local}+duplicate-{pk}@{domain}"[-254:]
@@ -0,0 +1,48 @@
+"""
+Convert avatars uploaded before the avatar pipeline.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.accounts.avatars import process_avatar, schedule_processing, unprocessed_users
+from apps.accounts.models import User
+
+
+class Command(BaseCommand):
+    help = "変換前のアバター画像をWebPに変換します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="変換済みのアバターも変換し直す（AVATAR_SIZES の変更後に使う）",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Celeryに登録せず、このプロセスで変換する",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="変換せずに対象件数のみ表示",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            users = User.objects.exclude(avatar__isnull=True).exclude(avatar="")
+        else:
+            users = unprocessed_users()
+        users = users.only("pk", "avatar").order_by("pk")
+
+        if options["dry_run"]:
+            self.stdout.write(f"変換対象: {users.count()}件")
+            return
+
+        count = 0
+        for user in users.iterator():
+            if options["sync"]:
+                process_avatar(user.pk, user.avatar.name)
+            else:
+                schedule_processing(user)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count}件のアバターを変換しました"))
@@ -1,8 +1,31 @@
+from django.contrib.auth.hashers import acheck_password, check_password
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 
+class UserManager(DjangoUserManager):
+    """
+    メールアドレスを大文字・小文字を区別せずに検索するマネージャー
+    """
+
+    def with_email(self, email):
+        """
+        メールアドレスが一致するユーザー（LOWER(email) の一意インデックスを使う）
+        """
+        return self.filter(email__lower=email.lower())
+
+    def get_by_natural_key(self, username):
+        # USERNAME_FIELD は email。ログイン時の検索も大文字・小文字を区別しない
+        try:
+            return self.with_email(username).get()
+        except self.model.MultipleObjectsReturned:
+            # 重複を解消する前のデータベースでは完全一致のユーザーを使う
+            return self.get(email=username)
+
+
 class User(AbstractUser):
     """
     カスタムユーザーモデル
@@ -50,13 +73,38 @@ class User(AbstractUser):
         help_text=_("Receive email notifications")
     )
     
+    objects = UserManager()
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
+
+    # キャッシュから復元したユーザーのセッション検証用ハッシュ（apps.accounts.user_cache）
+    _cached_session_auth_hash = None
     
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
         ordering = ["-created_at"]
+        indexes = [
+            # ユーザー一覧（新しい順）と登録日時の範囲指定用
+            models.Index(fields=["-created_at", "-id"], name="accounts_user_created"),
+            # 有効・無効での絞り込み（一般ユーザーの一覧は常に有効なユーザーのみ）
+            models.Index(fields=["is_active", "-created_at", "-id"], name="accounts_user_active_created"),
+            # メール確認済みでの絞り込み
+            models.Index(
+                fields=["is_verified", "is_active", "-created_at", "-id"],
+                name="accounts_user_verified_created",
+            ),
+        ]
+        constraints = [
+            # 大文字・小文字だけが異なるメールアドレスの重複を防ぎ、検索にも使う。
+            # 既存のデータベースでは先に `manage.py normalize_user_emails` で重複を解消する
+            models.UniqueConstraint(
+                Lower("email"),
+                name="accounts_user_email_ci_unique",
+                violation_error_message=_("このメールアドレスは既に使用されています。"),
+            ),
+        ]
     
     def __str__(self):
         return self.email
@@ -73,3 +121,45 @@ class User(AbstractUser):
         Return the short name for the user.
         """
         return self.first_name or self.username.split("@")[0]
+
+    def get_session_auth_hash(self):
+        # キャッシュから復元したユーザーはパスワードを持たないため、保存済みのハッシュを使う
+        if self._cached_session_auth_hash is not None and "password" in self.get_deferred_fields():
+            return self._cached_session_auth_hash
+        return super().get_session_auth_hash()
+
+    def check_password(self, raw_password):
+        # 古いアルゴリズム・コストのハッシュは、ログイン処理を待たせずにバックグラウンドで更新する
+        def setter(raw_password):
+            from .rehash import schedule_rehash
+
+            schedule_rehash(self, raw_password)
+
+        return check_password(raw_password, self.password, setter)
+
+    async def acheck_password(self, raw_password):
+        async def setter(raw_password):
+            from .rehash import schedule_rehash
+
+            schedule_rehash(self, raw_password)
+
+        return await acheck_password(raw_password, self.password, setter)
+
+    def get_session_auth_fallback_hash(self):
+        yield from super().get_session_auth_fallback_hash()
+        # バックグラウンドでハッシュを更新する前に作られたセッション（検証後に新しいハッシュへ移行される）
+        from .rehash import get_previous_session_hashes
+
+        yield from get_previous_session_hashes(self)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # キャッシュから復元したユーザーは、未取得のフィールドを1回のクエリでまとめて読み込む
+        if self._cached_session_auth_hash is not None and fields is not None:
+            deferred = self.get_deferred_fields()
+            if deferred.issuperset(fields):
+                fields = deferred
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+# email__lower で LOWER(email) を参照できるようにする
+User._meta.get_field("email").register_lookup(Lower)
@@ -0,0 +1,105 @@
+"""
+Background password rehash.
+
+ログイン時に古いアルゴリズム・コストのハッシュが見つかった場合、
+ハッシュの再計算をリクエストの外（プロセス内のスレッド）で行う。
+
+- 平文のパスワードをブローカーに送らないよう、Celery ではなくプロセス内で処理する
+- 検証時のハッシュから変わっていない場合のみ更新する（同時のパスワード変更を上書きしない）
+- 更新前のハッシュで作られたセッションを無効にしないよう、更新前のハッシュから求めた
+  セッション検証用のHMACを SESSION_COOKIE_AGE の間キャッシュに残し、検証の予備として使う
+  （User.get_session_auth_fallback_hash）。パスワードハッシュ自体はキャッシュに置かない。
+  その後にパスワードが変更された場合は使わない
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.core import background
+
+logger = logging.getLogger(__name__)
+
+PREVIOUS_SESSION_HASHES_KEY = 'accounts:user:{pk}:previous_session_hashes'
+
+
+
+def schedule_rehash(user, raw_password):
+    """
+    ユーザーのパスワードハッシュをバックグラウンドで現在の設定に合わせて更新する
+    """
+    if user.pk is None:
+        return
+    background.submit('password-rehash', rehash_password, user.pk, raw_password, user.password)
+
+
+def rehash_password(pk, raw_password, old_encoded):
+    """
+    パスワードハッシュを更新する
+
+    Returns:
+        更新した場合は True
+    """
+    from apps.accounts.models import User
+    from apps.accounts.user_cache import invalidate_cached_user
+
+    try:
+        encoded = make_password(raw_password)
+        key = PREVIOUS_SESSION_HASHES_KEY.format(pk=pk)
+        # 更新後のハッシュを読んだリクエストが既存のセッションを検証できるよう、先に記録する。
+        # 更新後のハッシュに対応する値も保存し、その後パスワードが変更されたら使わない
+        cache.set(
+            key,
+            (session_auth_hashes(encoded)[0], session_auth_hashes(old_encoded)),
+            settings.SESSION_COOKIE_AGE,
+        )
+        updated = (
+            User._default_manager.using(DEFAULT_DB_ALIAS)
+            .filter(pk=pk, password=old_encoded)
+            .update(password=encoded)
+        )
+        if updated:
+            invalidate_cached_user(pk)
+        else:
+            # 検証後にパスワードが変更されていた
+            cache.delete(key)
+        return bool(updated)
+    except Exception:
+        logger.exception("パスワードハッシュを更新できませんでした: user=%s", pk)
+        return False
+
+
+def session_auth_hashes(encoded):
+    """
+    パスワードハッシュから求めたセッション検証用のハッシュ（SECRET_KEY と SECRET_KEY_FALLBACKS ごと）
+
+    AbstractBaseUser.get_session_auth_hash と同じ計算。
+    """
+    return tuple(
+        salted_hmac(
+            "django.contrib.auth.models.AbstractBaseUser.get_session_auth_hash",
+            encoded,
+            secret=secret,
+            algorithm="sha256",
+        ).hexdigest()
+        for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]
+    )
+
+
+def get_previous_session_hashes(user):
+    """
+    バックグラウンドで更新される前のパスワードハッシュに対応するセッション検証用のハッシュ
+
+    ユーザーのパスワードがバックグラウンドで更新したハッシュのままの場合のみ返す
+    （その後にパスワードが変更された場合、更新前のセッションは無効にする）。
+    """
+    previous = cache.get(PREVIOUS_SESSION_HASHES_KEY.format(pk=user.pk))
+    if previous is None:
+        return ()
+    current, hashes = previous
+    if not constant_time_compare(user.get_session_auth_hash(), current):
+        return ()
+    return hashes
@@ -0,0 +1,17 @@
+"""
+Accounts Celery tasks.
+"""
+from celery import shared_task
+
+
+@shared_task
+def process_avatar_task(pk, name):
+    """
+    アップロードされたアバターを変換する（apps.accounts.avatars.process_avatar）
+
+    Returns:
+        差し替えた場合は True
+    """
+    from apps.accounts.avatars import process_avatar
+
+    return process_avatar(pk, name)
@@ -0,0 +1,24 @@
+"""
+Accounts template tags.
+"""
+from django import template
+
+from apps.accounts.avatars import avatar_url as get_avatar_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar_url(user, size=64):
+    """
+    表示サイズ（px）に合う変換済みアバターのURL（アバターが無ければ空文字列）
+
+    高解像度の画面向けに、表示サイズの2倍を指定する。
+
+    Usage:
+        {% raw %}{% avatar_url user 64 as avatar_src %}
+        {% if avatar_src %}<img src="{{ avatar_src }}" class="w-8 h-8">{% endif %}{% endraw %}
+    """
+    if not getattr(user, 'is_authenticated', False):
+        return ''
+    return get_avatar_url(user, size)
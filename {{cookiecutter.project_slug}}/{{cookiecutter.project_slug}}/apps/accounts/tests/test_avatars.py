@@ -0,0 +1,140 @@
+"""
+Test cases for the avatar pipeline.
+"""
+import io
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+from apps.accounts.avatars import avatar_url, is_processed, process_avatar
+from apps.core import background
+
+User = get_user_model()
+
+
+def make_jpeg(width, height, orientation=None):
+    # top half blue, bottom half red
+    image = Image.new('RGB', (width, height), 'red')
+    image.paste('blue', (0, 0, width, height // 2))
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    exif[0x8825] = {2: (35.0, 40.0, 0.0)}
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile('photo.jpg', output.getvalue(), content_type='image/jpeg')
+
+
+def run_inline(name, function, *args):
+    # the conversion thread cannot see test transactions
+    return function(*args)
+
+
+class AvatarPipelineTestCase(TestCase):
+    """Test cases for avatar conversion and URLs."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=self.media_root, AVATAR_SIZES=[64, 160])
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        inline = patch.object(background, 'submit', side_effect=run_inline)
+        inline.start()
+        self.addCleanup(inline.stop)
+        self.user = User.objects.create_user(username='avatar', email='avatar@example.com', password='testpass123')
+
+    def upload(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.avatar = upload
+            self.user.save()
+        self.user.refresh_from_db()
+
+    def test_upload_is_converted(self):
+        """Uploads are cropped, resized and stored as WebP without EXIF."""
+        upload = make_jpeg(1200, 800)
+        self.upload(upload)
+        self.assertTrue(is_processed(self.user.avatar.name))
+        self.assertTrue(self.user.avatar.name.endswith('-160.webp'))
+
+        storage = self.user.avatar.storage
+        for size in (64, 160):
+            name = self.user.avatar.name.replace('-160.webp', f'-{size}.webp')
+            with storage.open(name) as fp, Image.open(fp) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertEqual(image.size, (size, size))
+                self.assertEqual(len(image.getexif()), 0)
+        # the original upload is removed
+        self.assertFalse(storage.exists('avatars/photo.jpg'))
+
+    def test_orientation_is_applied(self):
+        """The EXIF orientation is applied before it is stripped."""
+        # orientation 6: displayed rotated 90 degrees clockwise, so blue ends up on the right
+        self.upload(make_jpeg(100, 100, orientation=6))
+        with self.user.avatar.open() as fp, Image.open(fp) as image:
+            left = image.convert('RGB').getpixel((20, 80))
+            right = image.convert('RGB').getpixel((140, 80))
+        self.assertGreater(left[0], left[2])
+        self.assertGreater(right[2], right[0])
+
+    def test_avatar_url_picks_size(self):
+        """The smallest variant covering the display size is used."""
+        self.upload(make_jpeg(400, 400))
+        self.assertTrue(avatar_url(self.user, 32).endswith('-64.webp'))
+        self.assertTrue(avatar_url(self.user, 100).endswith('-160.webp'))
+        self.assertTrue(avatar_url(self.user, 500).endswith('-160.webp'))
+
+    def test_unprocessed_avatar_uses_original(self):
+        """Until conversion finishes the original is shown."""
+        with self.captureOnCommitCallbacks(execute=False):
+            self.user.avatar = make_jpeg(100, 100)
+            self.user.save()
+        self.assertEqual(avatar_url(self.user, 64), self.user.avatar.url)
+
+    def test_replaced_upload_is_not_overwritten(self):
+        """A conversion for an older upload does not replace a newer one."""
+        with self.captureOnCommitCallbacks(execute=False):
+            self.user.avatar = make_jpeg(100, 100)
+            self.user.save()
+        stale = self.user.avatar.name
+        self.upload(make_jpeg(120, 120))
+        current = self.user.avatar.name
+        self.assertFalse(process_avatar(self.user.pk, stale))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar.name, current)
+
+    def test_without_celery_conversion_runs_off_the_request(self):
+        """Without Celery the conversion is handed to the background executor."""
+        with patch.dict(sys.modules, {'apps.accounts.tasks': None}), \
+                patch.object(background, 'submit') as submit:
+            self.upload(make_jpeg(200, 200))
+        self.assertFalse(is_processed(self.user.avatar.name))
+
+        name, function, *args = submit.call_args.args
+        self.assertEqual(name, 'avatar')
+        self.assertTrue(function(*args))
+        self.user.refresh_from_db()
+        self.assertTrue(is_processed(self.user.avatar.name))
+
+    def test_template_tag(self):
+        """avatar_url renders the variant URL."""
+        self.upload(make_jpeg(400, 400))
+        rendered = Template('{% raw %}{% load accounts_tags %}{% avatar_url user 64 %}{% endraw %}').render(Context({'user': self.user}))
+        self.assertTrue(rendered.endswith('-64.webp'))
+
+    def test_process_avatars_command(self):
+        """The command converts avatars uploaded before the pipeline."""
+        self.user.avatar = make_jpeg(100, 100)
+        self.user.avatar.save('legacy.jpg', self.user.avatar.file, save=False)
+        User.objects.filter(pk=self.user.pk).update(avatar=self.user.avatar.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('process_avatars', stdout=io.StringIO())
+        self.user.refresh_from_db()
+        self.assertTrue(is_processed(self.user.avatar.name))
@@ -0,0 +1,83 @@
+"""
+Test cases for case-insensitive email handling.
+"""
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from apps.accounts.forms import CustomPasswordResetForm, SignupForm
+
+User = get_user_model()
+
+
+class CaseInsensitiveEmailTestCase(TestCase):
+    """Test cases for lookups through LOWER(email)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='mixed', email='Mixed.Case@example.com', password='testpass123')
+
+    def test_signup_rejects_email_differing_in_case(self):
+        """Signing up with the same address in another case is rejected."""
+        form = SignupForm(data={
+            'username': 'another',
+            'email': 'mixed.case@EXAMPLE.com',
+            'password1': 'complexpass123!',
+            'password2': 'complexpass123!',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('email', form.errors)
+
+    def test_login_ignores_case(self):
+        """Users can log in with the address in any case."""
+        self.assertEqual(authenticate(username='MIXED.case@example.com', password='testpass123'), self.user)
+
+    def test_password_reset_ignores_case(self):
+        """The password reset finds users regardless of case."""
+        form = CustomPasswordResetForm()
+        self.assertEqual(list(form.get_users('mixed.case@example.com')), [self.user])
+
+    def test_lookup_uses_lower(self):
+        """with_email filters on LOWER(email)."""
+        sql = str(User.objects.with_email('A@example.com').query)
+        self.assertIn('LOWER(', sql.upper())
+        self.assertIn("a@example.com", sql)
+
+
+class NormalizeUserEmailsTestCase(TestCase):
+    """Test cases for the normalize_user_emails command."""
+
+    def setUp(self):
+        # 既存のデータベースを再現するため、大文字・小文字を区別しない一意インデックスを外す
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX accounts_user_email_ci_unique')
+
+    def test_dedupes_and_normalizes(self):
+        """The most recently used account keeps the address."""
+        now = timezone.now()
+        old = User.objects.create_user(username='old', email='dup@example.com', last_login=now - timedelta(days=1))
+        recent = User.objects.create_user(username='recent', email='Dup@Example.com', last_login=now)
+        never = User.objects.create_user(username='never', email='DUP@example.com')
+        other = User.objects.create_user(username='other', email='Other@EXAMPLE.COM')
+
+        out = StringIO()
+        call_command('normalize_user_emails', stdout=out)
+
+        emails = dict(User.objects.values_list('pk', 'email'))
+        self.assertEqual(emails[recent.pk], 'Dup@example.com')
+        self.assertEqual(emails[old.pk], f'dup+duplicate-{old.pk}@example.com')
+        self.assertEqual(emails[never.pk], f'DUP+duplicate-{never.pk}@example.com')
+        self.assertEqual(emails[other.pk], 'Other@example.com')
+        self.assertIn(f'dup@example.com (id={old.pk})', out.getvalue())
+
+    def test_dry_run(self):
+        """Nothing is saved with --dry-run."""
+        User.objects.create_user(username='first', email='dry@example.com')
+        User.objects.create_user(username='second', email='Dry@example.com')
+        call_command('normalize_user_emails', dry_run=True, stdout=StringIO())
+        self.assertEqual(
+            sorted(User.objects.values_list('email', flat=True)),
+            ['Dry@example.com', 'dry@example.com'],
+        )
@@ -0,0 +1,126 @@
+"""
+Test cases for password hashing and background rehash.
+"""
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.accounts.management.commands.calibrate_password_hasher import Command
+from apps.accounts.rehash import (
+    PREVIOUS_SESSION_HASHES_KEY, get_previous_session_hashes, rehash_password, session_auth_hashes,
+)
+
+User = get_user_model()
+
+PBKDF2_SETTINGS = {
+    'PASSWORD_HASHERS': ['apps.accounts.hashers.PBKDF2PasswordHasher'],
+    'PASSWORD_PBKDF2_ITERATIONS': '1000',
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-hashers'}},
+}
+
+
+@override_settings(**PBKDF2_SETTINGS)
+class PasswordRehashTestCase(TestCase):
+    """Test cases for configurable cost and background rehash."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='hasher', email='hasher@example.com', password='testpass123')
+
+    def test_cost_comes_from_settings(self):
+        """New hashes use the configured iteration count."""
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_outdated_hash_is_rehashed_in_background(self):
+        """Logging in with an outdated hash schedules a rehash instead of saving."""
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS='2000'):
+            with patch('apps.accounts.rehash.schedule_rehash') as schedule:
+                self.assertTrue(self.user.check_password('testpass123'))
+            schedule.assert_called_once_with(self.user, 'testpass123')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_current_hash_is_not_rehashed(self):
+        """Hashes at the current cost are left alone."""
+        with patch('apps.accounts.rehash.schedule_rehash') as schedule:
+            self.assertTrue(self.user.check_password('testpass123'))
+        schedule.assert_not_called()
+
+    def test_rehash_password(self):
+        """The rehash stores the new hash and remembers the old session hashes."""
+        old = self.user.password
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS='2000'):
+            self.assertTrue(rehash_password(self.user.pk, 'testpass123', old))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+        self.assertEqual(get_previous_session_hashes(self.user), session_auth_hashes(old))
+        # the password hashes themselves never reach the cache
+        cached = repr(cache.get(PREVIOUS_SESSION_HASHES_KEY.format(pk=self.user.pk)))
+        self.assertNotIn(old, cached)
+        self.assertNotIn(self.user.password, cached)
+
+    def test_rehash_does_not_overwrite_password_change(self):
+        """A password changed since the check is not overwritten."""
+        old = self.user.password
+        User.objects.filter(pk=self.user.pk).update(password=make_password('changed456'))
+        self.assertFalse(rehash_password(self.user.pk, 'testpass123', old))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('changed456'))
+        self.assertEqual(get_previous_session_hashes(self.user), ())
+
+    def test_session_survives_rehash(self):
+        """Sessions created before the rehash stay signed in."""
+        self.client.force_login(self.user)
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS='2000'):
+            with self.captureOnCommitCallbacks(execute=True):
+                rehash_password(self.user.pk, 'testpass123', self.user.password)
+        response = self.client.get(reverse('accounts:profile'))
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+        # the session moved to the new hash
+        response = self.client.get(reverse('accounts:profile'))
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+    def test_password_change_after_rehash_logs_out(self):
+        """Sessions from before a rehash are rejected once the password changes."""
+        self.client.force_login(self.user)
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS='2000'):
+            rehash_password(self.user.pk, 'testpass123', self.user.password)
+        self.user.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('changed456')
+            self.user.save()
+        response = self.client.get(reverse('accounts:profile'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_password_change_still_logs_out(self):
+        """A real password change invalidates existing sessions."""
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('changed456')
+            self.user.save()
+        response = self.client.get(reverse('accounts:profile'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+
+class CalibratePasswordHasherTestCase(TestCase):
+    """Test cases for the calibrate_password_hasher command."""
+
+    def test_pbkdf2_scales_to_target(self):
+        """PBKDF2 iterations are scaled to the target latency."""
+        out = StringIO()
+        # 1,000,000 iterations per second
+        with patch.object(Command, 'measure', side_effect=lambda hasher: hasher.iterations / 1_000_000):
+            call_command('calibrate_password_hasher', algorithm='pbkdf2', target_ms=250, stdout=out)
+        self.assertIn('PASSWORD_PBKDF2_ITERATIONS=250000', out.getvalue())
+
+    def test_scrypt_picks_largest_work_factor_within_target(self):
+        """The largest work factor under the target is chosen."""
+        out = StringIO()
+        with patch.object(Command, 'measure', side_effect=lambda hasher: hasher.work_factor / 100_000):
+            call_command('calibrate_password_hasher', algorithm='scrypt', target_ms=250, stdout=out)
+        self.assertIn('PASSWORD_SCRYPT_WORK_FACTOR=16384', out.getvalue())
@@ -0,0 +1,112 @@
+"""
+Test cases for the cached user loader.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.accounts.backends import CachedModelBackend
+from apps.accounts.user_cache import USER_CACHE_KEY, get_cached_user
+
+User = get_user_model()
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-user-cache'},
+})
+class CachedUserTestCase(TestCase):
+    """Test cases for get_cached_user."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='cached', email='cached@example.com', password='testpass123',
+            first_name='太郎', bio='自己紹介',
+        )
+
+    def test_second_load_hits_cache(self):
+        """The user is loaded from the database only once."""
+        get_cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = get_cached_user(self.user.pk)
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.email, 'cached@example.com')
+        self.assertEqual(user.get_full_name(), '太郎')
+        self.assertTrue(user.is_authenticated)
+
+    def test_password_is_not_cached(self):
+        """Only the session hash is cached, and it matches the real one."""
+        user = get_cached_user(self.user.pk)
+        self.assertNotIn(self.user.password, repr(cache.get(USER_CACHE_KEY.format(pk=self.user.pk))))
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_session_auth_hash(), self.user.get_session_auth_hash())
+
+    def test_deferred_fields_load_together(self):
+        """Accessing an uncached field loads the rest in one query."""
+        get_cached_user(self.user.pk)
+        user = get_cached_user(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.bio, '自己紹介')
+            self.assertEqual(user.phone_number, '')
+            self.assertIsNotNone(user.created_at)
+
+    def test_save_invalidates_cache(self):
+        """Saving the user makes the next load see the change."""
+        get_cached_user(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = '花子'
+            self.user.save()
+        self.assertEqual(get_cached_user(self.user.pk).first_name, '花子')
+
+    def test_password_change_invalidates_session_hash(self):
+        """Changing the password changes the cached session hash."""
+        old_hash = get_cached_user(self.user.pk).get_session_auth_hash()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('newpass456')
+            self.user.save()
+        self.assertNotEqual(get_cached_user(self.user.pk).get_session_auth_hash(), old_hash)
+
+    def test_cached_user_can_be_saved(self):
+        """A cached user can be modified and saved like a normal instance."""
+        user = get_cached_user(self.user.pk)
+        user.last_name = '山田'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_name, '山田')
+        self.assertEqual(self.user.bio, '自己紹介')
+
+    def test_missing_user(self):
+        """Unknown primary keys return None."""
+        self.assertIsNone(get_cached_user(0))
+
+    def test_backend_rejects_inactive_user(self):
+        """The backend does not return inactive users."""
+        backend = CachedModelBackend()
+        self.assertEqual(backend.get_user(self.user.pk), self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+    def test_authenticated_request_uses_cache(self):
+        """Authenticated requests resolve the user without querying it."""
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/').wsgi_request.user, self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/')
+            self.assertEqual(response.wsgi_request.user, self.user)
+        user_table = User._meta.db_table
+        self.assertFalse([query for query in queries if f'FROM "{user_table}"' in query['sql']])
+
+    def test_header_and_sidebar_render_without_user_query(self):
+        """The header and sidebar fragments only read cached user fields."""
+        get_cached_user(self.user.pk)
+        user = get_cached_user(self.user.pk)
+        request = RequestFactory().get('/dashboard/')
+        request.user = user
+        with self.assertNumQueries(0):
+            render_to_string('components/header.html', {'user': user}, request=request)
+            render_to_string('components/sidebar.html', {'user': user}, request=request)
+
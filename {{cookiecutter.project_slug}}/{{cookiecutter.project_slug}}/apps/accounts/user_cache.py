@@ -0,0 +1,94 @@
+"""
+Cached user loader.
+
+認証済みリクエストごとのユーザー取得（AuthenticationMiddleware）をキャッシュから行う。
+
+- キャッシュには権限チェックやヘッダー表示に使う列だけを保存し、
+  それ以外の列（bio、phone_number など）は遅延読み込みにしたユーザーを返す。
+  遅延読み込みの列にアクセスすると、残りの列を1回のクエリでまとめて読み込む
+- パスワードハッシュはキャッシュに置かず、セッション検証用のハッシュのみを保存する
+- ユーザーごとのバージョンを保存時に更新し、古いエントリは参照されなくなる。
+  QuerySet.update() などシグナルを発行しない変更は USER_CACHE_TIMEOUT 秒で反映される
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import User
+
+USER_CACHE_KEY = 'accounts:user:{pk}'
+USER_CACHE_VERSION_KEY = 'accounts:user:{pk}:version'
+
+# キャッシュするフィールド（attname）
+USER_CACHE_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'avatar',
+    'is_active', 'is_staff', 'is_superuser', 'is_verified',
+    # ヘッダー・サイドバーのフラグメントキャッシュのキーに使う
+    'updated_at',
+)
+# Model.from_db はモデルの列順で値を受け取る
+_SNAPSHOT_FIELDS = tuple(f.attname for f in User._meta.concrete_fields if f.attname in USER_CACHE_FIELDS)
+
+
+def get_cached_user(pk):
+    """
+    キャッシュからユーザーを返す。存在しない場合は None
+
+    バージョンとスナップショットを1往復で読み、一致しなければデータベースから作り直す。
+    バージョンを読んでからデータベースを参照するので、読み込み中に保存された変更は
+    次回のアクセスで反映される。
+    """
+    version_key = USER_CACHE_VERSION_KEY.format(pk=pk)
+    data_key = USER_CACHE_KEY.format(pk=pk)
+    found = cache.get_many([version_key, data_key])
+    version = found.get(version_key)
+    snapshot = found.get(data_key)
+    if version is not None and snapshot is not None and snapshot[0] == version:
+        return _from_snapshot(snapshot[1], snapshot[2])
+
+    if version is None:
+        cache.add(version_key, uuid.uuid4().hex, None)
+        version = cache.get(version_key)
+
+    # レプリカの遅延した値をキャッシュしないようにプライマリから読む
+    user = (
+        User._default_manager.using(DEFAULT_DB_ALIAS)
+        .only(*USER_CACHE_FIELDS, 'password')
+        .filter(pk=pk)
+        .first()
+    )
+    if user is None:
+        return None
+    values = [getattr(user, name) for name in _SNAPSHOT_FIELDS]
+    # FileField はファイル名のみを保存する
+    values[_SNAPSHOT_FIELDS.index('avatar')] = user.avatar.name
+    values = tuple(values)
+    session_auth_hash = user.get_session_auth_hash()
+    if version is not None:
+        cache.set(data_key, (version, values, session_auth_hash), settings.USER_CACHE_TIMEOUT)
+    return _from_snapshot(values, session_auth_hash)
+
+
+def _from_snapshot(values, session_auth_hash):
+    user = User.from_db(DEFAULT_DB_ALIAS, _SNAPSHOT_FIELDS, values)
+    user._cached_session_auth_hash = session_auth_hash
+    return user
+
+
+def invalidate_cached_user(pk):
+    """
+    ユーザーのキャッシュを無効化（コミット後にバージョンを更新）
+    """
+    transaction.on_commit(
+        lambda: cache.set(USER_CACHE_VERSION_KEY.format(pk=pk), uuid.uuid4().hex, None)
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _invalidate_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
@@ -4,13 +4,19 @@ from django.contrib.auth import login as auth_login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, TemplateView, UpdateView
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.ratelimit import ratelimit
+
 from .forms import LoginForm, SignupForm, CustomPasswordResetForm, ProfileForm
 from .models import User
 
 
+# フォームの検証（パスワードのハッシュ計算）より前に、IP・メールアドレスごとの試行回数で拒否する
+@method_decorator(ratelimit('login', key='ip'), name='dispatch')
+@method_decorator(ratelimit('login-account', key='post:username'), name='dispatch')
 class LoginView(auth_views.LoginView):
     """
     ログインビュー
@@ -38,6 +44,7 @@ class LogoutView(auth_views.LogoutView):
         return super().dispatch(request, *args, **kwargs)
 
 
+@method_decorator(ratelimit('signup', key='ip'), name='dispatch')
 class SignupView(CreateView):
     """
     ユーザー登録ビュー
@@ -61,6 +68,7 @@ class SignupView(CreateView):
         return super().dispatch(request, *args, **kwargs)
 
 
+@method_decorator(ratelimit('password-reset', key=('ip', 'post:email')), name='dispatch')
 class PasswordResetView(auth_views.PasswordResetView):
     """
     パスワードリセットビュー
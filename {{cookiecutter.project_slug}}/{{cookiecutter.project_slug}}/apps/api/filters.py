@@ -0,0 +1,41 @@
+"""
+Custom filter backends for API.
+"""
+import django_filters
+from django.contrib.auth import get_user_model
+from rest_framework.filters import SearchFilter
+
+from apps.core.models import SearchableModel
+from apps.core.search import search
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Use the full-text index for SearchableModel querysets.
+    Other querysets fall back to the default `search_fields` lookup.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if (
+            terms
+            and issubclass(queryset.model, SearchableModel)
+            and queryset.query.combinator is None
+        ):
+            return search(queryset, ' '.join(terms))
+        return super().filter_queryset(request, queryset, view)
+
+
+class UserFilter(django_filters.FilterSet):
+    """
+    Filters for the user list.
+
+    Each combination is served by one of the `(is_active, is_verified,
+    created_at)` indexes on User, so the list is read in index order.
+    """
+    joined_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    joined_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = get_user_model()
+        fields = ['is_active', 'is_verified']
@@ -0,0 +1,16 @@
+"""
+Pagination classes for API.
+"""
+from rest_framework.pagination import PageNumberPagination
+
+from apps.core.paginators import CachedCountPaginator
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination with a cached, possibly approximate total.
+
+    Use for large tables where `COUNT(*)` on every page dominates the request.
+    See `apps.core.paginators.cached_count`.
+    """
+    django_paginator_class = CachedCountPaginator
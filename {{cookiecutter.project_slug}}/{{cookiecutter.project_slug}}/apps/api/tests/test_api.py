@@ -1,11 +1,15 @@
 """
 Test cases for API endpoints.
 """
-from django.test import TestCase
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from apps.core import catalog
 from apps.core.models import Contact, FAQ, Page
 
 User = get_user_model()
@@ -142,16 +146,17 @@ class FAQAPITestCase(APITestCase):
         FAQ.objects.create(
             question='質問1',
             answer='回答1',
-            category='general'
+            category='general',
+            is_published=True
         )
         FAQ.objects.create(
             question='質問2',
             answer='回答2',
             category='technical',
-            is_active=False
+            is_published=False
         )
         
-        url = reverse('api_v1:faq-list')
+        url = reverse('api:api_v1:faq-list')
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -173,6 +178,67 @@ class FAQAPITestCase(APITestCase):
         faq.refresh_from_db()
         self.assertEqual(faq.view_count, 1)
 
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_list_faqs_from_catalog(self):
+        """Test that the plain FAQ list is served from the catalog."""
+        cache.clear()
+        catalog._catalog = None
+        self.addCleanup(setattr, catalog, '_catalog', None)
+        with self.captureOnCommitCallbacks(execute=True):
+            faq = FAQ.objects.create(question='質問1', answer='回答1', is_published=True)
+            FAQ.objects.create(question='非公開', answer='回答', is_published=False)
+
+        url = reverse('api:api_v1:faq-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'],
+            [{'id': faq.id, 'question': '質問1', 'answer': '回答1', 'category': faq.category,
+              'order': faq.order, 'is_active': True}]
+        )
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_search_faqs(self):
+        """Test full-text search on the FAQ list."""
+        faq = FAQ.objects.create(question='パスワードを忘れました', answer='再設定できます', is_published=True)
+        FAQ.objects.create(question='支払い方法', answer='変更できます', is_published=True)
+
+        url = reverse('api:api_v1:faq-list')
+        response = self.client.get(url, {'search': 'パスワード'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [faq.id])
+
+    def test_reorder_faqs(self):
+        """Test bulk reordering FAQs as staff."""
+        faq1 = FAQ.objects.create(question='質問1', answer='回答1')
+        faq2 = FAQ.objects.create(question='質問2', answer='回答2')
+
+        url = reverse('api:api_v1:faq-reorder')
+        response = self.client.post(url, {'ids': [faq2.id, faq1.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(url, {'ids': [faq2.id, faq1.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(FAQ.objects.all()), [faq2, faq1])
+
+    def test_reorder_faqs_rejects_partial_list(self):
+        """Test that reordering part of a category returns 400."""
+        faq1 = FAQ.objects.create(question='質問1', answer='回答1')
+        FAQ.objects.create(question='質問2', answer='回答2')
+
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(reverse('api:api_v1:faq-reorder'), {'ids': [faq1.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ids', response.data)
+
 
 class DashboardAPITestCase(APITestCase):
     """Test cases for dashboard API endpoints."""
@@ -198,4 +264,62 @@ class DashboardAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('labels', response.data)
         self.assertIn('datasets', response.data)
-        self.assertEqual(len(response.data['labels']), 7)  # 7 days of data
\ No newline at end of file
+        self.assertEqual(len(response.data['labels']), 7)  # 7 days of data
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-user-list'}
+})
+class UserListAPITestCase(APITestCase):
+    """Test cases for the user list endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = '/api/v1/users/'
+        self.verified = User.objects.create_user(
+            username='verified', email='verified@example.com', password='testpass123', is_verified=True
+        )
+        self.inactive = User.objects.create_user(
+            username='inactive', email='inactive@example.com', password='testpass123', is_active=False
+        )
+
+    def ids(self, response):
+        return [user['id'] for user in response.data['results']]
+
+    def test_newest_first(self):
+        """Users are listed newest first."""
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.ids(response),
+            [self.inactive.pk, self.verified.pk, self.staff_user.pk, self.user.pk],
+        )
+
+    def test_filters(self):
+        """Staff can filter by active, verified and join date."""
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(self.url, {'is_active': 'false'})
+        self.assertEqual(self.ids(response), [self.inactive.pk])
+        response = self.client.get(self.url, {'is_verified': 'true'})
+        self.assertEqual(self.ids(response), [self.verified.pk])
+
+        User.objects.filter(pk=self.user.pk).update(created_at=timezone.now() - timedelta(days=30))
+        response = self.client.get(self.url, {'joined_before': (timezone.now() - timedelta(days=1)).isoformat()})
+        self.assertEqual(self.ids(response), [self.user.pk])
+
+    def test_regular_users_see_active_only(self):
+        """Non-staff users cannot list inactive users."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'is_active': 'false'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_count_is_cached(self):
+        """The total is served from the cache on later pages."""
+        self.client.force_authenticate(user=self.staff_user)
+        self.assertEqual(self.client.get(self.url).data['count'], 4)
+        User.objects.create_user(username='late', email='late@example.com', password='testpass123')
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
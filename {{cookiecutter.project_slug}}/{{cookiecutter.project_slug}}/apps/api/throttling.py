@@ -0,0 +1,26 @@
+"""
+Throttle classes for API.
+"""
+from rest_framework.throttling import BaseThrottle
+
+from apps.core.ratelimit import check_rate
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle with the shared sliding-window rate limiter.
+
+    The rate is `RATELIMIT_RATES[scope]`, where the scope is the view's
+    `throttle_scope` (default "api"). Authenticated requests are counted
+    per user, anonymous ones per client IP.
+    """
+    scope = 'api'
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None) or self.scope
+        self.usage = check_rate(request, scope, ('user',))
+        return self.usage is None or self.usage.allowed
+
+    def wait(self):
+        usage = getattr(self, 'usage', None)
+        return usage.retry_after if usage is not None else None
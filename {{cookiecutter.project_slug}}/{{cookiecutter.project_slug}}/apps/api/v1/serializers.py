@@ -66,15 +66,15 @@ class ContactSerializer(serializers.ModelSerializer):
 
 
 class FAQSerializer(serializers.ModelSerializer):
-    """Serializer for FAQ model."""
+    """Serializer for FAQ model (also serializes catalog FAQEntry rows)."""
     
     class Meta:
         model = FAQ
         fields = [
             'id', 'question', 'answer', 'category',
-            'order', 'is_active', 'view_count'
+            'order', 'is_active'
         ]
-        read_only_fields = ['id', 'view_count']
+        read_only_fields = ['id']
 
 
 class PageSerializer(serializers.ModelSerializer):
@@ -114,6 +114,21 @@ class DashboardStatsSerializer(serializers.Serializer):
     total_pages = serializers.IntegerField()
     
     
+class ReorderSerializer(serializers.Serializer):
+    """Serializer for bulk reordering (ids in the desired order)."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+
+    def validate_ids(self, value):
+        """Reject duplicated ids."""
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError('IDが重複しています。')
+        return value
+
+
 class PasswordChangeSerializer(serializers.Serializer):
     """Serializer for password change."""
     old_password = serializers.CharField(required=True, write_only=True)
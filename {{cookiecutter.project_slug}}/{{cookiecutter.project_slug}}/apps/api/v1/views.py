@@ -1,22 +1,27 @@
 """
 API v1 views.
 """
-from rest_framework import generics, status, viewsets
+from rest_framework import generics, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
-from apps.core.models import Contact, FAQ, Page
+from apps.api.filters import UserFilter
+from apps.api.pagination import CachedCountPagination
+from apps.core.catalog import get_faq_catalog
+from apps.core.models import Contact, ArchivedContact, FAQ, Page
+from apps.core.routers import ReplicaReadMixin
 from apps.dashboard.models import Activity
 from .serializers import (
     UserSerializer, UserProfileSerializer, ContactSerializer,
     FAQSerializer, PageSerializer, ActivitySerializer,
-    DashboardStatsSerializer, PasswordChangeSerializer
+    DashboardStatsSerializer, PasswordChangeSerializer, ReorderSerializer
 )
 
 User = get_user_model()
@@ -33,10 +38,23 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 
 
 class UserListView(generics.ListAPIView):
-    """List users (admin only)."""
-    queryset = User.objects.all()
+    """
+    List users (admin only).
+
+    Filters: `is_active`, `is_verified`, `joined_after`, `joined_before`.
+    Results are ordered newest first along the created_at indexes, and
+    the total count is cached (see CachedCountPagination).
+    """
+    queryset = User.objects.only(
+        'id', 'username', 'email', 'first_name', 'last_name',
+        'bio', 'avatar', 'date_joined', 'is_active',
+    )
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CachedCountPagination
+    filterset_class = UserFilter
+    ordering_fields = ['created_at']
+    ordering = ['-created_at', '-id']
     
     def get_queryset(self):
         """Filter queryset based on permissions."""
@@ -59,10 +77,18 @@ class ContactViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on permissions."""
-        if self.request.user.is_staff:
-            return super().get_queryset()
-        # Regular users can only see their own contacts
-        return super().get_queryset().filter(email=self.request.user.email)
+        filters = {}
+        if not self.request.user.is_staff:
+            # Regular users can only see their own contacts
+            filters['email'] = self.request.user.email
+
+        # ?archived=true lists archived contacts, ?archived=all lists both tables
+        archived = self.request.query_params.get('archived')
+        if self.action == 'list' and archived == 'all':
+            return Contact.objects.including_archived(**filters)
+        if self.action in ('list', 'retrieve') and archived == 'true':
+            return ArchivedContact.objects.filter(**filters)
+        return super().get_queryset().filter(**filters)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def resolve(self, request, pk=None):
@@ -74,12 +100,24 @@ class ContactViewSet(viewsets.ModelViewSet):
         return Response({'status': 'resolved'})
 
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for FAQ model (read-only)."""
-    queryset = FAQ.objects.filter(is_active=True)
     serializer_class = FAQSerializer
     permission_classes = [AllowAny]
     
+    def get_queryset(self):
+        """Return only currently published FAQs."""
+        return FAQ.objects.live()
+
+    def list(self, request, *args, **kwargs):
+        """Serve the plain list from the in-process catalog (no database reads)."""
+        if set(request.query_params) - {'page'}:
+            # search / ordering go through the database
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(get_faq_catalog().entries)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
     def retrieve(self, request, *args, **kwargs):
         """Increment view count on retrieve."""
         instance = self.get_object()
@@ -87,18 +125,26 @@ class FAQViewSet(viewsets.ReadOnlyModelViewSet):
         instance.save(update_fields=['view_count'])
         return super().retrieve(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def reorder(self, request):
+        """Set the order of FAQs in one request (ids in the desired order)."""
+        serializer = ReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            updated = FAQ.reorder(serializer.validated_data['ids'])
+        except DjangoValidationError as error:
+            raise serializers.ValidationError({'ids': error.messages})
+        return Response({'updated': updated})
 
-class PageViewSet(viewsets.ReadOnlyModelViewSet):
+
+class PageViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Page model (read-only)."""
     serializer_class = PageSerializer
     permission_classes = [AllowAny]
     
     def get_queryset(self):
         """Return only published pages."""
-        return Page.objects.filter(
-            status='published',
-            published_at__lte=timezone.now()
-        ).select_related('author')
+        return Page.objects.live()
 
 
 class ActivityListView(generics.ListAPIView):
@@ -113,7 +159,7 @@ class ActivityListView(generics.ListAPIView):
         ).order_by('-created_at')[:50]
 
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(ReplicaReadMixin, APIView):
     """Get dashboard statistics."""
     permission_classes = [IsAuthenticated]
     
@@ -134,16 +180,14 @@ class DashboardStatsView(APIView):
             'pending_contacts': Contact.objects.filter(
                 status='pending'
             ).count(),
-            'total_pages': Page.objects.filter(
-                status='published'
-            ).count(),
+            'total_pages': Page.objects.live().count(),
         }
         
         serializer = DashboardStatsSerializer(stats)
         return Response(serializer.data)
 
 
-class ChartDataView(APIView):
+class ChartDataView(ReplicaReadMixin, APIView):
     """Get chart data for dashboard."""
     permission_classes = [IsAuthenticated]
     
@@ -198,6 +242,8 @@ class ChartDataView(APIView):
 class PasswordChangeView(APIView):
     """Change user password."""
     permission_classes = [IsAuthenticated]
+    # Checking the old password costs a password hash
+    throttle_scope = 'password-change'
     
     def post(self, request):
         """Change the user's password."""
@@ -1,13 +1,223 @@
 """
 Core app admin configuration.
 """
+import json
+from collections import defaultdict
+
+from django.conf import settings
 from django.contrib import admin
-from django.utils.translation import gettext_lazy as _
-from .models import Page, FAQ, Contact, Attachment, Image
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.utils import model_ngettext
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.db import router, transaction
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _, ngettext
+from .models import Page, FAQ, Contact, ArchivedContact, Attachment, Image, PublishableModel, SearchableModel
+from .search import search
+from .paginators import KeysetPaginator, cached_count
+from .signals import bulk_updated
+
+
+class SoftDeleteAdminMixin:
+    """
+    SoftDeleteModel用の管理画面ミックスイン
+
+    選択したレコードを1回のUPDATEで論理削除・復元するアクションを追加する。
+    """
+    actions = ['soft_delete_selected', 'restore_selected']
+
+    @admin.action(description=_('選択したレコードを論理削除'))
+    def soft_delete_selected(self, request, queryset):
+        count = queryset.soft_delete(user=request.user)
+        self.message_user(request, _('%(count)d件を論理削除しました。') % {'count': count})
+
+    @admin.action(description=_('選択したレコードを復元'))
+    def restore_selected(self, request, queryset):
+        count = queryset.restore()
+        self.message_user(request, _('%(count)d件を復元しました。') % {'count': count})
+
+
+class FullTextSearchAdminMixin:
+    """
+    SearchableModel用の管理画面ミックスイン
+
+    検索ボックスの入力を search_fields の部分一致ではなく全文検索インデックスで検索する。
+    検索ボックスを表示するため search_fields は残しておくこと。
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search(queryset, search_term, fallback=False), False
+
+
+class BulkListEditableAdminMixin:
+    """
+    list_editable の保存を一括で行う管理画面ミックスイン
+
+    変更された行を、変更されたフィールドの組み合わせごとに bulk_update で
+    1トランザクションで保存し、変更履歴（LogEntry）もまとめて作成する。
+    save() を経由しないため、モデルの save() で行う処理のうち
+    auto_now・is_live（PublishableModel）・search_document（SearchableModel）の更新を
+    ここで行い、保存後に bulk_updated シグナルを送信する。
+    save_model() / save_related() は呼ばれないので、それらを上書きする管理画面では使わないこと。
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method == 'POST' and self.list_editable and '_save' in request.POST:
+            response = self._bulk_save_changelist(request)
+            if response is not None:
+                return response
+        return super().changelist_view(request, extra_context)
+
+    def _bulk_save_changelist(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        FormSet = self.get_changelist_formset(request)
+        queryset = self._get_list_editable_queryset(request, FormSet.get_default_prefix())
+        formset = FormSet(request.POST, request.FILES, queryset=queryset)
+        if not formset.is_valid():
+            # 入力エラーの表示は標準の処理に任せる
+            return None
+
+        forms = [form for form in formset.forms if form.has_changed()]
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            fields = self.bulk_save_forms(request, forms)
+        if fields:
+            bulk_updated.send(sender=self.model, fields=sorted(fields))
+
+        if forms:
+            count = len(forms)
+            message = ngettext(
+                '%(count)s %(name)s was changed successfully.',
+                '%(count)s %(name)s were changed successfully.',
+                count,
+            ) % {'count': count, 'name': model_ngettext(self.opts, count)}
+            self.message_user(request, message)
+        return HttpResponseRedirect(request.get_full_path())
+
+    def bulk_save_forms(self, request, forms):
+        """
+        変更されたフォームの行を保存し、更新したフィールド名の集合を返す
+        """
+        now = timezone.now()
+        auto_now = [field.name for field in self.opts.concrete_fields if getattr(field, 'auto_now', False)]
+        groups = defaultdict(list)
+        messages = defaultdict(list)
+        for form in forms:
+            obj = form.instance
+            fields = set(form.changed_data)
+            for name in auto_now:
+                setattr(obj, name, now)
+                fields.add(name)
+            if isinstance(obj, PublishableModel) and obj.PUBLICATION_FIELDS & fields:
+                obj.is_live = obj.is_active
+                fields.add('is_live')
+            if isinstance(obj, SearchableModel) and set(obj.search_fields) & fields:
+                obj.search_document = obj.get_search_document()
+                fields.add('search_document')
+            groups[frozenset(fields)].append(obj)
+            message = json.dumps(self.construct_change_message(request, form, None))
+            messages[message].append(obj)
+
+        updated = set()
+        for fields, objs in groups.items():
+            self.model._default_manager.bulk_update(objs, sorted(fields), batch_size=500)
+            updated |= fields
+        for message, objs in messages.items():
+            LogEntry.objects.log_actions(
+                user_id=request.user.pk,
+                queryset=objs,
+                action_flag=CHANGE,
+                change_message=message,
+            )
+        return updated
+
+
+def _is_local_field(opts, name):
+    if name == 'pk':
+        return True
+    try:
+        field = opts.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and not field.many_to_many
+
+
+class LargeTableChangeList(ChangeList):
+    """
+    LargeTableAdminMixin の一覧
+
+    - ADMIN_DATE_HIERARCHY_MAX_ROWS 件を超えるテーブルでは date_hierarchy を表示しない
+    - 一覧の表示に使う列だけを読み込む（LargeTableAdminMixin.get_list_only_fields）
+    """
+
+    def __init__(self, request, model, list_display, list_display_links, list_filter, date_hierarchy, *args, **kwargs):
+        if date_hierarchy and cached_count(model._base_manager.all()) > settings.ADMIN_DATE_HIERARCHY_MAX_ROWS:
+            # 年・月の一覧（SELECT DISTINCT）のために全件を走査しない。日付は list_filter で絞り込む
+            date_hierarchy = None
+        super().__init__(request, model, list_display, list_display_links, list_filter, date_hierarchy, *args, **kwargs)
+
+    def get_results(self, request):
+        fields = self.model_admin.get_list_only_fields(request)
+        if fields is not None:
+            fields = set(fields)
+            # select_related で読み込む外部キーは遅延読み込みにできない
+            if isinstance(self.queryset.query.select_related, dict):
+                fields.update(self.queryset.query.select_related)
+            # 並び順の値は KeysetPaginator が参照する
+            for name in self.queryset.query.order_by:
+                if isinstance(name, str) and _is_local_field(self.opts, name.lstrip('-')):
+                    fields.add(name.lstrip('-'))
+            self.queryset = self.queryset.only(*fields)
+        super().get_results(request)
+
+
+class LargeTableAdminMixin:
+    """
+    行数の多いテーブル用の管理画面ミックスイン
+
+    - 件数はキャッシュした値（大きなテーブルは統計情報の推定値）を使い、
+      絞り込み前の総件数（show_full_result_count）は数えない
+    - 直前に表示したページから「次へ」で移動したページは OFFSET ではなく前のページの最後の行から読む
+      （KeysetPaginator、セッションごと）。番号を指定して移動したページは OFFSET で読む
+    - date_hierarchy は ADMIN_DATE_HIERARCHY_MAX_ROWS 件を超えると表示しない
+    - 一覧では list_display のモデルのフィールドと list_only_fields だけを読み込む。
+      list_display に関数やメソッドを指定する場合は、参照する列を list_only_fields に加える
+    """
+    paginator = KeysetPaginator
+    show_full_result_count = False
+    list_only_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        # 他のセッションが表示したページの続きを読まない
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page, scope=request.session.session_key,
+        )
+
+    def get_list_only_fields(self, request):
+        """
+        一覧で読み込む列（None なら全列）
+        """
+        list_display = self.get_list_display(request)
+        if '__str__' in list_display and not self.list_only_fields:
+            # __str__ が参照する列は分からない
+            return None
+        fields = {'pk', *self.list_only_fields}
+        fields.update(
+            name for name in list_display
+            if isinstance(name, str) and _is_local_field(self.opts, name)
+        )
+        return fields
 
 
 @admin.register(Page)
-class PageAdmin(admin.ModelAdmin):
+class PageAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'slug', 'is_published', 'published_at', 'created_at']
     list_filter = ['is_published', 'slug', 'created_at']
     search_fields = ['title', 'content']
@@ -28,7 +238,7 @@ class PageAdmin(admin.ModelAdmin):
 
 
 @admin.register(FAQ)
-class FAQAdmin(admin.ModelAdmin):
+class FAQAdmin(BulkListEditableAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ['question', 'category', 'order', 'is_featured', 'is_published', 'created_at']
     list_filter = ['category', 'is_featured', 'is_published', 'created_at']
     list_editable = ['order', 'is_featured', 'is_published']
@@ -46,7 +256,7 @@ class FAQAdmin(admin.ModelAdmin):
 
 
 @admin.register(Contact)
-class ContactAdmin(admin.ModelAdmin):
+class ContactAdmin(BulkListEditableAdminMixin, LargeTableAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ['subject', 'name', 'email', 'category', 'status', 'created_at']
     list_filter = ['status', 'category', 'created_at']
     list_editable = ['status']
@@ -71,12 +281,47 @@ class ContactAdmin(admin.ModelAdmin):
         return qs.select_related('user', 'assigned_to')
 
 
+@admin.register(ArchivedContact)
+class ArchivedContactAdmin(admin.ModelAdmin):
+    """アーカイブ済みお問い合わせ（閲覧専用）"""
+    list_display = ['subject', 'name', 'email', 'category', 'status', 'created_at', 'archived_at']
+    list_filter = ['status', 'category']
+    search_fields = ['name', 'email', 'subject']
+    readonly_fields = [field.name for field in ArchivedContact._meta.fields]
+
+    fieldsets = (
+        (_('お問い合わせ情報'), {
+            'fields': ('name', 'email', 'category', 'subject', 'message')
+        }),
+        (_('対応状況'), {
+            'fields': ('status', 'assigned_to', 'notes', 'resolved_at')
+        }),
+        (_('関連情報'), {
+            'fields': ('id', 'user', 'created_at', 'updated_at', 'archived_at')
+        }),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('user', 'assigned_to')
+
+
 @admin.register(Attachment)
-class AttachmentAdmin(admin.ModelAdmin):
+class AttachmentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['original_filename', 'file_size_display', 'mime_type', 'uploaded_by', 'is_public', 'created_at']
+    list_only_fields = ['file_size']
     list_filter = ['is_public', 'mime_type', 'created_at']
     search_fields = ['original_filename', 'description']
-    readonly_fields = ['id', 'file_size', 'file_size_display', 'download_count', 'created_at', 'updated_at']
+    readonly_fields = [
+        'id', 'file_size', 'file_size_display', 'mime_type', 'checksum',
+        'download_count', 'created_at', 'updated_at',
+    ]
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -84,7 +329,7 @@ class AttachmentAdmin(admin.ModelAdmin):
             'fields': ('file', 'description')
         }),
         (_('ファイル情報'), {
-            'fields': ('id', 'original_filename', 'file_size', 'file_size_display', 'mime_type')
+            'fields': ('id', 'original_filename', 'file_size', 'file_size_display', 'mime_type', 'checksum')
         }),
         (_('アクセス設定'), {
             'fields': ('is_public', 'download_count')
@@ -100,7 +345,7 @@ class AttachmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Image)
-class ImageAdmin(admin.ModelAdmin):
+class ImageAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'image', 'width', 'height', 'uploaded_by', 'created_at']
     list_filter = ['created_at']
     search_fields = ['title', 'alt_text', 'caption']
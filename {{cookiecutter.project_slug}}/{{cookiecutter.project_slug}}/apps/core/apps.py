@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "core"
+    name = "apps.core"
+
+    def ready(self):
+        # キャッシュ無効化のシグナルを登録
+        from . import catalog, page_cache  # noqa: F401
+
+        post_migrate.connect(_install_search_indexes, sender=self)
+
+
+def _install_search_indexes(sender, using, **kwargs):
+    from apps.core.search import install_search_indexes
+
+    install_search_indexes(using)
@@ -0,0 +1,54 @@
+"""
+In-process background work.
+
+Celery に送れない処理（平文のパスワードを扱う、Celery を使わない構成など）を、
+リクエストを待たせないようプロセス内のスレッドで実行する。
+
+- 名前ごとに1スレッドで順に処理する（重い処理が別の種類の処理を待たせない）
+- fork 前に作られたスレッドは子プロセスに引き継がれないため、プロセスごとに作る
+- 処理後、そのスレッドで開いたDB接続を閉じる
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+_executors = {}
+_executors_pid = None
+_lock = threading.Lock()
+
+
+def get_executor(name):
+    """
+    名前ごとの ThreadPoolExecutor（ワーカー1つ）
+    """
+    global _executors_pid
+    if _executors_pid == os.getpid() and name in _executors:
+        return _executors[name]
+    with _lock:
+        if _executors_pid != os.getpid():
+            _executors.clear()
+            _executors_pid = os.getpid()
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        return _executors[name]
+
+
+def _run(function, args):
+    try:
+        return function(*args)
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            # このスレッドで開いた接続を残さない
+            connections.close_all()
+
+
+def submit(name, function, *args):
+    """
+    function(*args) をバックグラウンドのスレッドで実行する
+
+    Returns:
+        concurrent.futures.Future
+    """
+    return get_executor(name).submit(_run, function, args)
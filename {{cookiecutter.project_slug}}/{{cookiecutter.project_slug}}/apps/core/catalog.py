@@ -0,0 +1,123 @@
+"""
+In-process FAQ catalog.
+
+公開中のFAQをワーカープロセス内に不変のスナップショットとして保持する。
+FAQが変更されると共有キャッシュ上のバージョンを更新し、各ワーカーは
+次回アクセス時にバージョンの違いを検知してスナップショットを作り直す。
+"""
+import threading
+import uuid
+from types import MappingProxyType
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.models import FAQ
+from apps.core.signals import bulk_updated
+
+FAQ_CATALOG_VERSION_KEY = 'core:faq_catalog:version'
+
+
+class FAQEntry(NamedTuple):
+    """
+    カタログ内のFAQ（読み取り専用）
+    """
+    id: int
+    category: str
+    question: str
+    answer: str
+    order: int
+    is_featured: bool
+
+    # スナップショットには公開中の行のみが含まれる
+    is_active = True
+
+    def get_category_display(self):
+        return _CATEGORY_LABELS.get(self.category, self.category)
+
+
+_CATEGORY_LABELS = dict(FAQ.CATEGORY_CHOICES)
+_ENTRY_FIELDS = FAQEntry._fields
+
+
+class FAQCatalog:
+    """
+    公開中FAQのスナップショット
+    """
+    __slots__ = ('version', 'entries', 'by_id', 'by_category', 'featured')
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = tuple(entries)
+        self.by_id = MappingProxyType({entry.id: entry for entry in self.entries})
+
+        grouped = {}
+        for entry in self.entries:
+            grouped.setdefault(entry.category, []).append(entry)
+        self.by_category = MappingProxyType({
+            category: tuple(items) for category, items in grouped.items()
+        })
+        self.featured = tuple(entry for entry in self.entries if entry.is_featured)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, pk):
+        return self.by_id.get(pk)
+
+    def for_category(self, category):
+        return self.by_category.get(category, ())
+
+    @classmethod
+    def load(cls, version):
+        rows = FAQ.objects.live().order_by('category', 'order', '-created_at').values_list(*_ENTRY_FIELDS)
+        return cls(version, (FAQEntry._make(row) for row in rows))
+
+
+_catalog = None
+_lock = threading.Lock()
+
+
+def get_faq_catalog():
+    """
+    現在のFAQカタログを返す
+
+    共有キャッシュのバージョンがスナップショットと一致する限り、
+    データベースにはアクセスしない。
+    """
+    global _catalog
+
+    version = cache.get(FAQ_CATALOG_VERSION_KEY)
+    catalog = _catalog
+    if catalog is not None and version is not None and catalog.version == version:
+        return catalog
+
+    with _lock:
+        if _catalog is not None and version is not None and _catalog.version == version:
+            return _catalog
+        if version is None:
+            # 初回またはキャッシュ消失時。他のワーカーが先に登録した値を優先する
+            cache.add(FAQ_CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(FAQ_CATALOG_VERSION_KEY)
+        # バージョンを読んでからロードするので、ロード中の変更は次回のアクセスで反映される
+        _catalog = FAQCatalog.load(version)
+        return _catalog
+
+
+def invalidate_faq_catalog():
+    """
+    全ワーカーのFAQカタログを無効化（コミット後にバージョンを更新）
+    """
+    transaction.on_commit(
+        lambda: cache.set(FAQ_CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+    )
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+@receiver(bulk_updated, sender=FAQ)
+def _invalidate_on_change(sender, **kwargs):
+    invalidate_faq_catalog()
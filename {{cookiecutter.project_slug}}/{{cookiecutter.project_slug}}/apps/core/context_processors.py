@@ -0,0 +1,33 @@
+"""
+Core context processors.
+"""
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+
+def get_current_url_name(request):
+    """
+    現在のURL名（名前空間付き、例: "dashboard:index"）を返す
+
+    ビュー実行時に解決済みの request.resolver_match を使い、
+    無い場合（エラーページ等）もリクエストごとに1回だけ解決する。
+    """
+    if not hasattr(request, '_current_url_name'):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                match = None
+        request._current_url_name = match.view_name if match else ''
+    return request._current_url_name
+
+
+def navigation(request):
+    """
+    ナビゲーション（サイドバー・ヘッダー）用のコンテキスト
+    """
+    return {
+        'current_url_name': get_current_url_name(request),
+        'FRAGMENT_CACHE_TIMEOUT': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,62 @@
+"""
+Database connection pool helpers.
+
+DATABASES の OPTIONS に pool を設定した場合（psycopg3）、ワーカープロセスごとに
+コネクションプールが作られる。プールはスレッドとソケットを持つため fork をまたいで
+使えない。また統計値はプロセス単位なので、各ワーカーから報告させる。
+"""
+from django.db import connections
+
+
+def has_pool(connection):
+    """
+    コネクションプールを使う設定のDB接続か
+    """
+    return bool(connection.settings_dict['OPTIONS'].get('pool')) and hasattr(connection, 'close_pool')
+
+
+def get_pool_stats(reset=False):
+    """
+    このプロセスで開いているコネクションプールの統計
+
+    Args:
+        reset: 累積値（requests_num 等）を取得後にリセットするか
+
+    Returns:
+        {エイリアス: psycopg_pool の統計値} の辞書。プールを使っていなければ空
+    """
+    stats = {}
+    for connection in connections.all(initialized_only=True):
+        if not has_pool(connection) or connection.alias not in connection._connection_pools:
+            continue
+        pool = connection.pool
+        if pool.closed:
+            continue
+        stats[connection.alias] = pool.pop_stats() if reset else pool.get_stats()
+    return stats
+
+
+def close_pools():
+    """
+    コネクションプールを閉じる（fork 前のマスターで呼び出す）
+    """
+    for connection in connections.all(initialized_only=True):
+        if has_pool(connection):
+            connection.close_pool()
+
+
+def detach_pools():
+    """
+    fork 時に引き継いだコネクションプールを閉じずに切り離す
+
+    閉じるとプール内の接続を通じて親プロセスのセッションまで終了させてしまう。
+    次の接続時に、このプロセス用のプールが新しく作られる。
+
+    Returns:
+        切り離したプールのリスト（呼び出し側で参照を保持すること）
+    """
+    detached = []
+    for connection in connections.all(initialized_only=True):
+        if has_pool(connection) and connection.alias in connection._connection_pools:
+            detached.append(connection._connection_pools.pop(connection.alias))
+    return detached
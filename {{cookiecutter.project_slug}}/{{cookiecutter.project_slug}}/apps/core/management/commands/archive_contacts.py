@@ -0,0 +1,44 @@
+"""
+Move resolved/closed contacts into the archive table.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.core.models import Contact
+
+
+class Command(BaseCommand):
+    help = "解決済み・クローズのお問い合わせをアーカイブテーブルへ移動します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CONTACT_ARCHIVE_AFTER_DAYS,
+            help="最終更新からの経過日数（デフォルト: CONTACT_ARCHIVE_AFTER_DAYS）",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CONTACT_ARCHIVE_BATCH_SIZE,
+            help="1トランザクションで移動する件数",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="移動せずに対象件数のみ表示",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+
+        if options["dry_run"]:
+            cutoff = timezone.now() - timedelta(days=days)
+            count = Contact.objects.archivable(cutoff).count()
+            self.stdout.write(f"アーカイブ対象: {count}件")
+            return
+
+        moved = Contact.objects.archive(older_than_days=days, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{moved}件のお問い合わせをアーカイブしました"))
@@ -0,0 +1,25 @@
+"""
+Export published pages as static files for nginx.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.page_cache import export_pages
+
+
+class Command(BaseCommand):
+    help = "公開中の静的ページをnginx配信用のファイルとして書き出します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.PAGE_EXPORT_ROOT,
+            help="出力先ディレクトリ（デフォルト: PAGE_EXPORT_ROOT）",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("--output または PAGE_EXPORT_ROOT を指定してください")
+
+        exported = export_pages(options["output"])
+        self.stdout.write(self.style.SUCCESS(f"{exported}件のページを書き出しました"))
@@ -0,0 +1,59 @@
+"""
+Regenerate search documents and full-text indexes.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.core.search import get_searchable_models, install_search_indexes
+
+
+class Command(BaseCommand):
+    help = "全文検索用テキストを再生成し、検索インデックスを作成します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="1トランザクションで更新する件数",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="対象のデータベース",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        batch_size = options["batch_size"]
+
+        install_search_indexes(using)
+
+        for model in get_searchable_models():
+            manager = model._base_manager.using(using)
+            fields = ["pk", *model.search_fields, "search_document"]
+            last_pk = None
+            updated = 0
+
+            while True:
+                batch = manager.order_by("pk").only(*fields)
+                if last_pk is not None:
+                    batch = batch.filter(pk__gt=last_pk)
+                rows = list(batch[:batch_size])
+                if not rows:
+                    break
+
+                changed = []
+                for row in rows:
+                    document = row.get_search_document()
+                    if row.search_document != document:
+                        row.search_document = document
+                        changed.append(row)
+                with transaction.atomic(using=using):
+                    manager.bulk_update(changed, ["search_document"])
+                updated += len(changed)
+                last_pk = rows[-1].pk
+
+            self.stdout.write(f"{model._meta.label}: {updated}件を更新しました")
+
+        self.stdout.write(self.style.SUCCESS("検索インデックスを再生成しました"))
@@ -0,0 +1,23 @@
+"""
+Update is_live for rows whose publication window opened or closed.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.publication import sync_publication_state
+
+
+class Command(BaseCommand):
+    help = "公開期間の境界を過ぎたレコードの公開状態（is_live）を更新します"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="前回の実行日時に関わらず全件を照合",
+        )
+
+    def handle(self, *args, **options):
+        went_live, went_offline = sync_publication_state(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"公開状態を更新しました（公開: {went_live}件, 非公開: {went_offline}件）"
+        ))
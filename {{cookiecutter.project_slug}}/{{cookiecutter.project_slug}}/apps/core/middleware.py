@@ -0,0 +1,107 @@
+"""
+Core middleware.
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from .ratelimit import check_rate, rate_limited_response
+from .routers import RoutingState, _request_state, has_replica
+
+REPLICA_PIN_COOKIE = 'db_primary_until'
+
+
+class ReplicaStickinessMiddleware:
+    """
+    書き込みを行ったクライアントの読み取りを一定時間プライマリに固定する
+
+    自分の書き込みがレプリカに反映される前に読み直しても、古いデータが
+    見えないようにする（read-your-writes）。固定期限は Cookie に記録する。
+    SessionMiddleware より後に置き、セッションの保存を書き込みとみなさないこと。
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state, token = self.begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = self.begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.finish(state, response)
+
+    def begin(self, request):
+        try:
+            pinned = float(request.COOKIES.get(REPLICA_PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            pinned = False
+        state = RoutingState(pinned=pinned)
+        return state, _request_state.set(state)
+
+    def finish(self, state, response):
+        if state.wrote and has_replica():
+            seconds = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, str(int(time.time() + seconds)),
+                max_age=seconds, httponly=True, samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+
+class RateLimitMiddleware:
+    """
+    RATELIMIT_PATHS に前方一致するパスへの書き込みリクエストをIPごとに制限する
+
+    セッションや認証の読み込みより前に拒否できるよう、SessionMiddleware より前に置く。
+    ビュー単位の細かい制限は apps.core.ratelimit.ratelimit を使う。
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.check(request)
+        if response is not None:
+            return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        response = await sync_to_async(self.check)(request)
+        if response is not None:
+            return response
+        return await self.get_response(request)
+
+    def check(self, request):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return None
+        for prefix, group in settings.RATELIMIT_PATHS.items():
+            if request.path_info.startswith(prefix):
+                usage = check_rate(request, group, ('ip',))
+                if usage is not None and not usage.allowed:
+                    return rate_limited_response(usage)
+        return None
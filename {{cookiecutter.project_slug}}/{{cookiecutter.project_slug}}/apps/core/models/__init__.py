@@ -7,8 +7,15 @@ from .base import (
     SoftDeleteModel,
     PublishableModel,
     OrderableModel,
+    SearchableModel,
 )
-from .pages import Page, FAQ, Contact
+from .managers import (
+    SoftDeleteQuerySet,
+    SoftDeleteManager,
+    PublishableQuerySet,
+    PublishableManager,
+)
+from .pages import Page, FAQ, Contact, ArchivedContact
 from .attachments import Attachment, Image
 
 __all__ = [
@@ -18,10 +25,17 @@ __all__ = [
     'SoftDeleteModel',
     'PublishableModel',
     'OrderableModel',
+    'SearchableModel',
+    # Managers
+    'SoftDeleteQuerySet',
+    'SoftDeleteManager',
+    'PublishableQuerySet',
+    'PublishableManager',
     # Page models
     'Page',
     'FAQ',
     'Contact',
+    'ArchivedContact',
     # Attachment models
     'Attachment',
     'Image',
@@ -5,6 +5,7 @@ import os
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import FileExtensionValidator
+from apps.core.utils.files import FileContentValidator, inspect_file
 from .base import TimeStampedModel, UUIDModel
 
 
@@ -39,7 +40,7 @@ class Attachment(TimeStampedModel, UUIDModel):
     file = models.FileField(
         _("ファイル"),
         upload_to=get_upload_path,
-        validators=[FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS)]
+        validators=[FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS), FileContentValidator()]
     )
     original_filename = models.CharField(
         _("オリジナルファイル名"),
@@ -54,6 +55,12 @@ class Attachment(TimeStampedModel, UUIDModel):
         max_length=100,
         blank=True
     )
+    checksum = models.CharField(
+        _("SHA-256"),
+        max_length=64,
+        blank=True,
+        db_index=True
+    )
     description = models.TextField(
         _("説明"),
         blank=True
@@ -84,9 +91,15 @@ class Attachment(TimeStampedModel, UUIDModel):
         return self.original_filename
 
     def save(self, *args, **kwargs):
-        """保存時にファイル情報を自動設定"""
-        if self.file:
-            self.original_filename = self.file.name
+        """保存時にファイル情報を自動設定（新しくアップロードされたファイルのみ読み込む）"""
+        if self.file and not self.file._committed:
+            # MIMEタイプ・サイズ・ハッシュを1回の読み込みで求める（検証時の結果があれば再利用）
+            info = inspect_file(self.file)
+            self.original_filename = os.path.basename(self.file.name)
+            self.file_size = info.size
+            self.mime_type = info.mime_type
+            self.checksum = info.sha256
+        elif self.file and self.file_size is None:
             self.file_size = self.file.size
         super().save(*args, **kwargs)
 
@@ -115,7 +128,7 @@ class Image(TimeStampedModel, UUIDModel):
     image = models.ImageField(
         _("画像"),
         upload_to=get_upload_path,
-        validators=[FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS)]
+        validators=[FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS), FileContentValidator()]
     )
     title = models.CharField(
         _("タイトル"),
@@ -2,9 +2,14 @@
 Core base models.
 """
 import uuid
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Max, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from apps.core.search import build_document
+from apps.core.signals import soft_deleted, restored, bulk_updated
+from .managers import SoftDeleteManager, PublishableManager
 
 
 class TimeStampedModel(models.Model):
@@ -46,17 +51,19 @@ class UUIDModel(models.Model):
 class SoftDeleteModel(models.Model):
     """
     論理削除機能を持つ抽象モデル
+
+    インデックスを継承するには、具象モデルのMetaをSoftDeleteModel.Metaから継承すること。
+    alive() の一覧用インデックスは絞り込み・並び替えの列がモデルごとに異なるため、
+    具象モデルで condition=Q(is_deleted=False) の部分インデックスとして定義する。
     """
     is_deleted = models.BooleanField(
         _("削除フラグ"),
-        default=False,
-        db_index=True
+        default=False
     )
     deleted_at = models.DateTimeField(
         _("削除日時"),
         null=True,
-        blank=True,
-        db_index=True
+        blank=True
     )
     deleted_by = models.ForeignKey(
         'accounts.User',
@@ -67,49 +74,95 @@ class SoftDeleteModel(models.Model):
         verbose_name=_("削除者")
     )
 
+    objects = SoftDeleteManager()
+
     class Meta:
         abstract = True
+        indexes = [
+            # ゴミ箱一覧・完全削除ジョブ用
+            models.Index(
+                fields=['deleted_at'],
+                condition=Q(is_deleted=True),
+                name='%(app_label)s_%(class)s_trash',
+            ),
+        ]
 
     def soft_delete(self, user=None):
         """論理削除を実行"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
+        update_fields = ['is_deleted', 'deleted_at']
         if user:
             self.deleted_by = user
-        self.save()
+            update_fields.append('deleted_by')
+        self.save(update_fields=update_fields)
+        soft_deleted.send(sender=self.__class__, pks=[self.pk], user=user)
 
     def restore(self):
         """論理削除を取り消し"""
         self.is_deleted = False
         self.deleted_at = None
         self.deleted_by = None
-        self.save()
+        self.save(update_fields=['is_deleted', 'deleted_at', 'deleted_by'])
+        restored.send(sender=self.__class__, pks=[self.pk])
 
 
 class PublishableModel(models.Model):
     """
     公開管理機能を持つ抽象モデル
+
+    インデックスを継承するには、具象モデルのMetaをPublishableModel.Metaから継承すること。
     """
     is_published = models.BooleanField(
         _("公開状態"),
-        default=False,
-        db_index=True
+        default=False
     )
     published_at = models.DateTimeField(
         _("公開日時"),
         null=True,
-        blank=True,
-        db_index=True
+        blank=True
     )
     published_until = models.DateTimeField(
         _("公開終了日時"),
         null=True,
-        blank=True,
-        db_index=True
+        blank=True
+    )
+    is_live = models.BooleanField(
+        _("公開中"),
+        default=False,
+        editable=False,
+        help_text=_("保存時と公開スケジューラーで更新されるis_activeの実体化カラム")
     )
 
+    objects = PublishableManager()
+
+    # 変更時にis_liveの再計算が必要なフィールド
+    PUBLICATION_FIELDS = {'is_published', 'published_at', 'published_until'}
+
     class Meta:
         abstract = True
+        indexes = [
+            # published_now()・公開スケジューラー用の公開期間インデックス（公開中のレコードのみ）
+            models.Index(
+                fields=['published_at', 'published_until'],
+                condition=Q(is_published=True),
+                name='%(app_label)s_%(class)s_pub',
+            ),
+            # live()・公開終了の検出用
+            models.Index(
+                fields=['published_until'],
+                condition=Q(is_live=True),
+                name='%(app_label)s_%(class)s_live',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """保存時にis_liveを現在の公開状態に合わせる"""
+        self.is_live = self.is_active
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.PUBLICATION_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'is_live'}
+        super().save(*args, **kwargs)
 
     @property
     def is_active(self):
@@ -131,7 +184,18 @@ class PublishableModel(models.Model):
 class OrderableModel(models.Model):
     """
     並び順管理機能を持つ抽象モデル
+
+    並び順は ORDER_STEP 間隔で採番し、移動時は前後の行の中間値を
+    割り当てることで、移動した行だけを更新する。
+    隙間が無くなった場合は同じスコープ内を振り直す。
     """
+    # 採番の間隔
+    ORDER_STEP = 1024
+    # これより隙間が狭くなったらバックグラウンドで振り直す
+    ORDER_MIN_GAP = 8
+    # 並び順を共有するフィールド（例: ('category',)）
+    order_scope = ()
+
     order = models.PositiveIntegerField(
         _("並び順"),
         default=0,
@@ -140,4 +204,220 @@ class OrderableModel(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ['order', '-created_at']
\ No newline at end of file
+        ordering = ['order', '-created_at']
+
+    def save(self, *args, **kwargs):
+        # 並び順未指定の新規行はスコープの末尾に追加
+        if self._state.adding and not self.order:
+            last = self.get_order_siblings().aggregate(last=Max('order'))['last']
+            self.order = (last or 0) + self.ORDER_STEP
+        super().save(*args, **kwargs)
+
+    def get_order_scope(self):
+        """
+        並び順のスコープを {attname: 値} で返す
+        """
+        return {
+            self._meta.get_field(name).attname: getattr(self, self._meta.get_field(name).attname)
+            for name in self.order_scope
+        }
+
+    def get_order_siblings(self):
+        """
+        同じスコープ内の自分以外の行
+        """
+        siblings = self.__class__._default_manager.filter(**self.get_order_scope())
+        if self.pk is not None:
+            siblings = siblings.exclude(pk=self.pk)
+        return siblings.order_by('order', 'pk')
+
+    def move_before(self, other):
+        """
+        指定した行の直前に移動
+        """
+        def bounds():
+            other_order = self._current_order(other)
+            lower = self.get_order_siblings().filter(order__lt=other_order).values_list('order', flat=True).last()
+            return lower, other_order
+        self._move(bounds)
+
+    def move_after(self, other):
+        """
+        指定した行の直後に移動
+        """
+        def bounds():
+            other_order = self._current_order(other)
+            upper = self.get_order_siblings().filter(order__gt=other_order).values_list('order', flat=True).first()
+            return other_order, upper
+        self._move(bounds)
+
+    def move_to(self, position):
+        """
+        スコープ内の position 番目（0始まり）に移動
+        """
+        def bounds():
+            orders = self.get_order_siblings().values_list('order', flat=True)
+            if position <= 0:
+                return None, orders.first()
+            neighbours = list(orders[position - 1:position + 1])
+            if not neighbours:
+                return orders.last(), None
+            return neighbours[0], neighbours[1] if len(neighbours) > 1 else None
+        self._move(bounds)
+
+    def _current_order(self, other):
+        return self.__class__._default_manager.filter(pk=other.pk).values_list('order', flat=True).get()
+
+    def _move(self, bounds):
+        lower, upper = bounds()
+        order = self._order_between(lower, upper)
+        if order is None:
+            # 隙間が無いのでスコープを振り直してから再計算
+            self.rebalance_order(**self.get_order_scope())
+            lower, upper = bounds()
+            order = self._order_between(lower, upper)
+
+        self.order = order
+        self.save(update_fields=['order'])
+
+        if (lower is not None and order - lower < self.ORDER_MIN_GAP) or \
+                (upper is not None and upper - order < self.ORDER_MIN_GAP):
+            self._schedule_rebalance()
+
+    def _order_between(self, lower, upper):
+        """
+        lower と upper の間の並び順を返す。隙間が無い場合は None
+        """
+        if upper is None:
+            return (lower or 0) + self.ORDER_STEP
+        lower = lower or 0
+        if upper - lower < 2:
+            return None
+        return (lower + upper) // 2
+
+    def _schedule_rebalance(self):
+        scope = self.get_order_scope()
+        try:
+            from apps.core.tasks import rebalance_order
+        except ImportError:
+            # Celeryを使わない構成では同期的に振り直す
+            transaction.on_commit(lambda: self.rebalance_order(**scope))
+            return
+        label = self._meta.label
+        transaction.on_commit(lambda: rebalance_order.delay(label, scope))
+
+    @classmethod
+    def rebalance_order(cls, **scope):
+        """
+        スコープ内の並び順を ORDER_STEP 間隔で振り直す
+
+        Returns:
+            更新した件数
+        """
+        with transaction.atomic():
+            rows = list(
+                cls._default_manager.filter(**scope)
+                .select_for_update()
+                .order_by('order', 'pk')
+                .only('pk', 'order')
+            )
+            changed = []
+            for index, row in enumerate(rows, start=1):
+                if row.order != index * cls.ORDER_STEP:
+                    row.order = index * cls.ORDER_STEP
+                    changed.append(row)
+            cls._default_manager.bulk_update(changed, ['order'], batch_size=500)
+        if changed:
+            bulk_updated.send(sender=cls, fields=['order'])
+        return len(changed)
+
+    @classmethod
+    def reorder(cls, pks):
+        """
+        指定したpkの順に並び順を一括で設定
+
+        Args:
+            pks: 並べたい順のpkのリスト（同じスコープの全行を渡すこと）
+
+        Returns:
+            更新した件数
+
+        Raises:
+            ValidationError: 重複・存在しないpk・複数スコープのpkが含まれる場合や、
+                             スコープ内の行が不足している場合
+        """
+        pks = list(pks)
+        if len(set(pks)) != len(pks):
+            raise ValidationError(_("IDが重複しています。"), code='duplicate_pk')
+        scope_fields = [cls._meta.get_field(name).attname for name in cls.order_scope]
+        with transaction.atomic():
+            scopes = set(
+                cls._default_manager.filter(pk__in=pks).values_list('pk', *scope_fields).order_by()
+            )
+            missing = set(pks) - {row[0] for row in scopes}
+            if missing:
+                raise ValidationError(
+                    _("存在しないIDが含まれています: %(ids)s"),
+                    code='invalid_pk',
+                    params={'ids': ', '.join(str(pk) for pk in sorted(missing))},
+                )
+            if len({row[1:] for row in scopes}) > 1:
+                raise ValidationError(_("異なる並び順のスコープの行が含まれています。"), code='mixed_scope')
+
+            scope = dict(zip(scope_fields, next(iter(scopes))[1:])) if scopes else {}
+            rows = list(
+                cls._default_manager.filter(**scope)
+                .select_for_update()
+                .only('pk', 'order')
+            )
+            if len(rows) != len(pks):
+                raise ValidationError(
+                    _("同じスコープの全行を指定してください（%(expected)d件中%(given)d件）。"),
+                    code='incomplete_scope',
+                    params={'expected': len(rows), 'given': len(pks)},
+                )
+
+            positions = {pk: index * cls.ORDER_STEP for index, pk in enumerate(pks, start=1)}
+            changed = []
+            for row in rows:
+                if row.order != positions[row.pk]:
+                    row.order = positions[row.pk]
+                    changed.append(row)
+            cls._default_manager.bulk_update(changed, ['order'], batch_size=500)
+        if changed:
+            bulk_updated.send(sender=cls, fields=['order'])
+        return len(changed)
+
+
+class SearchableModel(models.Model):
+    """
+    全文検索対象の抽象モデル
+
+    search_fields の値を分かち書きして search_document に保存する。
+    インデックスは apps.core.search がデータベースごとに作成する。
+    QuerySet.update() / bulk_update() では更新されないため、
+    その場合は rebuild_search_index コマンドで再生成する。
+    """
+    # 検索対象のフィールド
+    search_fields = ()
+
+    search_document = models.TextField(
+        _("検索用テキスト"),
+        blank=True,
+        default='',
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def get_search_document(self):
+        return build_document(*(getattr(self, name) for name in self.search_fields))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.search_fields):
+            self.search_document = self.get_search_document()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_document'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,124 @@
+"""
+Core querysets and managers.
+"""
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.signals import soft_deleted, restored, bulk_updated
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    論理削除モデル用クエリセット
+    """
+
+    def alive(self):
+        """削除されていないレコード"""
+        return self.filter(is_deleted=False)
+
+    def deleted(self):
+        """論理削除済みのレコード"""
+        return self.filter(is_deleted=True)
+
+    def soft_delete(self, user=None):
+        """
+        対象レコードを1回のUPDATEでまとめて論理削除
+
+        Args:
+            user: 削除を実行したユーザー
+
+        Returns:
+            論理削除した件数
+        """
+        values = {'is_deleted': True, 'deleted_at': timezone.now()}
+        if user:
+            values['deleted_by'] = user
+        return self._bulk_update_state(self.alive(), values, soft_deleted, user=user)
+
+    def restore(self):
+        """
+        対象レコードの論理削除を1回のUPDATEでまとめて取り消し
+
+        Returns:
+            復元した件数
+        """
+        values = {'is_deleted': False, 'deleted_at': None, 'deleted_by': None}
+        return self._bulk_update_state(self.deleted(), values, restored)
+
+    def _bulk_update_state(self, queryset, values, signal, **signal_kwargs):
+        """対象の主キーを確定してからUPDATEし、完了後にシグナルをまとめて送信"""
+        with transaction.atomic(using=self.db):
+            pks = list(queryset.select_for_update().values_list('pk', flat=True))
+            if not pks:
+                return 0
+            count = self.model._base_manager.using(self.db).filter(pk__in=pks).update(**values)
+        signal.send(sender=self.model, pks=pks, **signal_kwargs)
+        return count
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    論理削除モデル用マネージャー
+    """
+
+
+class PublishableQuerySet(models.QuerySet):
+    """
+    公開管理モデル用クエリセット
+    """
+
+    def published_now(self, now=None):
+        """
+        現在公開中のレコード
+
+        PublishableModel.is_activeと同じ条件をSQLで表現したもの。
+        """
+        if now is None:
+            now = timezone.now()
+        return self.filter(
+            Q(published_at__isnull=True) | Q(published_at__lte=now),
+            Q(published_until__isnull=True) | Q(published_until__gte=now),
+            is_published=True,
+        )
+
+    def live(self):
+        """
+        公開中のレコード（実体化済みのis_liveによるインデックス検索）
+
+        公開期間の境界を過ぎた行は公開スケジューラーの次回実行で反映される。
+        """
+        return self.filter(is_live=True)
+
+    def sync_live(self, since=None, now=None):
+        """
+        is_liveを公開期間に合わせて更新
+
+        Args:
+            since: 前回の実行日時。指定時はその後に境界（published_at / published_until）を
+                   過ぎた行だけを処理する。省略時は全件を照合する。
+            now: 基準日時（省略時は現在日時）
+
+        Returns:
+            (公開に切り替えた件数, 非公開に切り替えた件数)
+        """
+        if now is None:
+            now = timezone.now()
+
+        to_live = self.filter(is_live=False).published_now(now)
+        to_offline = self.filter(is_live=True).filter(
+            Q(is_published=False) | Q(published_at__gt=now) | Q(published_until__lt=now)
+        )
+        if since is not None:
+            to_live = to_live.filter(published_at__gt=since)
+            to_offline = to_offline.filter(published_until__gte=since, published_until__lt=now)
+
+        went_live, went_offline = to_live.update(is_live=True), to_offline.update(is_live=False)
+        if went_live or went_offline:
+            bulk_updated.send(sender=self.model, fields=['is_live'])
+        return went_live, went_offline
+
+
+class PublishableManager(models.Manager.from_queryset(PublishableQuerySet)):
+    """
+    公開管理モデル用マネージャー
+    """
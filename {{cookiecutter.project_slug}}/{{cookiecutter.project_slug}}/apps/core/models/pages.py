@@ -1,13 +1,16 @@
 """
 Static pages models.
 """
-from django.db import models
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
-from .base import TimeStampedModel, PublishableModel, OrderableModel
+from .base import TimeStampedModel, PublishableModel, OrderableModel, SearchableModel
 
 
-class Page(TimeStampedModel, PublishableModel):
+class Page(TimeStampedModel, PublishableModel, SearchableModel):
     """
     静的ページモデル（利用規約、プライバシーポリシー等）
     """
@@ -18,6 +21,8 @@ class Page(TimeStampedModel, PublishableModel):
         ('help', 'ヘルプ'),
         ('contact', 'お問い合わせ'),
     ]
+
+    search_fields = ('title', 'content')
     
     slug = models.SlugField(
         _("スラッグ"),
@@ -40,7 +45,7 @@ class Page(TimeStampedModel, PublishableModel):
         help_text=_("SEO用の説明文")
     )
 
-    class Meta:
+    class Meta(PublishableModel.Meta):
         verbose_name = _("ページ")
         verbose_name_plural = _("ページ")
         ordering = ['slug']
@@ -52,7 +57,7 @@ class Page(TimeStampedModel, PublishableModel):
         return reverse('core:page_detail', kwargs={'slug': self.slug})
 
 
-class FAQ(TimeStampedModel, PublishableModel, OrderableModel):
+class FAQ(TimeStampedModel, PublishableModel, OrderableModel, SearchableModel):
     """
     よくある質問モデル
     """
@@ -63,6 +68,9 @@ class FAQ(TimeStampedModel, PublishableModel, OrderableModel):
         ('technical', '技術的な質問'),
         ('other', 'その他'),
     ]
+
+    order_scope = ('category',)
+    search_fields = ('question', 'answer')
     
     category = models.CharField(
         _("カテゴリ"),
@@ -83,18 +91,125 @@ class FAQ(TimeStampedModel, PublishableModel, OrderableModel):
         help_text=_("トップページに表示する")
     )
 
-    class Meta:
+    class Meta(PublishableModel.Meta):
         verbose_name = _("よくある質問")
         verbose_name_plural = _("よくある質問")
         ordering = ['category', 'order', '-created_at']
+        indexes = [
+            *PublishableModel.Meta.indexes,
+            # 公開中FAQの一覧表示用
+            models.Index(
+                fields=['category', 'order', '-created_at'],
+                condition=models.Q(is_live=True),
+                name='core_faq_live_list',
+            ),
+            # カテゴリ内の並び替え（前後の行の検索）用
+            models.Index(
+                fields=['category', 'order'],
+                name='core_faq_cat_order',
+            ),
+        ]
 
     def __str__(self):
         return self.question[:50]
 
 
-class Contact(TimeStampedModel):
+# ホットテーブルとアーカイブテーブルで共通のカラム（UNION用に順序を固定）
+CONTACT_VALUE_FIELDS = [
+    'id', 'name', 'email', 'category', 'subject', 'message', 'status',
+    'user_id', 'assigned_to_id', 'notes', 'resolved_at', 'created_at', 'updated_at',
+]
+
+# アーカイブ済みの行と衝突した場合に上書きするフィールド
+ARCHIVE_UPDATE_FIELDS = [
+    'name', 'email', 'category', 'subject', 'message', 'status',
+    'user', 'assigned_to', 'notes', 'resolved_at', 'created_at', 'updated_at', 'archived_at',
+]
+
+
+class ContactQuerySet(models.QuerySet):
     """
-    お問い合わせモデル
+    お問い合わせ用クエリセット
+    """
+
+    def archivable(self, before):
+        """アーカイブ対象（解決済み・クローズかつ指定日時より前に更新）のお問い合わせ"""
+        return self.filter(
+            status__in=ContactBase.ARCHIVABLE_STATUSES,
+            updated_at__lt=before,
+        )
+
+
+class ContactManager(models.Manager.from_queryset(ContactQuerySet)):
+    """
+    お問い合わせマネージャー
+
+    ホットテーブル（Contact）とアーカイブテーブル（ArchivedContact）を
+    まとめて扱うための入口を提供する。
+    """
+
+    def archive(self, older_than_days=None, batch_size=None):
+        """
+        解決済み・クローズのお問い合わせをアーカイブテーブルへ移動
+
+        Args:
+            older_than_days: 最終更新からの経過日数（省略時はCONTACT_ARCHIVE_AFTER_DAYS）
+            batch_size: 1トランザクションで移動する件数（省略時はCONTACT_ARCHIVE_BATCH_SIZE）
+
+        Returns:
+            移動した件数
+        """
+        if older_than_days is None:
+            older_than_days = getattr(settings, 'CONTACT_ARCHIVE_AFTER_DAYS', 180)
+        if batch_size is None:
+            batch_size = getattr(settings, 'CONTACT_ARCHIVE_BATCH_SIZE', 1000)
+
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        moved = 0
+
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    self.get_queryset()
+                    .archivable(cutoff)
+                    .order_by('pk')
+                    .select_for_update(skip_locked=True)[:batch_size]
+                )
+                if not batch:
+                    break
+
+                # 同じIDのアーカイブ行が既にある場合は、ホット側の新しい内容で上書きする
+                # （ignore_conflicts だと挿入されずに削除だけが行われ、データが失われる）
+                ArchivedContact.objects.bulk_create(
+                    [ArchivedContact.from_contact(contact) for contact in batch],
+                    update_conflicts=True,
+                    unique_fields=['id'],
+                    update_fields=ARCHIVE_UPDATE_FIELDS,
+                )
+                self.get_queryset().filter(pk__in=[contact.pk for contact in batch]).delete()
+
+            moved += len(batch)
+            if len(batch) < batch_size:
+                break
+
+        return moved
+
+    def including_archived(self, *args, **kwargs):
+        """
+        ホットテーブルとアーカイブテーブルを横断して検索
+
+        同じ条件を両テーブルに適用し、UNIONした結果を辞書のクエリセットで返す。
+        ページネーションやシリアライザーはそのまま利用できる。
+        """
+        # 複合クエリ内ではORDER BYを使えないため、各テーブルのデフォルト順序を外す
+        hot = self.get_queryset().filter(*args, **kwargs).order_by().values(*CONTACT_VALUE_FIELDS)
+        archived = ArchivedContact.objects.filter(*args, **kwargs).order_by().values(*CONTACT_VALUE_FIELDS)
+        return hot.union(archived, all=True).order_by('-created_at')
+
+
+class ContactBase(models.Model):
+    """
+    お問い合わせの共通フィールドを持つ抽象モデル
     """
     STATUS_CHOICES = [
         ('new', '新規'),
@@ -102,7 +217,9 @@ class Contact(TimeStampedModel):
         ('resolved', '解決済み'),
         ('closed', 'クローズ'),
     ]
-    
+
+    ARCHIVABLE_STATUSES = ['resolved', 'closed']
+
     CATEGORY_CHOICES = [
         ('general', '一般的なお問い合わせ'),
         ('bug', '不具合報告'),
@@ -110,7 +227,7 @@ class Contact(TimeStampedModel):
         ('billing', '料金について'),
         ('other', 'その他'),
     ]
-    
+
     name = models.CharField(
         _("お名前"),
         max_length=100
@@ -138,6 +255,29 @@ class Contact(TimeStampedModel):
         default='new',
         db_index=True
     )
+    notes = models.TextField(
+        _("管理者メモ"),
+        blank=True
+    )
+    resolved_at = models.DateTimeField(
+        _("解決日時"),
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.subject} - {self.name}"
+
+
+class Contact(TimeStampedModel, SearchableModel, ContactBase):
+    """
+    お問い合わせモデル
+    """
+    search_fields = ('name', 'email', 'subject', 'message')
+
     user = models.ForeignKey(
         'accounts.User',
         on_delete=models.SET_NULL,
@@ -154,20 +294,67 @@ class Contact(TimeStampedModel):
         related_name='assigned_contacts',
         verbose_name=_("担当者")
     )
-    notes = models.TextField(
-        _("管理者メモ"),
-        blank=True
+
+    objects = ContactManager()
+
+    class Meta:
+        verbose_name = _("お問い合わせ")
+        verbose_name_plural = _("お問い合わせ")
+        ordering = ['-created_at']
+        indexes = [
+            # アーカイブ対象の抽出用
+            models.Index(fields=['status', 'updated_at'], name='core_contact_status_upd_idx'),
+        ]
+
+
+class ArchivedContact(ContactBase):
+    """
+    アーカイブ済みお問い合わせモデル
+
+    Contactから移動した行を元のIDと日時のまま保持する。
+    """
+    id = models.BigIntegerField(
+        primary_key=True,
+        editable=False
     )
-    resolved_at = models.DateTimeField(
-        _("解決日時"),
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
         null=True,
-        blank=True
+        blank=True,
+        related_name='archived_contacts',
+        verbose_name=_("ユーザー")
+    )
+    assigned_to = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assigned_archived_contacts',
+        verbose_name=_("担当者")
+    )
+    created_at = models.DateTimeField(
+        _("作成日時"),
+        editable=False,
+        db_index=True
+    )
+    updated_at = models.DateTimeField(
+        _("更新日時"),
+        editable=False
+    )
+    archived_at = models.DateTimeField(
+        _("アーカイブ日時"),
+        auto_now_add=True,
+        editable=False
     )
 
     class Meta:
-        verbose_name = _("お問い合わせ")
-        verbose_name_plural = _("お問い合わせ")
+        verbose_name = _("アーカイブ済みお問い合わせ")
+        verbose_name_plural = _("アーカイブ済みお問い合わせ")
         ordering = ['-created_at']
 
-    def __str__(self):
-        return f"{self.subject} - {self.name}"
\ No newline at end of file
+    @classmethod
+    def from_contact(cls, contact):
+        """Contactインスタンスからアーカイブ行を生成（保存はしない）"""
+        return cls(**{name: getattr(contact, name) for name in CONTACT_VALUE_FIELDS})
+
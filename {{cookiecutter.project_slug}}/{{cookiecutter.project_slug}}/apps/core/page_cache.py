@@ -0,0 +1,176 @@
+"""
+Rendered-page cache for Page.
+
+公開中の静的ページを描画済みHTML（gzip・brotli圧縮版を含む）として共有キャッシュに保持する。
+ページが変更されると共有キャッシュ上のバージョンを更新し、古いエントリは参照されなくなる。
+PAGE_EXPORT_ROOT を設定すると、同じ内容をnginxが直接配信できる静的ファイルとして書き出す。
+"""
+import gzip
+import hashlib
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from apps.core.models import Page
+from apps.core.signals import bulk_updated
+
+try:
+    import brotli
+except ImportError:  # brotli未インストール時はgzipのみ
+    brotli = None
+
+PAGE_CACHE_VERSION_KEY = 'core:page:version'
+PAGE_TEMPLATE = 'core/page_detail.html'
+
+_ACCEPTS_BR = re.compile(r'\bbr\b')
+_ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+_ETAG_SUFFIXES = {'gzip': '-gz', 'br': '-br'}
+
+
+class RenderedPage(NamedTuple):
+    """
+    描画済みのページ
+    """
+    html: bytes
+    gzip: bytes
+    br: bytes
+    etag: str
+    last_modified: float
+
+    def select(self, accept_encoding):
+        """
+        Accept-Encoding に合わせて (本文, Content-Encoding) を返す
+        """
+        if self.br and _ACCEPTS_BR.search(accept_encoding):
+            return self.br, 'br'
+        if _ACCEPTS_GZIP.search(accept_encoding):
+            return self.gzip, 'gzip'
+        return self.html, None
+
+    def etag_for(self, encoding):
+        """
+        Content-Encoding ごとのETag
+
+        強いETagは本文のバイト列ごとに異なる必要があるため、圧縮版には接尾辞を付ける。
+        """
+        suffix = _ETAG_SUFFIXES.get(encoding)
+        return f'{self.etag[:-1]}{suffix}"' if suffix else self.etag
+
+
+def render_page(page):
+    """
+    ページを描画して圧縮版とともに返す
+    """
+    html = render_to_string(PAGE_TEMPLATE, {'page': page}).encode('utf-8')
+    return RenderedPage(
+        html=html,
+        gzip=gzip.compress(html, compresslevel=9, mtime=0),
+        br=brotli.compress(html, mode=brotli.MODE_TEXT) if brotli else b'',
+        etag='"%s"' % hashlib.md5(html, usedforsecurity=False).hexdigest(),
+        last_modified=page.updated_at.timestamp(),
+    )
+
+
+def get_rendered_page(slug):
+    """
+    公開中のページを描画済みの状態で返す。存在しない場合は None
+
+    バージョンを読んでからデータベースを参照するので、描画中にページが
+    更新されても新しいバージョンのキーに古い内容が入ることはない。
+    """
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(PAGE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(PAGE_CACHE_VERSION_KEY)
+
+    key = f'core:page:{slug}:{version}'
+    rendered = cache.get(key) if version is not None else None
+    if rendered is not None:
+        return rendered
+
+    page = Page.objects.live().filter(slug=slug).first()
+    if page is None:
+        return None
+    rendered = render_page(page)
+    if version is not None:
+        cache.set(key, rendered, settings.PAGE_CACHE_TIMEOUT)
+    return rendered
+
+
+def export_pages(root=None):
+    """
+    公開中のページを静的ファイルとして書き出す
+
+    URLのパスに合わせて <root>/pages/<slug>/index.html（.gz / .br）を作成し、
+    非公開になったページのファイルは削除する。
+
+    Returns:
+        書き出したページ数
+    """
+    root = Path(root or settings.PAGE_EXPORT_ROOT)
+    exported = set()
+
+    for page in Page.objects.live():
+        rendered = render_page(page)
+        directory = _export_dir(root, page.slug)
+        directory.mkdir(parents=True, exist_ok=True)
+        _write(directory / 'index.html', rendered.html)
+        _write(directory / 'index.html.gz', rendered.gzip)
+        if rendered.br:
+            _write(directory / 'index.html.br', rendered.br)
+        exported.add(page.slug)
+
+    for slug, _label in Page.SLUG_CHOICES:
+        directory = _export_dir(root, slug)
+        if slug not in exported and directory.is_dir():
+            shutil.rmtree(directory)
+    return len(exported)
+
+
+def _export_dir(root, slug):
+    return root / Page(slug=slug).get_absolute_url().strip('/')
+
+
+def _write(path, content):
+    # 書き込み途中のファイルをnginxが配信しないよう、一時ファイルから置き換える
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(content)
+    tmp.replace(path)
+
+
+def invalidate_page_cache():
+    """
+    描画済みページを無効化（コミット後にバージョンを更新し、静的ファイルを書き出し直す）
+    """
+    def invalidate():
+        cache.set(PAGE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+        if settings.PAGE_EXPORT_ROOT:
+            _schedule_export()
+
+    transaction.on_commit(invalidate)
+
+
+def _schedule_export():
+    try:
+        from apps.core.tasks import export_pages_task
+    except ImportError:
+        # Celeryを使わない構成では同期的に書き出す
+        export_pages()
+        return
+    export_pages_task.delay()
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(bulk_updated, sender=Page)
+def _invalidate_on_change(sender, **kwargs):
+    invalidate_page_cache()
@@ -0,0 +1,172 @@
+"""
+Paginators for large tables.
+
+- CachedCountPaginator: 総件数をキャッシュし、大きなテーブルは統計情報の推定値を使う
+- KeysetPaginator: 直前のページから「次へ」で移動したページを OFFSET ではなく前のページの最後の行から読む
+
+API（apps.api.pagination）と管理画面（apps.core.admin.LargeTableAdminMixin）から使う。
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+COUNT_CACHE_KEY = 'core:count:{digest}'
+KEYSET_CACHE_KEY = 'core:keyset:{scope}:{digest}:{per_page}'
+
+
+def _query_digest(queryset):
+    sql, params = queryset.query.sql_with_params()
+    return hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode(), usedforsecurity=False).hexdigest()
+
+
+def estimated_count(queryset):
+    """
+    PostgreSQLの統計情報（pg_class.reltuples）から絞り込み無しのテーブルの件数を推定する
+
+    Returns:
+        推定件数。PostgreSQL以外、絞り込みがある場合、統計情報が無い場合は None
+    """
+    connection = connections[queryset.db]
+    query = queryset.query
+    if connection.vendor != 'postgresql' or query.where or query.combinator or query.distinct:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def cached_count(queryset):
+    """
+    クエリセットの件数（COUNT_CACHE_TIMEOUT 秒キャッシュする）
+
+    絞り込み無しで COUNT_ESTIMATE_THRESHOLD 件以上のテーブルは COUNT(*) を実行せず
+    統計情報の推定値を返す。そのため件数は概数として扱う。
+    """
+    # 並び順は件数に影響しない
+    key = COUNT_CACHE_KEY.format(digest=_query_digest(queryset.order_by()))
+    count = cache.get(key)
+    if count is None:
+        count = estimated_count(queryset)
+        if count is None or count < settings.COUNT_ESTIMATE_THRESHOLD:
+            count = queryset.count()
+        cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    """
+    総件数を cached_count で求めるページネーター
+    """
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, 'query'):
+            return cached_count(self.object_list)
+        return len(self.object_list)
+
+
+class KeysetPaginator(CachedCountPaginator):
+    """
+    「次へ」で移動したページを OFFSET ではなく前のページの最後の行との比較で取得するページネーター
+
+    scope（管理画面ではセッション）ごとに、最後に表示したページの番号と最後の行の
+    並び順の値をキャッシュに記録する。同じ scope が直前に表示したページの次のページでは、
+    その行より後の行を先頭から読む（読み飛ばす行が無くなる）。
+    それ以外のページ（番号を指定して移動した場合、他のセッションが表示したページ）、
+    scope が無い場合、並び順にモデルの列（NULL 不可）以外を含む場合は OFFSET で取得する。
+    """
+
+    def __init__(self, *args, scope=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scope = scope
+
+    def page(self, number):
+        number = self.validate_number(number)
+        ordering = self.keyset_ordering() if self.scope is not None else None
+        if ordering is None:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        key = self.keyset_cache_key()
+        previous = cache.get(key) if number > 1 else None
+        boundary = previous[1] if previous is not None and previous[0] == number - 1 else None
+        if boundary is not None:
+            queryset = self.object_list.filter(seek_after(ordering, boundary))[:max(top - bottom, 0)]
+        else:
+            queryset = self.object_list[bottom:top]
+
+        # 結果をキャッシュしたクエリセットのまま返す（管理画面の list_editable はクエリセットを必要とする）
+        rows = list(queryset)
+        if rows:
+            values = [getattr(rows[-1], attname) for attname, _descending in ordering]
+            cache.set(key, (number, values), settings.COUNT_CACHE_TIMEOUT)
+        return self._get_page(queryset, number, self)
+
+    def keyset_cache_key(self):
+        """
+        scope・クエリ・1ページの件数ごとの、最後に表示したページを記録するキャッシュキー
+        """
+        scope = hashlib.md5(str(self.scope).encode(), usedforsecurity=False).hexdigest()
+        return KEYSET_CACHE_KEY.format(scope=scope, digest=_query_digest(self.object_list), per_page=self.per_page)
+
+    def keyset_ordering(self):
+        """
+        並び順を [(attname, 降順か), ...] で返す。キーセットで取得できない場合は None
+        """
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return None
+        query = queryset.query
+        if query.combinator or query.distinct or query.extra_order_by:
+            return None
+        opts = queryset.model._meta
+        order_by = query.order_by or (opts.ordering if query.default_ordering else ())
+        ordering = []
+        for name in order_by:
+            if not isinstance(name, str) or '__' in name or name == '?':
+                return None
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                # 注釈（annotate）での並び替え
+                return None
+            if not field.concrete or field.is_relation or field.null:
+                return None
+            ordering.append((field.attname, descending))
+        # 主キー（一意な列）を含まない並び順では、行を一意に特定できない
+        if not any(attname == opts.pk.attname for attname, _descending in ordering):
+            return None
+        return ordering
+
+
+def seek_after(ordering, values):
+    """
+    並び順で values の行より後の行を表す条件
+
+    (a, b) の降順なら a < x OR (a = x AND b < y)。先頭の列の範囲条件を加えて
+    インデックスの範囲検索にする。
+    """
+    condition = Q()
+    equal = {}
+    for (attname, descending), value in zip(ordering, values):
+        condition |= Q(**equal, **{f'{attname}__{"lt" if descending else "gt"}': value})
+        equal[attname] = value
+    first, descending = ordering[0]
+    return Q(**{f'{first}__{"lte" if descending else "gte"}': values[0]}) & condition
@@ -0,0 +1,44 @@
+"""
+Publication scheduler for PublishableModel.
+
+公開期間（published_at / published_until）の境界を過ぎた行の is_live を更新する。
+Celery 使用時は beat から apps.core.tasks.sync_publication_state が毎分実行し、
+Celery を使わない場合は `python manage.py sync_publication_state` を cron などで実行する。
+"""
+import logging
+
+from django.apps import apps
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PUBLICATION_LAST_RUN_KEY = 'core:publication:last_run'
+
+
+def sync_publication_state(full=False):
+    """
+    PublishableModelを継承する全モデルのis_liveを更新
+
+    前回実行以降に公開開始・終了の境界を過ぎた行だけを処理する。
+    前回の実行日時がキャッシュに無い場合や full=True の場合は全件を照合する。
+
+    Returns:
+        (公開に切り替えた件数, 非公開に切り替えた件数)
+    """
+    from apps.core.models import PublishableModel
+
+    now = timezone.now()
+    since = None if full else cache.get(PUBLICATION_LAST_RUN_KEY)
+    went_live = went_offline = 0
+
+    for model in apps.get_models():
+        if issubclass(model, PublishableModel):
+            live, offline = model._default_manager.sync_live(since=since, now=now)
+            went_live += live
+            went_offline += offline
+
+    cache.set(PUBLICATION_LAST_RUN_KEY, now, None)
+    if went_live or went_offline:
+        logger.info("公開状態を更新しました（公開: %d件, 非公開: %d件）", went_live, went_offline)
+    return went_live, went_offline
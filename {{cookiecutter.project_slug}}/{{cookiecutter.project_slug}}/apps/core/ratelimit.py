@@ -0,0 +1,261 @@
+"""
+Sliding-window rate limiter.
+
+ログイン・登録・パスワードリセットなどの試行回数を制限する。
+パスワードのハッシュ計算より前に拒否し、総当たり攻撃でCPUを使い切られないようにする。
+
+- 固定長の時間枠ごとに回数を数え、直前の枠の回数を経過時間で按分して合算する
+  （スライディングウィンドウカウンター）。キーあたり2つのカウンターで済む
+- RATELIMIT_BACKEND: RedisBackend（全プロセスで共有）/ MemoryBackend（プロセス内、開発・テスト用）
+- 上限は RATELIMIT_RATES に "回数/期間" で指定する（例: "5/m", "20/h", "10/15m"）
+- キー: 'ip'、'user'（未ログインならIP）、'post:<フィールド名>'（メールアドレスなど）
+
+使い方::
+
+    @method_decorator(ratelimit('login', key=('ip', 'post:username')), name='dispatch')
+    class LoginView(...): ...
+
+DRF では apps.api.throttling.SlidingWindowThrottle、パス単位では
+apps.core.middleware.RateLimitMiddleware から利用する。
+"""
+import functools
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from typing import NamedTuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_RATE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+# バックエンドのインスタンス（設定のパスごと）
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+class Usage(NamedTuple):
+    """
+    レート制限の判定結果
+    """
+    allowed: bool
+    count: float
+    limit: int
+    retry_after: int
+
+
+def parse_rate(rate):
+    """
+    "回数/期間" を (回数, 秒数) に変換する
+    """
+    match = _RATE.match(rate.replace(' ', ''))
+    if match is None:
+        raise ImproperlyConfigured(f"不正なレート指定です: {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * _PERIODS[unit]
+
+
+def estimate(previous, current, limit, window, elapsed):
+    """
+    直前の枠と現在の枠の回数からスライディングウィンドウの回数を推定する
+    """
+    count = previous * (1 - elapsed / window) + current
+    if count <= limit:
+        return Usage(True, count, limit, 0)
+    if current > limit:
+        # 現在の枠だけで上限を超えている。次の枠で按分後の回数が上限以下になるまで待つ
+        wait = (window - elapsed) + window * (1 - limit / current)
+    else:
+        # 直前の枠の按分が減って上限以下になるまで待つ
+        wait = window * (1 - (limit - current) / previous) - elapsed
+    return Usage(False, count, limit, max(1, math.ceil(wait)))
+
+
+# -- バックエンド --
+
+class MemoryBackend:
+    """
+    プロセス内のカウンター（開発・テスト用。プロセス間では共有されない）
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    def incr(self, key, window, now):
+        """
+        現在の枠の回数を1増やし、(直前の枠の回数, 現在の枠の回数) を返す
+        """
+        index = int(now // window)
+        with self.lock:
+            self._purge(now)
+            count, _expires_at = self.counters.get((key, index), (0, 0))
+            self.counters[(key, index)] = (count + 1, (index + 2) * window)
+            previous = self.counters.get((key, index - 1), (0, 0))[0]
+        return previous, count + 1
+
+    def _purge(self, now):
+        if len(self.counters) < 10000:
+            return
+        for counter_key, (_count, expires_at) in list(self.counters.items()):
+            if expires_at <= now:
+                del self.counters[counter_key]
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+
+class RedisBackend:
+    """
+    Redis上のカウンター（RATELIMIT_CACHE_ALIAS の django_redis 接続を使う）
+    """
+    key_prefix = 'ratelimit:'
+
+    def incr(self, key, window, now):
+        from django_redis import get_redis_connection
+
+        index = int(now // window)
+        current_key = f'{self.key_prefix}{key}:{index}'
+        connection = get_redis_connection(settings.RATELIMIT_CACHE_ALIAS)
+        pipeline = connection.pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, window * 2)
+        pipeline.get(f'{self.key_prefix}{key}:{index - 1}')
+        current, _expired, previous = pipeline.execute()
+        return int(previous or 0), int(current)
+
+
+def get_backend():
+    path = settings.RATELIMIT_BACKEND
+    backend = _backends.get(path)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.setdefault(path, import_string(path)())
+    return backend
+
+
+# -- キー --
+
+def get_client_ip(request):
+    """
+    クライアントのIPアドレス
+
+    NUM_PROXIES 台のリバースプロキシを経由している場合は X-Forwarded-For の
+    右から数えたアドレスを使う（左側はクライアントが自由に書き換えられる）。
+    """
+    num_proxies = settings.NUM_PROXIES
+    if num_proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if forwarded:
+            return forwarded[-min(num_proxies, len(forwarded))]
+    return request.META.get('REMOTE_ADDR') or ''
+
+
+def _key_value(request, key):
+    if callable(key):
+        return key(request)
+    if key == 'ip':
+        return get_client_ip(request)
+    if key == 'user':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return get_client_ip(request)
+    if key.startswith('post:'):
+        value = request.POST.get(key[len('post:'):], '').strip().lower()
+        if not value:
+            return None
+        # メールアドレスなどをそのままキーに残さない
+        return hashlib.sha256(value.encode()).hexdigest()[:32]
+    raise ImproperlyConfigured(f"不正なレート制限のキーです: {key!r}")
+
+
+def check_rate(request, group, keys=('ip',), rate=None):
+    """
+    リクエストを1回として数え、判定結果を返す
+
+    複数のキーを指定した場合は、いずれかが上限を超えていれば拒否する。
+    RATELIMIT_ENABLED が False の場合や、バックエンドに接続できない場合は None
+    （制限しない）を返す。
+    """
+    if not settings.RATELIMIT_ENABLED:
+        return None
+    limit, window = parse_rate(rate or settings.RATELIMIT_RATES[group])
+    now = time.time()
+    backend = get_backend()
+    result = None
+    for key in keys:
+        value = _key_value(request, key)
+        if value is None:
+            continue
+        name = key if isinstance(key, str) else getattr(key, '__name__', 'key')
+        try:
+            previous, current = backend.incr(f'{group}:{name}:{value}', window, now)
+        except Exception:
+            logger.warning("レート制限のカウンターを更新できませんでした: %s", group, exc_info=True)
+            continue
+        usage = estimate(previous, current, limit, window, now % window)
+        if result is None or (not usage.allowed and (result.allowed or usage.retry_after > result.retry_after)):
+            result = usage
+    return result
+
+
+def rate_limited_response(usage):
+    response = HttpResponse(
+        _('リクエストが多すぎます。しばらくしてから再度お試しください。'),
+        status=429,
+        content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(usage.retry_after)
+    return response
+
+
+def ratelimit(group, key=('ip',), rate=None, methods=('POST',)):
+    """
+    ビューのレート制限デコレーター（上限を超えたリクエストには 429 を返す）
+
+    Args:
+        group: RATELIMIT_RATES のキー（カウンターの名前）
+        key: キーまたはキーのタプル（'ip'、'user'、'post:<フィールド名>'、request を受け取る関数）
+        rate: RATELIMIT_RATES の代わりに使う "回数/期間"
+        methods: 制限するHTTPメソッド（None ならすべて）
+    """
+    keys = (key,) if isinstance(key, str) or callable(key) else tuple(key)
+
+    def check(request):
+        if methods and request.method not in methods:
+            return None
+        usage = check_rate(request, group, keys, rate)
+        if usage is not None and not usage.allowed:
+            return rate_limited_response(usage)
+        return None
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @functools.wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                response = await sync_to_async(check)(request)
+                if response is not None:
+                    return response
+                return await view_func(request, *args, **kwargs)
+        else:
+            @functools.wraps(view_func)
+            def _wrapped_view(request, *args, **kwargs):
+                response = check(request)
+                if response is not None:
+                    return response
+                return view_func(request, *args, **kwargs)
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,206 @@
+"""
+Read-replica database routing.
+
+DATABASES に replica が設定されている場合、use_replica() の範囲（または
+replica_reads / ReplicaReadMixin を付けた読み取り専用ビュー）の読み取りクエリを
+レプリカへ振り分ける。書き込みは常にプライマリ（default）に送る。
+
+- レプリカの遅延が REPLICA_MAX_LAG 秒を超えている、または接続できない場合は
+  プライマリから読む（遅延は REPLICA_LAG_CHECK_INTERVAL 秒ごとに確認）
+- トランザクション中の読み取りはプライマリから読む
+- 書き込みを行ったクライアントは REPLICA_STICKY_SECONDS 秒間プライマリから読む
+  （ReplicaStickinessMiddleware が Cookie で記録する）
+"""
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# レプリカから読んでよい範囲か
+_replica_reads = ContextVar('replica_reads', default=False)
+# リクエスト単位の状態（ReplicaStickinessMiddleware が設定する）
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+class RoutingState:
+    """
+    リクエスト内のルーティング状態
+
+    ビューが別スレッドで実行されてもミドルウェアから変更が見えるよう、
+    ContextVar には値ではなくこのオブジェクトを入れる。
+    """
+    __slots__ = ('pinned', 'wrote')
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+@contextmanager
+def use_replica():
+    """
+    この範囲の読み取りクエリをレプリカへ振り分ける
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads(view):
+    """
+    GET/HEAD/OPTIONS の間、ビューの読み取りクエリをレプリカへ振り分けるデコレーター
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return await view(request, *args, **kwargs)
+            with use_replica():
+                return await view(request, *args, **kwargs)
+    else:
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return view(request, *args, **kwargs)
+            with use_replica():
+                return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """
+    GET/HEAD/OPTIONS の間、クラスベースビューの読み取りクエリをレプリカへ振り分ける
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with use_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class _ReplicaHealth:
+    """
+    レプリカの遅延を一定間隔で確認した結果（プロセス内で共有）
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = None
+        self.usable = False
+        self.lag = None
+
+    def is_usable(self):
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return self.usable
+        # 確認中は他のスレッドに直前の結果を使わせる
+        if not self.lock.acquire(blocking=False):
+            return self.usable
+        try:
+            self.lag = get_replica_lag()
+            self.usable = self.lag is not None and self.lag <= settings.REPLICA_MAX_LAG
+            self.checked_at = now
+            if not self.usable:
+                logger.warning("レプリカを使用しません（遅延: %s 秒）", self.lag)
+        finally:
+            self.lock.release()
+        return self.usable
+
+    def reset(self):
+        self.checked_at = None
+        self.usable = False
+        self.lag = None
+
+
+_health = _ReplicaHealth()
+
+
+def has_replica():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def get_replica_lag():
+    """
+    レプリカの遅延（秒）。確認できない場合は None
+
+    WALをすべて適用済みなら 0（プライマリへの書き込みが無い間に
+    最終適用時刻との差が広がっても遅延とみなさない）。
+    """
+    connection = connections[REPLICA_ALIAS]
+    try:
+        if connection.vendor != 'postgresql':
+            connection.ensure_connection()
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+            )
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        logger.exception("レプリカの遅延を確認できませんでした")
+        return None
+    # レプリカでない（WALを受信していない）場合は NULL
+    return float(lag) if lag is not None else None
+
+
+def replica_is_usable():
+    """
+    レプリカから読んでよいか（遅延が許容範囲内か）
+    """
+    return has_replica() and _health.is_usable()
+
+
+def pin_to_primary():
+    """
+    このリクエストの以降の読み取りをプライマリから行い、クライアントを固定する
+    """
+    state = _request_state.get()
+    if state is not None:
+        state.wrote = True
+
+
+class ReplicaRouter:
+    """
+    読み取りをレプリカ、書き込みをプライマリへ振り分けるルーター
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not has_replica():
+            return None
+        state = _request_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_ALIAS if replica_is_usable() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        # レプリカから読んだインスタンスの保存もプライマリへ送る
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,210 @@
+"""
+Full-text search.
+
+SearchableModel が保存時に生成する search_document（分かち書き済みテキスト）を
+データベースごとの全文検索インデックスで検索する。
+
+- PostgreSQL: to_tsvector('simple', search_document) の GIN インデックス。
+  一致が無い場合は pg_trgm の単語類似度で曖昧検索する
+- SQLite: FTS5 仮想テーブル（トリガーで元テーブルと同期）
+- その他: search_document に対する部分一致
+"""
+import logging
+import re
+import unicodedata
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# ひらがな・カタカナ・漢字（長音符・々を含む）
+_CJK_RUN = re.compile(r'([々぀-ヿ㐀-䶿一-鿿豈-﫿]+)')
+_WORD = re.compile(r'[^\W_]+')
+
+
+def tokenize(text, document=False):
+    """
+    検索用にテキストを分かち書きする
+
+    NFKCで正規化して小文字にした上で、日本語はバイグラム、
+    それ以外は単語単位に分割する。
+
+    Args:
+        text: 分かち書きするテキスト
+        document: 保存用の場合は True。日本語の各連続部分の末尾の1文字も追加し、
+                  1文字の検索語（前方一致）が末尾の文字（「入門」の「門」）にも一致するようにする
+
+    Returns:
+        トークンのリスト
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    tokens = []
+    for index, part in enumerate(_CJK_RUN.split(text)):
+        if index % 2:
+            if len(part) == 1:
+                tokens.append(part)
+            else:
+                tokens.extend(part[i:i + 2] for i in range(len(part) - 1))
+                if document:
+                    tokens.append(part[-1])
+        else:
+            tokens.extend(_WORD.findall(part))
+    return tokens
+
+
+def build_document(*values):
+    """
+    search_document に保存する文字列を生成
+    """
+    return ' '.join(tokenize(' '.join(str(value) for value in values if value), document=True))
+
+
+def get_searchable_models():
+    """
+    SearchableModel を継承する全モデル
+    """
+    from apps.core.models import SearchableModel
+
+    return [model for model in apps.get_models() if issubclass(model, SearchableModel)]
+
+
+def search(queryset, query, fallback=True):
+    """
+    全文検索で絞り込み、関連度の高い順に並べる
+
+    Args:
+        queryset: SearchableModel のクエリセット
+        query: 検索語
+        fallback: PostgreSQLで一致が無い場合にトライグラム検索を行うか
+
+    Returns:
+        search_rank を付与したクエリセット
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        results = _search_postgresql(queryset, tokens)
+        if fallback and getattr(settings, 'SEARCH_TRIGRAM_FALLBACK', True) and not results.exists():
+            results = _search_trigram(queryset, tokens)
+    elif vendor == 'sqlite':
+        results = _search_sqlite(queryset, tokens)
+    else:
+        for token in tokens:
+            queryset = queryset.filter(search_document__contains=token)
+        results = queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return results.order_by('-search_rank', '-pk')
+
+
+def _column(model):
+    return f'"{model._meta.db_table}"."search_document"'
+
+
+def _fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def _search_postgresql(queryset, tokens):
+    # 最後の語は入力途中の可能性があるため、全トークンを前方一致にする
+    tsquery = ' & '.join(f"'{token}':*" for token in tokens)
+    vector = f"to_tsvector('simple', {_column(queryset.model)})"
+    return queryset.filter(
+        RawSQL(f"{vector} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f"ts_rank({vector}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+    )
+
+
+def _search_trigram(queryset, tokens):
+    text = ' '.join(tokens)
+    column = _column(queryset.model)
+    return queryset.filter(
+        RawSQL(f"%s <%% {column}", [text], output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f"word_similarity(%s, {column})", [text], output_field=FloatField())
+    )
+
+
+def _search_sqlite(queryset, tokens):
+    model = queryset.model
+    fts = _fts_table(model)
+    match = ' AND '.join(f'"{token}"*' for token in tokens)
+    pk = f'"{model._meta.db_table}"."{model._meta.pk.column}"'
+    return queryset.filter(
+        RawSQL(f'{pk} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)', [match], output_field=BooleanField())
+    ).annotate(
+        # bm25は小さいほど関連度が高いので符号を反転する
+        search_rank=RawSQL(
+            f'(SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = {pk})',
+            [match],
+            output_field=FloatField(),
+        )
+    )
+
+
+def install_search_indexes(using='default'):
+    """
+    全文検索用のインデックスを作成（既にあれば何もしない）
+
+    マイグレーションではデータベース固有のDDLを表現できないため、
+    post_migrate から呼び出す。
+    """
+    connection = connections[using]
+    for model in get_searchable_models():
+        if not router.allow_migrate_model(using, model):
+            continue
+        if connection.vendor == 'postgresql':
+            _install_postgresql(connection, model)
+        elif connection.vendor == 'sqlite':
+            _install_sqlite(connection, model)
+
+
+def _install_postgresql(connection, model):
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_search_idx ON "{table}" '
+            f"USING gin (to_tsvector('simple', search_document))"
+        )
+    if not getattr(settings, 'SEARCH_TRIGRAM_FALLBACK', True):
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_search_trgm_idx ON "{table}" '
+                f'USING gin (search_document gin_trgm_ops)'
+            )
+    except DatabaseError:
+        logger.warning("pg_trgm を有効化できませんでした。SEARCH_TRIGRAM_FALLBACK=False を設定してください")
+
+
+def _install_sqlite(connection, model):
+    table = model._meta.db_table
+    pk = model._meta.pk.column
+    fts = _fts_table(model)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"search_document, content='{table}', content_rowid='{pk}')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON "{table}" BEGIN '
+            f'INSERT INTO {fts}(rowid, search_document) VALUES (new.{pk}, new.search_document); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON "{table}" BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, search_document) VALUES ('delete', old.{pk}, old.search_document); END"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF search_document ON "{table}" BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, search_document) VALUES ('delete', old.{pk}, old.search_document); "
+            f'INSERT INTO {fts}(rowid, search_document) VALUES (new.{pk}, new.search_document); END'
+        )
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
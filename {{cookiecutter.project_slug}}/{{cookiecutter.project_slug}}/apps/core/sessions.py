@@ -0,0 +1,221 @@
+"""
+Session engine backed by a dedicated cache.
+
+SESSION_CACHE_ALIAS のキャッシュ（一般のキャッシュとは別のRedis）にセッションを保存する。
+
+- ログイン中のセッションはランダムなキーでキャッシュに保存する
+- 匿名セッション（CSRF以外に言語設定やメッセージ程度しか持たない）は
+  署名付きの値をそのままセッションキーとしてCookieに載せ、キャッシュを使わない。
+  SESSION_SIGNED_MAX_LENGTH を超える場合はキャッシュに保存する
+- 読み込んだ内容から変更が無い間は書き込まない。ただし有効期限の
+  SESSION_REFRESH_RATIO を過ぎたら書き直して有効期限を延ばす
+- キャッシュには発行時刻（4バイト）と、一定以上の長さならzlib圧縮したJSONを保存する
+
+設定例::
+
+    SESSION_ENGINE = "apps.core.sessions"
+    SESSION_CACHE_ALIAS = "sessions"
+"""
+import struct
+import time
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS, CreateError, UpdateError
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.core import signing
+from django.utils.crypto import get_random_string
+
+try:
+    from django_redis.cache import RedisCache
+except ImportError:
+    RedisCache = None
+
+KEY_PREFIX = 'core.session:'
+SIGNED_KEY_PREFIX = 'a:'
+SIGNED_SALT = 'apps.core.sessions'
+
+# 発行時刻（UNIX時間）と圧縮の有無
+_HEADER = struct.Struct('!IB')
+_COMPRESS_MIN_LENGTH = 512
+
+
+class SessionStore(CacheSessionStore):
+    """
+    専用キャッシュ + 匿名セッションの署名付きCookie
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # キャッシュから読み込んだ内容と発行時刻（書き込みを省略できるかの判定に使う）
+        self._stored_body = None
+        self._stored_at = None
+
+    @staticmethod
+    def _is_signed(session_key):
+        return bool(session_key) and session_key.startswith(SIGNED_KEY_PREFIX)
+
+    def _get_new_session_key(self):
+        # 32文字のランダムなキーは衝突しないものとみなし、存在確認の往復を省く。
+        # 万一衝突しても save(must_create=True) の add が失敗して作り直す
+        return get_random_string(32, VALID_KEY_CHARS)
+
+    # -- エンコード --
+
+    def _encode_body(self, data):
+        return self.serializer().dumps(data)
+
+    def _pack(self, body, issued):
+        compressed = 0
+        if len(body) >= _COMPRESS_MIN_LENGTH:
+            packed = zlib.compress(body)
+            if len(packed) < len(body):
+                body, compressed = packed, 1
+        return _HEADER.pack(issued, compressed) + body
+
+    def _unpack(self, value):
+        """
+        キャッシュの値から (本文, 発行時刻) を取り出す。壊れている場合は None
+        """
+        if not isinstance(value, bytes) or len(value) < _HEADER.size:
+            return None
+        issued, compressed = _HEADER.unpack_from(value)
+        body = value[_HEADER.size:]
+        try:
+            if compressed:
+                body = zlib.decompress(body)
+        except zlib.error:
+            return None
+        return body, issued
+
+    def _needs_refresh(self):
+        if self._stored_at is None:
+            return True
+        ratio = getattr(settings, 'SESSION_REFRESH_RATIO', 0.5)
+        return time.time() - self._stored_at >= self.get_expiry_age() * ratio
+
+    # -- 読み込み --
+
+    def load(self):
+        if self._is_signed(self.session_key):
+            return self._load_signed()
+        try:
+            unpacked = self._unpack(self._cache.get(self.cache_key))
+        except Exception:
+            # 不正なキーで例外を送出するバックエンドがある（Django標準と同様）
+            unpacked = None
+        if unpacked is not None:
+            body, issued = unpacked
+            try:
+                data = self.serializer().loads(body)
+            except ValueError:
+                data = None
+            if data is not None:
+                self._stored_body = body
+                self._stored_at = issued
+                return data
+        self._session_key = None
+        return {}
+
+    def _load_signed(self):
+        try:
+            return signing.loads(
+                self.session_key[len(SIGNED_KEY_PREFIX):],
+                salt=SIGNED_SALT,
+                serializer=self.serializer,
+                max_age=self.get_session_cookie_age(),
+            )
+        except Exception:
+            # 改ざん・期限切れ・SECRET_KEY の変更
+            self._session_key = None
+            return {}
+
+    def exists(self, session_key):
+        if self._is_signed(session_key):
+            return False
+        return super().exists(session_key)
+
+    # -- 保存 --
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+
+        if SESSION_KEY not in data:
+            signed = SIGNED_KEY_PREFIX + signing.dumps(
+                data, salt=SIGNED_SALT, serializer=self.serializer, compress=True
+            )
+            if len(signed) <= getattr(settings, 'SESSION_SIGNED_MAX_LENGTH', 2048):
+                if not must_create and not self._is_signed(self.session_key):
+                    # ログアウト以外で匿名に戻ったセッション。キャッシュ上の古い内容を消す
+                    self._cache.delete(self.cache_key)
+                self._session_key = signed
+                self._stored_body = None
+                self._stored_at = None
+                return
+            if self._is_signed(self.session_key):
+                # Cookieに収まらなくなった匿名セッションはキャッシュへ移す
+                return self.create()
+        elif self._is_signed(self.session_key):
+            # ログインしたセッションは署名付きキーを捨て、ランダムなキーでキャッシュへ移す
+            return self.create()
+
+        body = self._encode_body(data)
+        if not must_create and body == self._stored_body and not self._needs_refresh():
+            return
+
+        issued = int(time.time())
+        value = self._pack(body, issued)
+        timeout = self.get_expiry_age()
+        if must_create:
+            if not self._cache.add(self.cache_key, value, timeout):
+                raise CreateError
+        elif not self._update(value, timeout):
+            # 他のリクエストでログアウト（削除）された
+            raise UpdateError
+        self._stored_body = body
+        self._stored_at = issued
+
+    def _update(self, value, timeout):
+        """
+        既存のエントリのみ上書きする。Redisでは SET XX で存在確認と書き込みを1往復にまとめる
+        """
+        if RedisCache is not None and isinstance(self._cache, RedisCache):
+            return bool(self._cache.set(self.cache_key, value, timeout, xx=True))
+        if not self._cache.has_key(self.cache_key):
+            return False
+        self._cache.set(self.cache_key, value, timeout)
+        return True
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._stored_body = None
+        self._stored_at = None
+        if self._is_signed(session_key):
+            # サーバー側には何も保存していない
+            return
+        self._cache.delete(self.cache_key_prefix + session_key)
+
+    # -- 非同期版（キャッシュの形式を揃えるため同期版に委ねる） --
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def aexists(self, session_key):
+        return await sync_to_async(self.exists)(session_key)
+
+    async def acreate(self):
+        return await sync_to_async(self.create)()
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
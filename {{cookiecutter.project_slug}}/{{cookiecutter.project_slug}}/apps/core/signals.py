@@ -0,0 +1,13 @@
+"""
+Core signals.
+"""
+from django.dispatch import Signal
+
+# 論理削除・復元の完了後に送信される（対象の主キーをまとめて通知）
+# 引数: sender（モデルクラス）, pks（主キーのリスト）, user（実行ユーザー、復元時はNone）
+soft_deleted = Signal()
+restored = Signal()
+
+# save()を経由しない一括更新（QuerySet.update() / bulk_update()）の後に送信される
+# 引数: sender（モデルクラス）, fields（更新したフィールド名のリスト）
+bulk_updated = Signal()
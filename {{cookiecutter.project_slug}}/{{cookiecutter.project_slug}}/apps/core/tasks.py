@@ -0,0 +1,70 @@
+"""
+Core Celery tasks.
+"""
+import logging
+
+from celery import shared_task
+from django.apps import apps
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def archive_contacts(older_than_days=None, batch_size=None):
+    """
+    解決済み・クローズのお問い合わせをアーカイブテーブルへ移動
+
+    Returns:
+        移動した件数
+    """
+    from apps.core.models import Contact
+
+    moved = Contact.objects.archive(older_than_days=older_than_days, batch_size=batch_size)
+    logger.info("お問い合わせを%d件アーカイブしました", moved)
+    return moved
+
+
+@shared_task
+def sync_publication_state():
+    """
+    PublishableModelを継承する全モデルのis_liveを更新（apps.core.publication）
+
+    Returns:
+        (公開に切り替えた件数, 非公開に切り替えた件数)
+    """
+    from apps.core.publication import sync_publication_state as sync
+
+    return sync()
+
+
+@shared_task
+def rebalance_order(model_label, scope):
+    """
+    OrderableModelの並び順をスコープ単位で振り直す
+
+    Args:
+        model_label: "app_label.ModelName"
+        scope: 並び順のスコープ {attname: 値}
+
+    Returns:
+        更新した件数
+    """
+    model = apps.get_model(model_label)
+    updated = model.rebalance_order(**scope)
+    logger.info("%sの並び順を振り直しました（%d件）", model_label, updated)
+    return updated
+
+
+@shared_task
+def export_pages_task():
+    """
+    公開中の静的ページをPAGE_EXPORT_ROOTへ書き出す
+
+    Returns:
+        書き出したページ数
+    """
+    from apps.core.page_cache import export_pages
+
+    exported = export_pages()
+    logger.info("静的ページを%d件書き出しました", exported)
+    return exported
@@ -116,23 +116,23 @@ def divide(value, arg):
 def active_class(context, url_name, css_class='active'):
     """
     現在のURLと一致する場合にCSSクラスを返す
+
+    URL名は名前空間付き（"dashboard:index"）・なし（"index"）のどちらでも指定できる。
+    現在のURL名はリクエストごとに1回だけ解決する（context_processors.navigation）。
     
     Usage:
-        <li class="{% raw %}{% active_class 'home' 'active' %}{% endraw %}">
-    """
-    request = context.get('request')
-    if not request:
-        return ''
-    
-    from django.urls import reverse, resolve
-    
-    try:
-        current_url_name = resolve(request.path).url_name
-        if current_url_name == url_name:
-            return css_class
-    except:
-        pass
-    
+        <li class="{% raw %}{% active_class 'dashboard:index' 'active' %}{% endraw %}">
+    """
+    current_url_name = context.get('current_url_name')
+    if current_url_name is None:
+        request = context.get('request')
+        if not request:
+            return ''
+        from apps.core.context_processors import get_current_url_name
+        current_url_name = get_current_url_name(request)
+
+    if current_url_name and url_name in (current_url_name, current_url_name.rpartition(':')[2]):
+        return css_class
     return ''
 
 
@@ -0,0 +1,272 @@
+"""
+Test cases for the admin changelist performance mixin.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db import connection, models
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from apps.core.admin import ContactAdmin, SoftDeleteAdminMixin
+from apps.core.models import FAQ, Contact, SoftDeleteModel
+from apps.core.paginators import KeysetPaginator
+
+User = get_user_model()
+
+CACHE_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-admin'}},
+}
+
+
+class MockTrashItem(SoftDeleteModel):
+    """Mock model for testing SoftDeleteAdminMixin (no concrete model uses it yet)."""
+    name = models.CharField(max_length=20)
+
+    class Meta(SoftDeleteModel.Meta):
+        app_label = 'core'
+
+
+class MockTrashItemAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
+    """Test-only admin using the soft delete actions."""
+
+
+@override_settings(**CACHE_SETTINGS)
+class KeysetPaginatorTestCase(TestCase):
+    """Test cases for KeysetPaginator."""
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        for index in range(5):
+            contact = Contact.objects.create(
+                name=f'Contact {index}', email=f'c{index}@example.com', subject=f'Subject {index}', message='Message',
+            )
+            # two rows share a timestamp to exercise the primary key tie-breaker
+            Contact.objects.filter(pk=contact.pk).update(created_at=now - timedelta(minutes=index // 2))
+        self.queryset = Contact.objects.order_by('-created_at', '-pk')
+
+    def test_next_pages_seek_instead_of_offset(self):
+        """Pages reached with "next" match OFFSET pages without using OFFSET."""
+        expected = list(self.queryset.values_list('pk', flat=True))
+        paginator = KeysetPaginator(self.queryset, 2, scope='session')
+        pages = [list(paginator.page(1).object_list.values_list('pk', flat=True))]
+        for number in (2, 3):
+            with CaptureQueriesContext(connection) as queries:
+                page = paginator.page(number)
+                pages.append([contact.pk for contact in page.object_list])
+            self.assertNotIn('OFFSET', queries[-1]['sql'])
+        self.assertEqual(sum(pages, []), expected)
+
+    def assertUsesOffset(self, paginator, number, expected):
+        with CaptureQueriesContext(connection) as queries:
+            page = paginator.page(number)
+            self.assertEqual([contact.pk for contact in page.object_list], expected)
+        self.assertIn('OFFSET', queries[-1]['sql'])
+
+    def test_jump_uses_offset(self):
+        """Only the page right after the one this scope viewed seeks; jumps use OFFSET."""
+        expected = list(self.queryset.values_list('pk', flat=True))
+        paginator = KeysetPaginator(self.queryset, 2, scope='session')
+        paginator.page(1)
+        self.assertUsesOffset(paginator, 3, expected[4:])
+        # page 2 was viewed, but page 3 is the last one recorded
+        paginator.page(2)
+        paginator.page(3)
+        self.assertUsesOffset(paginator, 2, expected[2:4])
+
+    def test_boundary_is_not_shared(self):
+        """Boundaries are kept per scope and page size."""
+        expected = list(self.queryset.values_list('pk', flat=True))
+        KeysetPaginator(self.queryset, 2, scope='first').page(1)
+        self.assertUsesOffset(KeysetPaginator(self.queryset, 2, scope='second'), 2, expected[2:4])
+        self.assertUsesOffset(KeysetPaginator(self.queryset, 1, scope='first'), 2, expected[1:2])
+        self.assertUsesOffset(KeysetPaginator(self.queryset, 2), 2, expected[2:4])
+
+    def test_unsupported_ordering(self):
+        """Orderings without a unique column are not used as keysets."""
+        self.assertIsNone(KeysetPaginator(Contact.objects.order_by('-created_at'), 2).keyset_ordering())
+        self.assertIsNone(KeysetPaginator(Contact.objects.order_by('user__email', 'pk'), 2).keyset_ordering())
+
+    def test_count_is_cached(self):
+        """The total is read from the cache."""
+        self.assertEqual(KeysetPaginator(self.queryset, 2).count, 5)
+        Contact.objects.create(name='Late', email='late@example.com', subject='Late', message='Message')
+        with self.assertNumQueries(0):
+            self.assertEqual(KeysetPaginator(self.queryset, 2).count, 5)
+
+
+@override_settings(**CACHE_SETTINGS)
+class LargeTableAdminTestCase(TestCase):
+    """Test cases for the Contact changelist."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:core_contact_changelist')
+        for index in range(3):
+            Contact.objects.create(
+                name=f'Contact {index}', email=f'c{index}@example.com', subject=f'Subject {index}', message='Message',
+            )
+
+    def test_loads_listed_columns_only(self):
+        """Columns not shown in the list are not selected."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        listing = [query['sql'] for query in queries if '"core_contact"."subject"' in query['sql']]
+        self.assertTrue(listing)
+        self.assertNotIn('"core_contact"."message"', listing[-1])
+
+    def test_date_hierarchy_on_small_table(self):
+        """Small tables keep the date hierarchy."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].date_hierarchy, 'created_at')
+
+    @override_settings(ADMIN_DATE_HIERARCHY_MAX_ROWS=2)
+    def test_date_hierarchy_disabled_on_large_table(self):
+        """The date hierarchy is dropped above ADMIN_DATE_HIERARCHY_MAX_ROWS."""
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context['cl'].date_hierarchy)
+
+    def test_paginates(self):
+        """Paging through the changelist shows every row once."""
+        with patch.object(ContactAdmin, 'list_per_page', 2):
+            first = self.client.get(self.url).context['cl'].result_list
+            second = self.client.get(self.url, {'p': 2}).context['cl'].result_list
+        self.assertEqual(len({contact.pk for contact in [*first, *second]}), 3)
+
+    def test_next_page_seeks_per_session(self):
+        """The next page seeks from the session's previous page only."""
+        with patch.object(ContactAdmin, 'list_per_page', 2):
+            self.client.get(self.url)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url, {'p': 2})
+            listing = [query['sql'] for query in queries if '"core_contact"."subject"' in query['sql']]
+            self.assertNotIn('OFFSET', listing[-1])
+
+            other = self.client_class()
+            other.force_login(self.admin)
+            with CaptureQueriesContext(connection) as queries:
+                other.get(self.url, {'p': 2})
+            listing = [query['sql'] for query in queries if '"core_contact"."subject"' in query['sql']]
+            self.assertIn('OFFSET', listing[-1])
+
+
+@override_settings(**CACHE_SETTINGS)
+class BulkListEditableTestCase(TestCase):
+    """Test cases for bulk list_editable saves."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:core_faq_changelist')
+        self.faqs = [
+            FAQ.objects.create(question=f'質問{index}', answer='回答', is_published=False, order=(index + 1) * 1024)
+            for index in range(4)
+        ]
+
+    def post(self, changes):
+        data = {
+            'form-TOTAL_FORMS': str(len(self.faqs)),
+            'form-INITIAL_FORMS': str(len(self.faqs)),
+            'form-MIN_NUM_FORMS': '0',
+            'form-MAX_NUM_FORMS': '1000',
+            '_save': 'Save',
+        }
+        for index, faq in enumerate(self.faqs):
+            values = {'order': faq.order, 'is_featured': faq.is_featured, 'is_published': faq.is_published}
+            values.update(changes.get(faq.pk, {}))
+            data[f'form-{index}-id'] = str(faq.pk)
+            data[f'form-{index}-order'] = str(values['order'])
+            for name in ('is_featured', 'is_published'):
+                if values[name]:
+                    data[f'form-{index}-{name}'] = 'on'
+        return self.client.post(self.url, data)
+
+    def test_changed_rows_are_saved_in_bulk(self):
+        """Changed rows are written with bulk_update and logged."""
+        first, second, third, _fourth = self.faqs
+        changes = {first.pk: {'is_published': True}, second.pk: {'is_published': True}, third.pk: {'order': 99}}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(changes)
+        self.assertEqual(response.status_code, 302)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "core_faq"')]
+        self.assertEqual(len(updates), 2)
+        self.assertNotIn('"question"', updates[0] + updates[1])
+
+        first.refresh_from_db()
+        self.assertTrue(first.is_published)
+        self.assertTrue(first.is_live)
+        self.assertGreater(first.updated_at, self.faqs[3].updated_at)
+        third.refresh_from_db()
+        self.assertEqual(third.order, 99)
+        self.assertEqual(LogEntry.objects.count(), 3)
+        self.assertEqual(
+            set(LogEntry.objects.values_list('object_id', flat=True)),
+            {str(first.pk), str(second.pk), str(third.pk)},
+        )
+
+    def test_unchanged_submission_writes_nothing(self):
+        """Submitting without changes does not update or log."""
+        with CaptureQueriesContext(connection) as queries:
+            self.post({})
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "core_faq"')])
+        self.assertFalse(LogEntry.objects.exists())
+
+    def test_invalid_input_shows_errors(self):
+        """Invalid rows are reported by the standard changelist."""
+        response = self.post({self.faqs[0].pk: {'order': 'x'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['cl'].formset.errors[0])
+        self.assertFalse(LogEntry.objects.exists())
+
+
+class SoftDeleteAdminTestCase(TestCase):
+    """Test cases for the soft delete admin actions."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        self.model_admin = MockTrashItemAdmin(MockTrashItem, admin.AdminSite(name='soft-delete-test'))
+        self.items = [MockTrashItem.objects.create(name=f'Item {index}') for index in range(3)]
+
+    def run_action(self, action, items, **extra):
+        data = {'action': action, helpers.ACTION_CHECKBOX_NAME: [str(item.pk) for item in items], **extra}
+        request = RequestFactory().post('/admin/core/mocktrashitem/', data)
+        request.user = self.admin
+        request._messages = CookieStorage(request)
+        request._dont_enforce_csrf_checks = True
+        response = self.model_admin.changelist_view(request)
+        self.assertEqual(response.status_code, 302)
+        return [message.message for message in request._messages]
+
+    def test_soft_delete_and_restore(self):
+        """The actions soft delete and restore the selected rows in one UPDATE each."""
+        first, second, third = self.items
+        with CaptureQueriesContext(connection) as queries:
+            messages = self.run_action('soft_delete_selected', [first, second])
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+        self.assertEqual(messages, ['2件を論理削除しました。'])
+        self.assertEqual(set(MockTrashItem.objects.deleted().filter(deleted_by=self.admin)), {first, second})
+
+        messages = self.run_action('restore_selected', [first, third])
+        self.assertEqual(messages, ['1件を復元しました。'])
+        self.assertEqual(list(MockTrashItem.objects.deleted()), [second])
+        first.refresh_from_db()
+        self.assertIsNone(first.deleted_at)
+        self.assertIsNone(first.deleted_by)
+
+    def test_delete_selected_purges_rows(self):
+        """The site-wide delete action still removes soft deleted rows for good."""
+        first, second, _third = self.items
+        self.run_action('soft_delete_selected', [first])
+        self.run_action('delete_selected', [first, second], post='yes')
+        self.assertEqual(list(MockTrashItem.objects.values_list('name', flat=True)), ['Item 2'])
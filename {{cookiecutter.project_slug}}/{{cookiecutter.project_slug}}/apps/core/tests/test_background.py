@@ -0,0 +1,26 @@
+"""
+Test cases for in-process background work.
+"""
+import threading
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from apps.core import background
+
+
+class BackgroundTestCase(SimpleTestCase):
+    """Test cases for the per-process executors."""
+
+    def test_submit_runs_in_named_thread(self):
+        """Work runs on the named worker thread and its connections are closed."""
+        with patch('apps.core.background.connections') as connections:
+            future = background.submit('test-background', lambda: threading.current_thread().name)
+            self.assertTrue(future.result(timeout=5).startswith('test-background'))
+        connections.close_all.assert_called_once_with()
+
+    def test_executor_per_name_and_process(self):
+        """Each name gets its own executor, recreated after a fork."""
+        first = background.get_executor('test-background')
+        self.assertIs(background.get_executor('test-background'), first)
+        self.assertIsNot(background.get_executor('test-other'), first)
+        with patch('apps.core.background.os.getpid', return_value=-1):
+            self.assertIsNot(background.get_executor('test-background'), first)
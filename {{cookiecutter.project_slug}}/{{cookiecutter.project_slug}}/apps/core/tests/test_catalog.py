@@ -0,0 +1,64 @@
+"""
+Test cases for the in-process FAQ catalog.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from datetime import timedelta
+from apps.core import catalog
+from apps.core.catalog import get_faq_catalog
+from apps.core.models import FAQ
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class FAQCatalogTestCase(TestCase):
+    """Test cases for FAQCatalog."""
+
+    def setUp(self):
+        cache.clear()
+        catalog._catalog = None
+        self.addCleanup(setattr, catalog, '_catalog', None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.general = FAQ.objects.create(
+                question='質問1', answer='回答1', is_published=True, is_featured=True
+            )
+            self.billing = FAQ.objects.create(
+                question='質問2', answer='回答2', category='billing', is_published=True
+            )
+            FAQ.objects.create(question='非公開', answer='回答', is_published=False)
+
+    def test_snapshot_contents(self):
+        """Only live FAQs are included, grouped by category."""
+        snapshot = get_faq_catalog()
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.for_category('billing'), (snapshot.get(self.billing.id),))
+        self.assertEqual([entry.id for entry in snapshot.featured], [self.general.id])
+        self.assertEqual(snapshot.get(self.general.id).get_category_display(), '一般')
+
+    def test_snapshot_is_reused_without_queries(self):
+        """Reading an unchanged catalog does not touch the database."""
+        snapshot = get_faq_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_faq_catalog(), snapshot)
+
+    def test_save_and_delete_invalidate(self):
+        """Saving or deleting an FAQ rebuilds the catalog on next access."""
+        get_faq_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.general.question = '更新後の質問'
+            self.general.save()
+        self.assertEqual(get_faq_catalog().get(self.general.id).question, '更新後の質問')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.billing.delete()
+        self.assertIsNone(get_faq_catalog().get(self.billing.id))
+
+    def test_bulk_publication_change_invalidates(self):
+        """is_live flips done by sync_live also invalidate the catalog."""
+        get_faq_catalog()
+        FAQ.objects.filter(pk=self.billing.pk).update(published_until=timezone.now() - timedelta(minutes=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.sync_live()
+        self.assertIsNone(get_faq_catalog().get(self.billing.id))
@@ -0,0 +1,76 @@
+"""
+Test cases for database connection pool sizing and helpers.
+"""
+import os
+from unittest.mock import patch
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.core.dbpool import get_pool_stats, has_pool
+from config.server import get_db_pool_options, get_worker_count
+
+User = get_user_model()
+
+
+class PoolSizingTestCase(SimpleTestCase):
+    """Test cases for sizing the pool from the worker model."""
+
+    @patch.dict(os.environ, {'WEB_CONCURRENCY': '4'})
+    def test_worker_count_override(self):
+        """WEB_CONCURRENCY overrides the computed worker count."""
+        self.assertEqual(get_worker_count('sync'), 4)
+        self.assertEqual(get_worker_count('async'), 4)
+
+    @patch.dict(os.environ, {'WEB_CONCURRENCY': '', 'DB_POOL_MAX_SIZE': ''})
+    @patch('multiprocessing.cpu_count', return_value=2)
+    def test_sync_worker_uses_one_connection(self, _cpu_count):
+        """A sync worker serves one request at a time."""
+        self.assertEqual(get_worker_count('sync'), 5)
+        options = get_db_pool_options('sync')
+        self.assertEqual(options['min_size'], 1)
+        self.assertEqual(options['max_size'], 1)
+
+    @patch.dict(os.environ, {'WEB_CONCURRENCY': '', 'DB_POOL_MAX_SIZE': '', 'DB_MAX_CONNECTIONS_PER_HOST': '30'})
+    @patch('multiprocessing.cpu_count', return_value=2)
+    def test_async_workers_share_host_budget(self, _cpu_count):
+        """Async workers split the per-host connection budget."""
+        self.assertEqual(get_worker_count('async'), 3)
+        self.assertEqual(get_db_pool_options('async')['max_size'], 10)
+
+    @patch.dict(os.environ, {'DB_POOL_MAX_SIZE': '3', 'DB_POOL_MIN_SIZE': '5'})
+    def test_explicit_sizes(self):
+        """Explicit sizes win and min_size never exceeds max_size."""
+        options = get_db_pool_options('sync')
+        self.assertEqual(options['max_size'], 3)
+        self.assertEqual(options['min_size'], 3)
+
+
+class PoolStatsTestCase(TestCase):
+    """Test cases for pool statistics and the health check."""
+
+    def test_no_pool_configured(self):
+        """Without a pool no statistics are reported."""
+        self.assertFalse(has_pool(connection))
+        self.assertEqual(get_pool_stats(), {})
+
+    def test_health_check(self):
+        """The health check reports the database status."""
+        response = self.client.get(reverse('core:health'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_health_check_stats_for_staff(self):
+        """Staff users also get this worker's pool statistics."""
+        user = User.objects.create_user(username='admin', email='admin@example.com', password='pass', is_staff=True)
+        self.client.force_login(user)
+        data = self.client.get(reverse('core:health'), REMOTE_ADDR='10.0.0.1').json()
+        self.assertEqual(data['pid'], os.getpid())
+        self.assertEqual(data['db_pools'], {})
+
+    @override_settings(INTERNAL_IPS=['10.0.0.1'])
+    def test_health_check_stats_for_internal_ips(self):
+        """Requests from INTERNAL_IPS get pool statistics."""
+        data = self.client.get(reverse('core:health'), REMOTE_ADDR='10.0.0.1').json()
+        self.assertIn('db_pools', data)
@@ -0,0 +1,110 @@
+"""
+Test cases for upload inspection and content validation.
+"""
+import hashlib
+import io
+import shutil
+import tempfile
+import zipfile
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image as PILImage
+from apps.core.models import Attachment
+from apps.core.utils.files import FileContentValidator, inspect_file, sniff_mime_type
+
+
+def png_bytes():
+    output = io.BytesIO()
+    PILImage.new('RGB', (4, 4), 'red').save(output, 'PNG')
+    return output.getvalue()
+
+
+def zip_bytes(*names):
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        for name in names:
+            archive.writestr(name, '<xml/>')
+    return output.getvalue()
+
+
+class SniffMimeTypeTestCase(SimpleTestCase):
+    """Test cases for content-based MIME detection."""
+
+    def test_common_formats(self):
+        """Formats are detected from the leading bytes."""
+        self.assertEqual(sniff_mime_type(png_bytes()), 'image/png')
+        self.assertEqual(sniff_mime_type(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n'), 'application/pdf')
+        self.assertEqual(sniff_mime_type('テキスト\n'.encode()), 'text/plain')
+
+    def test_inspect_file_reads_once(self):
+        """Size, hash and MIME type come from one pass over the upload."""
+        content = png_bytes()
+        upload = SimpleUploadedFile('image.png', content, content_type='image/png')
+        info = inspect_file(upload)
+        self.assertEqual(info.mime_type, 'image/png')
+        self.assertEqual(info.size, len(content))
+        self.assertEqual(info.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(upload.tell(), 0)
+        # the result is kept on the file
+        upload.chunks = None
+        self.assertIs(inspect_file(upload), info)
+
+    def test_validator_rejects_mismatched_content(self):
+        """Files whose content does not match the extension are rejected."""
+        validator = FileContentValidator()
+        validator(SimpleUploadedFile('image.png', png_bytes()))
+        with self.assertRaises(ValidationError) as context:
+            validator(SimpleUploadedFile('report.pdf', b'MZ\x90\x00\x03\x00\x00\x00\x04\x00'))
+        self.assertEqual(context.exception.code, 'invalid_content')
+
+    def test_validator_checks_office_structure(self):
+        """Office documents are accepted by their structure, not by any binary MIME type."""
+        validator = FileContentValidator()
+        validator(SimpleUploadedFile('report.docx', zip_bytes('[Content_Types].xml', 'word/document.xml')))
+        validator(SimpleUploadedFile('sheet.xls', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 504))
+        rejected = [
+            ('report.docx', b'MZ\x90\x00\x03\x00\x00\x00\x04\x00\x00\x00\xff\xff\x00\x00'),
+            ('sheet.xls', b'\x7fELF\x02\x01\x01\x00' + b'\x00' * 8),
+            ('slides.ppt', b'MZ\x90\x00\x03\x00\x00\x00'),
+            ('sheet.xlsx', b'\x7fELF\x02\x01\x01\x00' + b'\x00' * 8),
+            # a plain ZIP archive or the wrong OOXML kind
+            ('report.docx', zip_bytes('payload.exe')),
+            ('report.docx', zip_bytes('[Content_Types].xml', 'xl/workbook.xml')),
+        ]
+        for name, content in rejected:
+            with self.subTest(name=name, head=content[:4]):
+                with self.assertRaises(ValidationError) as context:
+                    validator(SimpleUploadedFile(name, content))
+                self.assertEqual(context.exception.code, 'invalid_content')
+
+
+class AttachmentSaveTestCase(TestCase):
+    """Test cases for Attachment file metadata."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=self.media_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_upload_fills_metadata(self):
+        """MIME type, size and checksum are filled on upload."""
+        content = png_bytes()
+        attachment = Attachment(file=SimpleUploadedFile('image.png', content))
+        attachment.full_clean(exclude=['original_filename', 'file_size', 'uploaded_by'])
+        attachment.save()
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.mime_type, 'image/png')
+        self.assertEqual(attachment.file_size, len(content))
+        self.assertEqual(attachment.checksum, hashlib.sha256(content).hexdigest())
+        self.assertEqual(attachment.original_filename, 'image.png')
+
+    def test_resave_does_not_read_file(self):
+        """Saving an existing attachment does not read the stored file."""
+        attachment = Attachment.objects.create(file=SimpleUploadedFile('notes.txt', b'hello'))
+        attachment.description = 'updated'
+        with self.settings(MEDIA_ROOT='/nonexistent'):
+            attachment.save()
+        self.assertEqual(Attachment.objects.get(pk=attachment.pk).file_size, 5)
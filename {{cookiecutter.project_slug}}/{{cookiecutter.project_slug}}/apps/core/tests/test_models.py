@@ -1,14 +1,22 @@
 """
 Test cases for core models.
 """
-from django.test import TestCase
+import sys
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from apps.core.models import (
     TimeStampedModel, UUIDModel, SoftDeleteModel, 
     PublishableModel, OrderableModel, Page, 
-    Contact, FAQ, Attachment
+    Contact, ArchivedContact, FAQ, Attachment
 )
 
 User = get_user_model()
@@ -22,13 +30,13 @@ class MockTimeStampedModel(TimeStampedModel):
 
 class MockSoftDeleteModel(SoftDeleteModel):
     """Mock model for testing SoftDeleteModel."""
-    class Meta:
+    class Meta(SoftDeleteModel.Meta):
         app_label = 'core'
 
 
 class MockPublishableModel(PublishableModel):
     """Mock model for testing PublishableModel."""
-    class Meta:
+    class Meta(PublishableModel.Meta):
         app_label = 'core'
 
 
@@ -109,6 +117,168 @@ class AbstractModelTestCase(TestCase):
         self.assertTrue(past_scheduled.is_published)
 
 
+class QuerySetTestCase(TestCase):
+    """Test cases for the soft delete and publishable querysets."""
+    
+    def test_alive_and_deleted(self):
+        """alive() and deleted() split rows on is_deleted."""
+        alive = MockSoftDeleteModel.objects.create()
+        deleted = MockSoftDeleteModel.objects.create(is_deleted=True)
+        
+        self.assertEqual(list(MockSoftDeleteModel.objects.alive()), [alive])
+        self.assertEqual(list(MockSoftDeleteModel.objects.deleted()), [deleted])
+    
+    def test_bulk_soft_delete_and_restore(self):
+        """soft_delete() and restore() update the whole queryset and signal once."""
+        from apps.core.signals import soft_deleted, restored
+        
+        user = User.objects.create_user(
+            username='deleter',
+            email='deleter@example.com',
+            password='testpass123'
+        )
+        objs = [MockSoftDeleteModel.objects.create() for _ in range(3)]
+        received = []
+        
+        def handler(sender, pks, **kwargs):
+            received.append((sender, sorted(pks)))
+        
+        soft_deleted.connect(handler)
+        restored.connect(handler)
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                count = MockSoftDeleteModel.objects.all().soft_delete(user=user)
+            self.assertEqual(count, 3)
+            updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+            self.assertEqual(len(updates), 1)
+            self.assertEqual(MockSoftDeleteModel.objects.deleted().filter(deleted_by=user).count(), 3)
+            
+            # Already deleted rows are not touched again
+            self.assertEqual(MockSoftDeleteModel.objects.all().soft_delete(user=user), 0)
+            
+            self.assertEqual(MockSoftDeleteModel.objects.filter(pk=objs[0].pk).restore(), 1)
+        finally:
+            soft_deleted.disconnect(handler)
+            restored.disconnect(handler)
+        
+        pks = sorted(obj.pk for obj in objs)
+        self.assertEqual(received, [
+            (MockSoftDeleteModel, pks),
+            (MockSoftDeleteModel, [objs[0].pk]),
+        ])
+        self.assertEqual(MockSoftDeleteModel.objects.alive().count(), 1)
+    
+    def test_published_now_matches_is_active(self):
+        """published_now() selects exactly the rows where is_active is True."""
+        now = timezone.now()
+        hour = timedelta(hours=1)
+        rows = [
+            MockPublishableModel.objects.create(is_published=False),
+            MockPublishableModel.objects.create(is_published=True),
+            MockPublishableModel.objects.create(is_published=True, published_at=now - hour),
+            MockPublishableModel.objects.create(is_published=True, published_at=now + hour),
+            MockPublishableModel.objects.create(is_published=True, published_until=now - hour),
+            MockPublishableModel.objects.create(
+                is_published=True,
+                published_at=now - hour,
+                published_until=now + hour
+            ),
+        ]
+        
+        expected = {row.pk for row in rows if row.is_active}
+        actual = set(MockPublishableModel.objects.published_now().values_list('pk', flat=True))
+        self.assertEqual(actual, expected)
+        self.assertEqual(len(expected), 3)
+    
+    def test_save_materializes_is_live(self):
+        """save() keeps is_live in step with is_active."""
+        now = timezone.now()
+        obj = MockPublishableModel.objects.create(is_published=True)
+        self.assertTrue(obj.is_live)
+        
+        obj.published_at = now + timedelta(hours=1)
+        obj.save(update_fields=['published_at'])
+        obj.refresh_from_db()
+        self.assertFalse(obj.is_live)
+    
+    def test_sync_live_flips_only_passed_boundaries(self):
+        """sync_live(since=...) flips rows whose boundary passed since the last run."""
+        now = timezone.now()
+        hour = timedelta(hours=1)
+        starting = MockPublishableModel.objects.create(is_published=True, published_at=now + hour)
+        ending = MockPublishableModel.objects.create(is_published=True, published_until=now + hour)
+        self.assertFalse(starting.is_live)
+        self.assertTrue(ending.is_live)
+        
+        later = now + 2 * hour
+        self.assertEqual(
+            MockPublishableModel.objects.sync_live(since=now, now=later),
+            (1, 1)
+        )
+        self.assertEqual(list(MockPublishableModel.objects.live()), [starting])
+        
+        # Nothing passed a boundary since the previous run
+        self.assertEqual(
+            MockPublishableModel.objects.sync_live(since=later, now=later + hour),
+            (0, 0)
+        )
+    
+    def test_sync_live_full_reconcile(self):
+        """Without ``since`` every row is reconciled with published_now()."""
+        obj = MockPublishableModel.objects.create(is_published=True)
+        MockPublishableModel.objects.filter(pk=obj.pk).update(is_published=False)
+        
+        self.assertEqual(MockPublishableModel.objects.sync_live(), (0, 1))
+        self.assertFalse(MockPublishableModel.objects.live().exists())
+    
+    def test_indexes_inherited(self):
+        """Concrete models inherit the partial indexes declared by the abstract bases."""
+        self.assertIn('core_faq_pub', [index.name for index in FAQ._meta.indexes])
+        self.assertIn('core_page_pub', [index.name for index in Page._meta.indexes])
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class SyncPublicationStateCommandTestCase(TestCase):
+    """Test cases for the sync_publication_state command."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_command_flips_live_state_without_celery(self):
+        """The command updates is_live with Celery unavailable."""
+        now = timezone.now()
+        scheduled = FAQ.objects.create(
+            question='予約公開', answer='回答', is_published=True, published_at=now + timedelta(hours=1)
+        )
+        expiring = FAQ.objects.create(
+            question='期限切れ', answer='回答', is_published=True, published_until=now + timedelta(hours=1)
+        )
+        FAQ.objects.filter(pk=scheduled.pk).update(published_at=now - timedelta(minutes=1))
+        FAQ.objects.filter(pk=expiring.pk).update(published_until=now - timedelta(minutes=1))
+        
+        out = StringIO()
+        with patch.dict(sys.modules, {'celery': None, 'apps.core.tasks': None}):
+            call_command('sync_publication_state', '--full', stdout=out)
+        
+        self.assertEqual(list(FAQ.objects.live()), [scheduled])
+        self.assertIn('公開: 1件, 非公開: 1件', out.getvalue())
+    
+    def test_command_only_checks_passed_boundaries(self):
+        """Later runs only look at rows whose boundary passed since the previous run."""
+        call_command('sync_publication_state', stdout=StringIO())
+        stale = FAQ.objects.create(question='質問', answer='回答', is_published=True)
+        # Changed behind save(): no boundary passed, so only --full reconciles it
+        FAQ.objects.filter(pk=stale.pk).update(is_published=False)
+        
+        call_command('sync_publication_state', stdout=StringIO())
+        self.assertTrue(FAQ.objects.live().exists())
+        
+        call_command('sync_publication_state', '--full', stdout=StringIO())
+        self.assertFalse(FAQ.objects.live().exists())
+
+
 class PageModelTestCase(TestCase):
     """Test cases for Page model."""
     
@@ -192,6 +362,78 @@ class ContactModelTestCase(TestCase):
         self.assertIsNotNone(contact.resolved_at)
 
 
+class ContactArchiveTestCase(TestCase):
+    """Test cases for moving contacts into the archive table."""
+    
+    def create_contact(self, status, days_ago):
+        """Create a contact last updated ``days_ago`` days ago."""
+        contact = Contact.objects.create(
+            name='テストユーザー',
+            email='test@example.com',
+            subject=f'{status} {days_ago}',
+            message='テストメッセージ',
+            status=status
+        )
+        Contact.objects.filter(pk=contact.pk).update(
+            updated_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return contact
+    
+    def test_archive_moves_old_closed_contacts(self):
+        """Only old resolved/closed contacts are moved."""
+        old_resolved = self.create_contact('resolved', 200)
+        old_closed = self.create_contact('closed', 200)
+        old_new = self.create_contact('new', 200)
+        recent_closed = self.create_contact('closed', 1)
+        
+        moved = Contact.objects.archive(older_than_days=180, batch_size=1)
+        
+        self.assertEqual(moved, 2)
+        self.assertEqual(
+            set(Contact.objects.values_list('pk', flat=True)),
+            {old_new.pk, recent_closed.pk}
+        )
+        self.assertEqual(
+            set(ArchivedContact.objects.values_list('pk', flat=True)),
+            {old_resolved.pk, old_closed.pk}
+        )
+    
+    def test_archive_preserves_timestamps(self):
+        """Archived rows keep their original id and timestamps."""
+        contact = self.create_contact('closed', 365)
+        contact.refresh_from_db()
+        
+        Contact.objects.archive(older_than_days=180)
+        
+        archived = ArchivedContact.objects.get(pk=contact.pk)
+        self.assertEqual(archived.created_at, contact.created_at)
+        self.assertEqual(archived.updated_at, contact.updated_at)
+        self.assertIsNotNone(archived.archived_at)
+    
+    def test_archive_overwrites_existing_archived_row(self):
+        """A stale archived row with the same id is replaced, not lost."""
+        contact = self.create_contact('closed', 365)
+        stale = ArchivedContact.from_contact(contact)
+        stale.subject = 'stale'
+        stale.save()
+        
+        moved = Contact.objects.archive(older_than_days=180)
+        
+        self.assertEqual(moved, 1)
+        self.assertFalse(Contact.objects.filter(pk=contact.pk).exists())
+        self.assertEqual(ArchivedContact.objects.get(pk=contact.pk).subject, contact.subject)
+    
+    def test_including_archived(self):
+        """The unified query returns rows from both tables."""
+        self.create_contact('closed', 365)
+        self.create_contact('new', 1)
+        Contact.objects.archive(older_than_days=180)
+        
+        rows = Contact.objects.including_archived(email='test@example.com')
+        self.assertEqual(rows.count(), 2)
+        self.assertEqual(Contact.objects.including_archived(status='closed').count(), 1)
+
+
 class FAQModelTestCase(TestCase):
     """Test cases for FAQ model."""
     
@@ -225,4 +467,78 @@ class FAQModelTestCase(TestCase):
         faqs = FAQ.objects.all()
         # Should be ordered by order field
         self.assertEqual(faqs[0], faq2)
-        self.assertEqual(faqs[1], faq1)
\ No newline at end of file
+        self.assertEqual(faqs[1], faq1)
+
+
+class OrderableModelTestCase(TestCase):
+    """Test cases for gap-based ordering."""
+
+    def setUp(self):
+        self.faqs = [
+            FAQ.objects.create(question=f'質問{i}', answer='回答', category='general')
+            for i in range(3)
+        ]
+
+    def ordered_ids(self, category='general'):
+        return list(FAQ.objects.filter(category=category).values_list('id', flat=True))
+
+    def test_new_rows_are_appended_with_gaps(self):
+        """New rows are appended to the end of their scope."""
+        self.assertEqual([faq.order for faq in self.faqs], [1024, 2048, 3072])
+        other = FAQ.objects.create(question='別カテゴリ', answer='回答', category='billing')
+        self.assertEqual(other.order, FAQ.ORDER_STEP)
+
+    def test_move_updates_only_moved_row(self):
+        """Moving a row issues a single UPDATE."""
+        first, second, third = self.faqs
+        with CaptureQueriesContext(connection) as ctx:
+            third.move_before(first)
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.ordered_ids(), [third.id, first.id, second.id])
+
+        first.move_after(second)
+        self.assertEqual(self.ordered_ids(), [third.id, second.id, first.id])
+
+        first.move_to(0)
+        self.assertEqual(self.ordered_ids(), [first.id, third.id, second.id])
+
+        first.move_to(10)
+        self.assertEqual(self.ordered_ids(), [third.id, second.id, first.id])
+
+    def test_move_rebalances_when_gap_is_exhausted(self):
+        """The scope is renumbered when there is no room left."""
+        first, second, third = self.faqs
+        FAQ.objects.filter(pk=first.pk).update(order=1)
+        FAQ.objects.filter(pk=second.pk).update(order=2)
+
+        third.move_after(first)
+
+        self.assertEqual(self.ordered_ids(), [first.id, third.id, second.id])
+        orders = list(FAQ.objects.filter(category='general').values_list('order', flat=True))
+        self.assertTrue(all(b - a > 1 for a, b in zip(orders, orders[1:])))
+
+    def test_reorder(self):
+        """Bulk reorder only updates rows whose position changed."""
+        first, second, third = self.faqs
+        updated = FAQ.reorder([first.id, third.id, second.id])
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.ordered_ids(), [first.id, third.id, second.id])
+
+    def test_reorder_rejects_partial_or_mixed_lists(self):
+        """Unknown ids, mixed scopes and partial scopes are rejected."""
+        first, second, third = self.faqs
+        other = FAQ.objects.create(question='別カテゴリ', answer='回答', category='billing')
+        invalid = {
+            'invalid_pk': [first.id, second.id, third.id, 999999],
+            'mixed_scope': [first.id, second.id, third.id, other.id],
+            'incomplete_scope': [third.id, first.id],
+            'duplicate_pk': [first.id, first.id, second.id],
+        }
+        for code, ids in invalid.items():
+            with self.subTest(code=code):
+                with self.assertRaises(ValidationError) as ctx:
+                    FAQ.reorder(ids)
+                self.assertEqual(ctx.exception.code, code)
+        self.assertEqual(self.ordered_ids(), [first.id, second.id, third.id])
+        self.assertEqual(FAQ.reorder([other.id]), 0)
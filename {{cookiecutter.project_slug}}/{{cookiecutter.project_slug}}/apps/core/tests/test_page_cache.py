@@ -0,0 +1,89 @@
+"""
+Test cases for the rendered-page cache.
+"""
+import gzip
+import tempfile
+from pathlib import Path
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.core.models import Page
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class PageCacheTestCase(TestCase):
+    """Test cases for serving cached pages."""
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page = Page.objects.create(
+                slug='terms', title='利用規約', content='第1条', is_published=True
+            )
+        self.url = reverse('core:page_detail', args=['terms'])
+
+    def test_page_is_cached(self):
+        """The second request is served without database queries."""
+        response = self.client.get(self.url)
+        self.assertContains(response, '第1条')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_gzip_variant_and_etag(self):
+        """A pre-compressed body is served and ETag revalidation works."""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('第1条', gzip.decompress(response.content).decode())
+
+        gzip_etag = response['ETag']
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzip_etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_differs_per_encoding(self):
+        """Each content-coding gets its own strong ETag."""
+        identity = self.client.get(self.url)
+        gzipped = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(gzipped['ETag'].endswith('-gz"'))
+        self.assertNotEqual(identity['ETag'], gzipped['ETag'])
+
+        # The gzip validator does not revalidate the identity body
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=gzipped['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match_list_and_weak(self):
+        """Lists of ETags and weak validators are honoured."""
+        etag = self.client.get(self.url)['ETag']
+        for header in (f'"other", {etag}', f'W/{etag}', '*'):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 304)
+
+    def test_publish_changes_purge_cache(self):
+        """Editing or unpublishing a page purges the cached HTML."""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.content = '第2条'
+            self.page.save()
+        self.assertContains(self.client.get(self.url), '第2条')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.is_published = False
+            self.page.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_export_pages(self):
+        """Published pages are exported as static files for nginx."""
+        from apps.core.page_cache import export_pages
+
+        with tempfile.TemporaryDirectory() as root:
+            self.assertEqual(export_pages(root), 1)
+            index = Path(root) / 'pages' / 'terms' / 'index.html'
+            self.assertIn('第1条', index.read_text())
+            self.assertTrue(index.with_name('index.html.gz').exists())
+
+            Page.objects.filter(pk=self.page.pk).update(is_live=False)
+            self.assertEqual(export_pages(root), 0)
+            self.assertFalse(index.exists())
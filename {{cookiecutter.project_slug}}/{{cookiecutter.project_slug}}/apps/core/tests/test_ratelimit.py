@@ -0,0 +1,161 @@
+"""
+Test cases for the sliding-window rate limiter.
+"""
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from apps.core import ratelimit
+from apps.core.ratelimit import MemoryBackend, check_rate, estimate, get_client_ip, parse_rate
+
+User = get_user_model()
+
+RATELIMIT_SETTINGS = {
+    'RATELIMIT_ENABLED': True,
+    'RATELIMIT_BACKEND': 'apps.core.ratelimit.MemoryBackend',
+    'RATELIMIT_RATES': {
+        'login': '3/m',
+        'login-account': '2/m',
+        'signup': '10/h',
+        'password-reset': '5/h',
+        'password-change': '1/h',
+        'accounts': '100/m',
+        'api': '100/m',
+    },
+    'RATELIMIT_PATHS': {'/accounts/': 'accounts'},
+}
+
+
+class RateCalculationTestCase(SimpleTestCase):
+    """Test cases for rate parsing and the sliding-window estimate."""
+
+    def test_parse_rate(self):
+        """Rates are parsed into (count, seconds)."""
+        self.assertEqual(parse_rate('5/m'), (5, 60))
+        self.assertEqual(parse_rate('10/15m'), (10, 900))
+        self.assertEqual(parse_rate('100/d'), (100, 86400))
+        with self.assertRaises(ImproperlyConfigured):
+            parse_rate('5 per minute')
+
+    def test_previous_window_is_weighted(self):
+        """The previous window counts in proportion to its overlap."""
+        usage = estimate(previous=10, current=2, limit=10, window=60, elapsed=30)
+        self.assertEqual(usage.count, 7)
+        self.assertTrue(usage.allowed)
+
+        usage = estimate(previous=10, current=8, limit=10, window=60, elapsed=30)
+        self.assertFalse(usage.allowed)
+        # 10 * (1 - e/60) + 8 <= 10 once e >= 48
+        self.assertEqual(usage.retry_after, 18)
+
+    def test_memory_backend_counts_per_window(self):
+        """The memory backend returns the previous and current window counts."""
+        backend = MemoryBackend()
+        self.assertEqual(backend.incr('k', 60, 30), (0, 1))
+        self.assertEqual(backend.incr('k', 60, 40), (0, 2))
+        self.assertEqual(backend.incr('k', 60, 70), (2, 1))
+        self.assertEqual(backend.incr('other', 60, 70), (0, 1))
+
+
+@override_settings(**RATELIMIT_SETTINGS)
+class CheckRateTestCase(SimpleTestCase):
+    """Test cases for check_rate and client IP detection."""
+
+    def setUp(self):
+        ratelimit._backends.clear()
+        self.factory = RequestFactory()
+
+    def test_rejects_over_limit(self):
+        """Requests past the limit are rejected with a retry delay."""
+        request = self.factory.post('/', REMOTE_ADDR='10.0.0.1')
+        with patch('apps.core.ratelimit.time.time', return_value=1200.0):
+            results = [check_rate(request, 'login') for _ in range(4)]
+        self.assertEqual([usage.allowed for usage in results], [True, True, True, False])
+        self.assertGreater(results[-1].retry_after, 0)
+
+        other = self.factory.post('/', REMOTE_ADDR='10.0.0.2')
+        self.assertTrue(check_rate(other, 'login').allowed)
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_disabled(self):
+        """Nothing is counted when rate limiting is disabled."""
+        self.assertIsNone(check_rate(self.factory.post('/'), 'login'))
+
+    def test_backend_failure_allows_request(self):
+        """An unreachable backend does not block requests."""
+        with patch.object(MemoryBackend, 'incr', side_effect=ConnectionError):
+            self.assertIsNone(check_rate(self.factory.post('/'), 'login'))
+
+    def test_client_ip_without_proxy(self):
+        """Without proxies X-Forwarded-For is ignored."""
+        request = self.factory.get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4')
+        with self.settings(NUM_PROXIES=0):
+            self.assertEqual(get_client_ip(request), '10.0.0.1')
+
+    def test_client_ip_behind_proxy(self):
+        """Behind one proxy the right-most forwarded address is used."""
+        request = self.factory.get('/', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4, 203.0.113.7')
+        with self.settings(NUM_PROXIES=1):
+            self.assertEqual(get_client_ip(request), '203.0.113.7')
+
+
+@override_settings(**RATELIMIT_SETTINGS)
+class LoginRateLimitTestCase(TestCase):
+    """Test cases for rate limiting of the login view."""
+
+    def setUp(self):
+        ratelimit._backends.clear()
+        self.url = reverse('accounts:login')
+
+    def test_rejects_before_authentication(self):
+        """Over-limit logins are rejected without checking the password."""
+        with patch('django.contrib.auth.forms.authenticate', return_value=None) as authenticate:
+            for index in range(3):
+                self.client.post(self.url, {'username': f'user{index}@example.com', 'password': 'wrong'})
+            self.assertEqual(authenticate.call_count, 3)
+
+            response = self.client.post(self.url, {'username': 'user9@example.com', 'password': 'wrong'})
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            self.assertEqual(authenticate.call_count, 3)
+
+    def test_limits_per_email(self):
+        """Attempts against one address are limited across IPs."""
+        data = {'username': 'Target@Example.com', 'password': 'wrong'}
+        for index in range(2):
+            self.client.post(self.url, data, REMOTE_ADDR=f'10.0.0.{index}')
+        response = self.client.post(self.url, dict(data, username='target@example.com'), REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+
+    def test_get_is_not_limited(self):
+        """Showing the login page is not counted."""
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_middleware_limits_accounts_posts(self):
+        """The middleware rejects POSTs under /accounts/ past the path limit."""
+        with self.settings(RATELIMIT_RATES=dict(RATELIMIT_SETTINGS['RATELIMIT_RATES'], accounts='1/m')):
+            self.client.post(reverse('accounts:signup'), {})
+            response = self.client.post(reverse('accounts:signup'), {})
+        self.assertEqual(response.status_code, 429)
+
+
+@override_settings(**RATELIMIT_SETTINGS)
+class APIThrottleTestCase(TestCase):
+    """Test cases for the DRF throttle."""
+
+    def setUp(self):
+        ratelimit._backends.clear()
+        self.user = User.objects.create_user(
+            username='throttled', email='throttled@example.com', password='testpass123'
+        )
+        self.client.force_login(self.user)
+
+    def test_password_change_is_throttled(self):
+        """The password change endpoint uses its own scope."""
+        url = '/api/v1/users/password/'
+        self.client.post(url, {})
+        response = self.client.post(url, {})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
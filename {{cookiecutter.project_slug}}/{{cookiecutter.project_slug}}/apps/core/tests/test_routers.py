@@ -0,0 +1,117 @@
+"""
+Test cases for read-replica routing.
+"""
+import time
+from unittest.mock import patch
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from apps.core import routers
+from apps.core.middleware import REPLICA_PIN_COOKIE, ReplicaStickinessMiddleware
+from apps.core.models import FAQ
+from apps.core.routers import ReplicaRouter, replica_reads, use_replica
+
+
+@patch('apps.core.routers.has_replica', return_value=True)
+@patch('apps.core.routers.replica_is_usable', return_value=True)
+class ReplicaRouterTestCase(TransactionTestCase):
+    """Test cases for ReplicaRouter decisions (outside the per-test transaction)."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_use_primary_by_default(self, *mocks):
+        """Reads outside use_replica() are not routed."""
+        self.assertIsNone(self.router.db_for_read(FAQ))
+
+    def test_reads_use_replica_in_scope(self, *mocks):
+        """Reads inside use_replica() go to the replica."""
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(FAQ), 'replica')
+
+    def test_lagging_replica_falls_back(self, usable, _has_replica):
+        """A lagging or unreachable replica is not used."""
+        usable.return_value = False
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(FAQ), 'default')
+
+    def test_reads_in_transaction_use_primary(self, *mocks):
+        """Reads inside a transaction see the primary."""
+        with use_replica(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(FAQ), 'default')
+
+    def test_writes_go_to_primary(self, *mocks):
+        """Writes always go to the primary."""
+        self.assertEqual(self.router.db_for_write(FAQ), 'default')
+
+    def test_decorator_only_routes_safe_methods(self, *mocks):
+        """replica_reads leaves unsafe methods on the primary."""
+        @replica_reads
+        def view(request):
+            return self.router.db_for_read(FAQ)
+
+        self.assertEqual(view(self.factory.get('/')), 'replica')
+        self.assertIsNone(view(self.factory.post('/')))
+
+    @patch('apps.core.middleware.has_replica', return_value=True)
+    def test_own_write_pins_reads_to_primary(self, *mocks):
+        """After a write, the same request and later ones read the primary."""
+        @replica_reads
+        def view(request):
+            before = self.router.db_for_read(FAQ)
+            if request.GET.get('write'):
+                self.router.db_for_write(FAQ)
+            return HttpResponse(f'{before} {self.router.db_for_read(FAQ)}')
+
+        middleware = ReplicaStickinessMiddleware(view)
+        response = middleware(self.factory.get('/', {'write': 1}))
+        self.assertEqual(response.content, b'replica default')
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        request = self.factory.get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = response.cookies[REPLICA_PIN_COOKIE].value
+        self.assertEqual(middleware(request).content, b'default default')
+
+        request = self.factory.get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = str(int(time.time()) - 1)
+        self.assertEqual(middleware(request).content, b'replica replica')
+
+    def test_no_cookie_without_replica(self, *mocks):
+        """Writes are not tracked when no replica is configured."""
+        def view(request):
+            self.router.db_for_write(FAQ)
+            return HttpResponse()
+
+        response = ReplicaStickinessMiddleware(view)(self.factory.post('/'))
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+
+@override_settings(REPLICA_MAX_LAG=5, REPLICA_LAG_CHECK_INTERVAL=60)
+class ReplicaHealthTestCase(SimpleTestCase):
+    """Test cases for replication-lag checks."""
+
+    def setUp(self):
+        self.health = routers._ReplicaHealth()
+
+    def test_lag_within_limit(self):
+        """A replica within REPLICA_MAX_LAG is usable."""
+        with patch('apps.core.routers.get_replica_lag', return_value=1.5):
+            self.assertTrue(self.health.is_usable())
+
+    def test_lag_over_limit(self):
+        """A replica behind by more than REPLICA_MAX_LAG is not used."""
+        with patch('apps.core.routers.get_replica_lag', return_value=30.0):
+            self.assertFalse(self.health.is_usable())
+
+    def test_unreachable_replica(self):
+        """A replica whose lag cannot be read is not used."""
+        with patch('apps.core.routers.get_replica_lag', return_value=None):
+            self.assertFalse(self.health.is_usable())
+
+    def test_result_is_cached(self):
+        """Lag is checked at most once per REPLICA_LAG_CHECK_INTERVAL."""
+        with patch('apps.core.routers.get_replica_lag', return_value=0.0) as get_lag:
+            self.health.is_usable()
+            self.health.is_usable()
+        get_lag.assert_called_once()
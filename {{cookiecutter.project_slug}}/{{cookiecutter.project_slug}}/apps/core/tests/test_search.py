@@ -0,0 +1,80 @@
+"""
+Test cases for full-text search.
+"""
+from django.test import TestCase
+from apps.core.models import FAQ, Contact
+from apps.core.search import build_document, tokenize, search
+
+
+class TokenizeTestCase(TestCase):
+    """Test cases for the search tokenizer."""
+
+    def test_japanese_bigrams(self):
+        """Japanese text is split into overlapping bigrams."""
+        self.assertEqual(tokenize('パスワード'), ['パス', 'スワ', 'ワー', 'ード'])
+        self.assertEqual(tokenize('門'), ['門'])
+
+    def test_mixed_text_is_normalized(self):
+        """Full-width characters are normalized and words are lowercased."""
+        self.assertEqual(tokenize('ＤＪＡＮＧＯ入門 v5.2'), ['django', '入門', 'v5', '2'])
+
+    def test_document_keeps_trailing_character(self):
+        """Stored documents also index the last character of each Japanese run."""
+        self.assertEqual(build_document('Django入門'), 'django 入門 門')
+
+
+class SearchTestCase(TestCase):
+    """Test cases for searching SearchableModel querysets."""
+
+    def setUp(self):
+        self.password = FAQ.objects.create(
+            question='パスワードを忘れました',
+            answer='ログイン画面の「パスワードを忘れた方」から再設定できます。'
+        )
+        self.billing = FAQ.objects.create(
+            question='支払い方法を変更したい',
+            answer='設定画面から変更できます。',
+            category='billing'
+        )
+
+    def test_search_matches_japanese_substring(self):
+        """A Japanese word inside a sentence is found."""
+        self.assertEqual(list(search(FAQ.objects.all(), 'パスワード')), [self.password])
+        self.assertEqual(list(search(FAQ.objects.all(), '変更')), [self.billing])
+        self.assertEqual(list(search(FAQ.objects.all(), '存在しない語句')), [])
+
+    def test_search_ranks_better_matches_first(self):
+        """Rows with more matches rank higher."""
+        strong = FAQ.objects.create(
+            question='画面の表示を変えたい',
+            answer='設定画面の「画面表示」から変更できます。'
+        )
+        results = list(search(FAQ.objects.all(), '画面'))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], strong)
+        self.assertGreater(results[0].search_rank, results[-1].search_rank)
+
+    def test_single_character_matches_end_of_word(self):
+        """A one-character query also matches the last character of a word."""
+        faq = FAQ.objects.create(question='Django入門', answer='はじめての方へ')
+        self.assertEqual(list(search(FAQ.objects.all(), '門')), [faq])
+
+    def test_index_follows_updates_and_deletes(self):
+        """The index is updated incrementally on save and delete."""
+        self.billing.question = 'パスワードの変更方法'
+        self.billing.save(update_fields=['question'])
+        self.assertEqual(len(search(FAQ.objects.all(), 'パスワード')), 2)
+
+        self.password.delete()
+        self.assertEqual(list(search(FAQ.objects.all(), 'パスワード')), [self.billing])
+
+    def test_search_contact_by_email_prefix(self):
+        """Contacts can be found by a partial email address."""
+        contact = Contact.objects.create(
+            name='山田太郎',
+            email='yamada@example.com',
+            subject='請求書について',
+            message='請求書を再発行してください'
+        )
+        self.assertEqual(list(search(Contact.objects.all(), 'yamada@exam')), [contact])
+        self.assertEqual(list(search(Contact.objects.all(), '再発行')), [contact])
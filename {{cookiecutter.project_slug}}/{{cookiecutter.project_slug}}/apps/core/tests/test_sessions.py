@@ -0,0 +1,144 @@
+"""
+Test cases for the session engine.
+"""
+from unittest.mock import patch
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.base import UpdateError
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from apps.core.sessions import SIGNED_KEY_PREFIX, SessionStore
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-sessions'},
+    },
+    SESSION_ENGINE='apps.core.sessions',
+    SESSION_CACHE_ALIAS='sessions',
+    SESSION_REFRESH_RATIO=0.5,
+    SESSION_SIGNED_MAX_LENGTH=2048,
+)
+class SessionStoreTestCase(TestCase):
+    """Test cases for apps.core.sessions.SessionStore."""
+
+    def setUp(self):
+        self.cache = caches['sessions']
+        self.cache.clear()
+
+    def _signed_in(self):
+        session = SessionStore()
+        session[SESSION_KEY] = '1'
+        session['theme'] = 'dark'
+        session.save()
+        return session
+
+    def test_anonymous_session_is_a_signed_cookie(self):
+        """Anonymous sessions are carried in the key and never stored."""
+        session = SessionStore()
+        session['theme'] = 'dark'
+        session.save()
+
+        self.assertTrue(session.session_key.startswith(SIGNED_KEY_PREFIX))
+        self.assertFalse(self.cache.has_key(session.cache_key))
+        self.assertEqual(SessionStore(session.session_key)['theme'], 'dark')
+        self.assertFalse(session.exists(session.session_key))
+
+    def test_tampered_signed_key_is_rejected(self):
+        """A modified signed key loads as an empty session."""
+        session = SessionStore()
+        session['theme'] = 'dark'
+        session.save()
+
+        tampered = SessionStore(session.session_key[:-1] + 'x')
+        self.assertEqual(tampered.load(), {})
+        self.assertIsNone(tampered.session_key)
+
+    def test_large_anonymous_session_falls_back_to_cache(self):
+        """Anonymous data that does not fit a cookie is stored in the cache."""
+        with self.settings(SESSION_SIGNED_MAX_LENGTH=64):
+            session = SessionStore()
+            session['cart'] = list(range(100))
+            session.save()
+
+            self.assertFalse(session.session_key.startswith(SIGNED_KEY_PREFIX))
+            self.assertEqual(SessionStore(session.session_key)['cart'], list(range(100)))
+
+    def test_signed_in_session_moves_to_cache(self):
+        """Signing in replaces the signed key with a random cache key."""
+        session = SessionStore()
+        session['theme'] = 'dark'
+        session.save()
+        anonymous_key = session.session_key
+
+        session.cycle_key()
+        session[SESSION_KEY] = '1'
+        session.save()
+
+        self.assertNotEqual(session.session_key, anonymous_key)
+        self.assertFalse(session.session_key.startswith(SIGNED_KEY_PREFIX))
+        self.assertEqual(len(session.session_key), 32)
+        loaded = SessionStore(session.session_key)
+        self.assertEqual(loaded[SESSION_KEY], '1')
+        self.assertEqual(loaded['theme'], 'dark')
+
+    def test_large_session_is_compressed(self):
+        """Large payloads are stored compressed and load back intact."""
+        session = SessionStore()
+        session[SESSION_KEY] = '1'
+        session['history'] = ['/dashboard/'] * 200
+        session.save()
+
+        stored = self.cache.get(session.cache_key)
+        self.assertLess(len(stored), len(session.serializer().dumps(session._session)))
+        self.assertEqual(SessionStore(session.session_key)['history'], ['/dashboard/'] * 200)
+
+    def test_unchanged_session_is_not_rewritten(self):
+        """Saving an unmodified session skips the cache write."""
+        session = SessionStore(self._signed_in().session_key)
+        session.load()
+        with patch.object(self.cache, 'set') as cache_set:
+            session.save()
+        cache_set.assert_not_called()
+
+    def test_modified_session_is_written(self):
+        """Changing the data writes the session."""
+        session = SessionStore(self._signed_in().session_key)
+        session['theme'] = 'light'
+        session.save()
+        self.assertEqual(SessionStore(session.session_key)['theme'], 'light')
+
+    def test_session_near_expiry_is_refreshed(self):
+        """An unchanged session is rewritten once past the refresh ratio."""
+        session = SessionStore(self._signed_in().session_key)
+        session.load()
+        session._stored_at -= session.get_expiry_age()
+        with patch.object(self.cache, 'set', wraps=self.cache.set) as cache_set:
+            session.save()
+        cache_set.assert_called_once()
+
+    def test_update_after_logout_raises(self):
+        """Saving a session deleted elsewhere raises UpdateError."""
+        session = SessionStore(self._signed_in().session_key)
+        session['theme'] = 'light'
+        SessionStore(session.session_key).delete()
+        with self.assertRaises(UpdateError):
+            session.save()
+
+    def test_flush_removes_cached_session(self):
+        """Flushing deletes the cache entry."""
+        session = self._signed_in()
+        cache_key = session.cache_key
+        session.flush()
+        self.assertFalse(self.cache.has_key(cache_key))
+        self.assertIsNone(session.session_key)
+
+    def test_login_uses_cache_key(self):
+        """Logging in through the client stores the session in the cache."""
+        user = User.objects.create_user(username='sessionuser', email='session@example.com', password='pass12345')
+        self.client.force_login(user)
+        session_key = self.client.cookies['sessionid'].value
+        self.assertFalse(session_key.startswith(SIGNED_KEY_PREFIX))
+        self.assertTrue(SessionStore().exists(session_key))
@@ -0,0 +1,63 @@
+"""
+Test cases for core template tags.
+"""
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+from apps.core.context_processors import navigation
+
+
+class ActiveClassTestCase(TestCase):
+    """Test cases for the active_class tag."""
+
+    template = Template(
+        "{% raw %}{% load core_tags %}"
+        "{% active_class 'dashboard:index' 'on' %}|{% active_class 'index' 'on' %}|"
+        "{% active_class 'accounts:profile' 'on' %}{% endraw %}"
+    )
+
+    def test_matches_namespaced_and_plain_names(self):
+        """Both namespaced and plain URL names are matched."""
+        request = RequestFactory().get('/dashboard/')
+        output = self.template.render(Context(navigation(request)))
+        self.assertEqual(output, 'on|on|')
+
+    def test_url_is_resolved_once_per_request(self):
+        """All tags share a single resolve() call."""
+        request = RequestFactory().get('/dashboard/')
+        with patch('apps.core.context_processors.resolve', wraps=resolve) as mock_resolve:
+            self.template.render(Context({'request': request}))
+            self.template.render(Context({'request': request}))
+        self.assertEqual(mock_resolve.call_count, 1)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class NavigationFragmentCacheTestCase(TestCase):
+    """Test cases for the cached sidebar fragments."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='testuser', email='test@example.com', password='testpass123'
+        )
+
+    def render_sidebar(self, path):
+        request = RequestFactory().get(path)
+        request.user = self.user
+        return render_to_string('components/sidebar.html', {'user': self.user}, request=request)
+
+    def test_fragments_vary_by_url_and_user(self):
+        """The menu is cached per URL and the user block per user version."""
+        active = 'bg-gray-100 dark:bg-gray-700"'
+        self.assertIn(active, self.render_sidebar('/dashboard/'))
+        self.assertNotIn(active, self.render_sidebar('/accounts/profile/'))
+
+        self.user.email = 'changed@example.com'
+        self.user.save()
+        self.assertIn('changed@example.com', self.render_sidebar('/dashboard/'))
@@ -0,0 +1,137 @@
+"""
+Test cases for the two-tier cache backend.
+"""
+import time
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from apps.core import tiered_cache
+from apps.core.tiered_cache import get_cache_stats
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'tiered': {
+        'BACKEND': 'apps.core.tiered_cache.TieredCache',
+        'LOCATION': 'tiered',
+        'OPTIONS': {'REMOTE': 'remote', 'LOCAL_MAX_ENTRIES': 3, 'LOCAL_TIMEOUT': 60},
+    },
+    'remote': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-remote'},
+})
+class TieredCacheTestCase(SimpleTestCase):
+    """Test cases for TieredCache."""
+
+    def setUp(self):
+        tiered_cache._tiers.clear()
+        self.addCleanup(tiered_cache._tiers.clear)
+        self.cache = caches.create_connection('tiered')
+        self.remote = caches['remote']
+        self.remote.clear()
+
+    def test_hot_key_is_served_locally(self):
+        """Reads after the first one do not reach the shared cache."""
+        self.remote.set('version', 'v1')
+        self.assertEqual(self.cache.get('version'), 'v1')
+        with patch.object(type(self.remote), 'get') as remote_get:
+            self.assertEqual(self.cache.get('version'), 'v1')
+        remote_get.assert_not_called()
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['remote_hits'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+        self.assertEqual(stats['local_misses'], 1)
+
+    def test_set_writes_through(self):
+        """Writes go to the shared cache and refresh the local copy."""
+        self.cache.set('key', 'value')
+        self.assertEqual(self.remote.get('key'), 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.get_stats()['local_hits'], 1)
+
+    def test_miss(self):
+        """Missing keys return the default and count as misses in both tiers."""
+        self.assertEqual(self.cache.get('missing', 'default'), 'default')
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['local_misses'], 1)
+        self.assertEqual(stats['remote_misses'], 1)
+
+    def test_delete(self):
+        """Deleting removes the key from both tiers."""
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(self.remote.get('key'))
+
+    def test_local_copy_respects_timeout(self):
+        """The local copy never outlives the shared entry."""
+        self.cache.set('key', 'value', timeout=1)
+        with patch('apps.core.tiered_cache.time.time', return_value=time.time() + 2):
+            self.assertIsNone(self.cache._tier.get(self.cache._local_key('key', None)))
+
+    def test_lru_is_bounded(self):
+        """The least recently used key is evicted beyond LOCAL_MAX_ENTRIES."""
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key)
+        self.cache.get('a')
+        self.cache.set('d', 'd')
+        self.assertEqual(self.cache.get_stats()['local_entries'], 3)
+        self.assertIsNone(self.cache._tier.get(self.cache._local_key('b', None)))
+        self.assertIsNotNone(self.cache._tier.get(self.cache._local_key('a', None)))
+
+    def test_invalidation_message(self):
+        """A change published by another process drops the local copy."""
+        self.cache.set('key', 'v1')
+        self.remote.set('key', 'v2')
+        self.cache._tier.handle_message(f"other:{self.cache._local_key('key', None)}".encode())
+        self.assertEqual(self.cache.get('key'), 'v2')
+
+    def test_own_invalidation_is_ignored(self):
+        """A process ignores the invalidations it published itself."""
+        self.cache.set('key', 'v1')
+        self.cache._tier.handle_message(f"{self.cache._tier.origin}:{self.cache._local_key('key', None)}")
+        self.assertEqual(self.cache.get('key'), 'v1')
+        self.assertEqual(self.cache.get_stats()['local_hits'], 1)
+
+    def test_clear_all_message(self):
+        """A clear published by another process empties the local tier."""
+        self.cache.set('key', 'v1')
+        self.cache._tier.handle_message('other:*')
+        self.assertEqual(self.cache.get_stats()['local_entries'], 0)
+
+    def test_value_invalidated_during_read_is_not_cached(self):
+        """A value read while an invalidation arrives is not kept locally."""
+        self.remote.set('key', 'v1')
+        original_get = type(self.remote).get
+
+        def racing_get(remote, *args, **kwargs):
+            value = original_get(remote, *args, **kwargs)
+            self.cache._tier.handle_message('other:anything')
+            return value
+
+        with patch.object(type(self.remote), 'get', racing_get):
+            self.assertEqual(self.cache.get('key'), 'v1')
+        self.assertEqual(self.cache.get_stats()['local_entries'], 0)
+
+    def test_get_many(self):
+        """get_many serves local keys and fetches the rest in one call."""
+        self.cache.set('a', 1)
+        self.remote.set('b', 2)
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+        self.assertEqual(self.cache.get_many(['a', 'b']), {'a': 1, 'b': 2})
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['local_hits'], 3)
+        self.assertEqual(stats['remote_hits'], 1)
+        self.assertEqual(stats['remote_misses'], 1)
+
+    def test_incr(self):
+        """Counters are incremented in the shared cache."""
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertEqual(self.cache.get('counter'), 2)
+
+    def test_stats_per_cache(self):
+        """Statistics are reported per cache alias."""
+        self.cache.get('key')
+        self.assertIn('tiered', get_cache_stats())
+        self.assertEqual(get_cache_stats(reset=True)['tiered']['remote_misses'], 1)
+        self.assertEqual(get_cache_stats()['tiered']['remote_misses'], 0)
@@ -4,7 +4,8 @@ Test cases for Turnstile integration.
 from django.test import TestCase, override_settings
 from django import forms
 from unittest.mock import patch, Mock
-from apps.core.turnstile import TurnstileWidget, TurnstileField, TurnstileMixin
+from asgiref.sync import async_to_sync
+from apps.core.turnstile import TurnstileWidget, TurnstileField, TurnstileMixin, averify_turnstile
 
 
 class TurnstileWidgetTestCase(TestCase):
@@ -133,4 +134,48 @@ class TurnstileMixinTestCase(TestCase):
             form = self.TestForm()
             field = form.fields['turnstile']
             self.assertEqual(field.label, '')
-            self.assertEqual(field.help_text, 'Please verify you are human.')
\ No newline at end of file
+            self.assertEqual(field.help_text, 'Please verify you are human.')
+
+
+@override_settings(TESTING=False, TURNSTILE_SITE_KEY='test-site-key', TURNSTILE_SECRET_KEY='test-secret')
+class TurnstileAsyncTestCase(TestCase):
+    """Test cases for asynchronous Turnstile verification."""
+    
+    class TestForm(TurnstileMixin, forms.Form):
+        """Test form with TurnstileMixin."""
+        name = forms.CharField()
+    
+    @patch('requests.post')
+    def test_averify_without_httpx(self, mock_post):
+        """Test that verification falls back to a thread without httpx."""
+        mock_response = Mock()
+        mock_response.json.return_value = {'success': False, 'error-codes': ['timeout-or-duplicate']}
+        mock_post.return_value = mock_response
+        
+        with patch('apps.core.turnstile.httpx', None):
+            with self.assertRaises(forms.ValidationError) as cm:
+                async_to_sync(averify_turnstile)('token')
+        self.assertIn('CAPTCHA timeout or duplicate', str(cm.exception))
+    
+    @patch('requests.post')
+    @patch('apps.core.turnstile.averify_turnstile')
+    def test_prevalidated_token_is_not_verified_again(self, mock_averify, mock_post):
+        """Test that is_valid() reuses the async verification result."""
+        form = self.TestForm({'name': 'test', 'turnstile': 'valid-token'})
+        async_to_sync(form.averify_turnstile)()
+        
+        self.assertTrue(form.is_valid())
+        mock_averify.assert_called_once()
+        mock_post.assert_not_called()
+    
+    @patch('requests.post')
+    @patch('apps.core.turnstile.averify_turnstile')
+    def test_prevalidation_error_is_reported(self, mock_averify, mock_post):
+        """Test that an async verification failure becomes a field error."""
+        mock_averify.side_effect = forms.ValidationError('CAPTCHA verification failed.')
+        form = self.TestForm({'name': 'test', 'turnstile': 'bad-token'})
+        async_to_sync(form.averify_turnstile)()
+        
+        self.assertFalse(form.is_valid())
+        self.assertIn('CAPTCHA verification failed.', form.errors['turnstile'])
+        mock_post.assert_not_called()
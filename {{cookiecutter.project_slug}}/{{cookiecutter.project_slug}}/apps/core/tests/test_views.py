@@ -0,0 +1,49 @@
+"""
+Test cases for core views.
+"""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.core.models import Contact
+
+User = get_user_model()
+
+
+class ContactViewTestCase(TestCase):
+    """Test cases for the async contact form view."""
+
+    def setUp(self):
+        self.url = reverse('core:contact')
+        self.data = {
+            'name': '山田太郎',
+            'email': 'taro@example.com',
+            'subject': '料金について',
+            'message': 'プランについて教えてください。',
+        }
+
+    def test_form_renders(self):
+        """The form is rendered on GET."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/contact.html')
+
+    def test_submit_creates_contact(self):
+        """A valid submission is saved and redirects back."""
+        response = self.client.post(self.url, self.data)
+        self.assertRedirects(response, self.url)
+        contact = Contact.objects.get()
+        self.assertEqual(contact.subject, '料金について')
+        self.assertIsNone(contact.user)
+
+    def test_submit_links_logged_in_user(self):
+        """The logged-in user is attached to the contact."""
+        user = User.objects.create_user(username='taro', email='taro@example.com', password='testpass123')
+        self.client.force_login(user)
+        self.client.post(self.url, self.data)
+        self.assertEqual(Contact.objects.get().user, user)
+
+    def test_invalid_submission(self):
+        """Errors are shown and nothing is saved."""
+        response = self.client.post(self.url, {**self.data, 'email': 'invalid'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Contact.objects.exists())
@@ -0,0 +1,73 @@
+"""
+Test cases for process warm-up helpers.
+"""
+from unittest.mock import Mock, patch
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, TestCase, override_settings
+from apps.core import warmup
+from apps.core.warmup import precompile_templates, prime_url_resolvers, reset_after_fork
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader',
+            [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class PrecompileTemplatesTestCase(TestCase):
+    """Test cases for precompile_templates."""
+
+    def test_templates_are_cached(self):
+        """Project templates end up in the cached loader."""
+        self.assertGreater(precompile_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('components/sidebar.html', loader.get_template_cache)
+
+
+class WarmUpTestCase(SimpleTestCase):
+    """Test cases for the pre-fork warm-up helpers."""
+
+    def test_prime_url_resolvers(self):
+        """The root and namespaced resolvers are populated."""
+        self.assertGreater(prime_url_resolvers(), 1)
+
+    def test_reset_after_fork_detaches_inherited_connections(self):
+        """Inherited DB sockets are detached without being closed."""
+        inherited = Mock()
+        connection = Mock(connection=inherited, settings_dict={'OPTIONS': {}})
+        self.addCleanup(warmup._inherited_connections.clear)
+
+        with patch.object(warmup.connections, 'all', return_value=[connection]):
+            reset_after_fork()
+
+        self.assertIsNone(connection.connection)
+        connection.close.assert_not_called()
+        self.assertIn(inherited, warmup._inherited_connections)
+
+    def test_reset_after_fork_detaches_inherited_pool(self):
+        """An inherited connection pool is dropped without being closed."""
+        pool = Mock()
+        connection = Mock(
+            alias='default', connection=None,
+            settings_dict={'OPTIONS': {'pool': {'max_size': 1}}},
+            _connection_pools={'default': pool},
+        )
+        self.addCleanup(warmup._inherited_connections.clear)
+
+        with patch.object(warmup.connections, 'all', return_value=[connection]):
+            reset_after_fork()
+
+        self.assertEqual(connection._connection_pools, {})
+        pool.close.assert_not_called()
+        self.assertIn(pool, warmup._inherited_connections)
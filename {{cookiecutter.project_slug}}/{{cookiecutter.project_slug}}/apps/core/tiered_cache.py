@@ -0,0 +1,352 @@
+"""
+Two-tier cache backend.
+
+共有キャッシュ（Redis）の前段に、プロセス内の小さなLRUキャッシュを置く。
+頻繁に読まれる小さなキー（バージョン番号、集計値など）はネットワークを経由せずに返す。
+
+- プロセス内の値は LOCAL_TIMEOUT 秒、または共有キャッシュの有効期限の早い方で失効する
+- 書き込み・削除は共有キャッシュに反映した後、Redis の Pub/Sub で全プロセスに通知し、
+  各プロセスのLRUから該当キーを取り除く
+- Pub/Sub を購読できない間（接続断、Redis以外の共有キャッシュ）は、
+  LOCAL_TIMEOUT の短い有効期限だけで古い値を抑える
+
+設定例::
+
+    CACHES = {
+        "default": {
+            "BACKEND": "apps.core.tiered_cache.TieredCache",
+            "LOCATION": "default",  # プロセス内LRUと無効化チャンネルの名前
+            "OPTIONS": {"REMOTE": "redis", "LOCAL_MAX_ENTRIES": 1000, "LOCAL_TIMEOUT": 60},
+        },
+        "redis": {"BACKEND": "django_redis.cache.RedisCache", ...},
+    }
+"""
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+# プロセス内のLRU（キャッシュ名ごと）。バックエンドのインスタンスはスレッドごとに作られるため、モジュールで共有する
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+# 全キーを無効化する通知
+_CLEAR_ALL = '*'
+_RETRY_SECONDS = 5
+
+
+class LocalTier:
+    """
+    プロセス内のLRUキャッシュと無効化通知の購読
+    """
+
+    def __init__(self, name, max_entries, timeout, channel):
+        self.name = name
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.channel = channel
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        # 無効化通知を受けるたびに進める。共有キャッシュから読んでいる間に通知が届いた値は保存しない
+        self.generation = 0
+        self.pid = None
+        self.origin = None
+        self.listening = False
+        self.stats = dict.fromkeys(('local_hits', 'local_misses', 'remote_hits', 'remote_misses'), 0)
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key, pickled, expires_at, generation=None):
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.entries[key] = (pickled, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.generation += 1
+            if key == _CLEAR_ALL:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def count(self, stat):
+        self.stats[stat] += 1
+
+    def get_stats(self, reset=False):
+        stats = dict(self.stats, local_entries=len(self.entries), listening=self.listening)
+        if reset:
+            for name in self.stats:
+                self.stats[name] = 0
+        return stats
+
+    # -- 無効化通知 --
+
+    def ensure_listener(self, remote_alias):
+        """
+        このプロセスの購読スレッドを起動する（fork 後は子プロセスで起動し直す）
+        """
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            # 親プロセスから引き継いだ値は、購読を始めるまで使わない
+            self.pid = os.getpid()
+            self.origin = uuid.uuid4().hex
+            self.listening = False
+            self.entries.clear()
+        connection = _get_redis_connection(remote_alias)
+        if connection is None:
+            # Pub/Sub が使えない共有キャッシュ。LOCAL_TIMEOUT のみで古い値を抑える
+            self.listening = True
+            return
+        thread = threading.Thread(
+            target=self._listen, args=(connection,), name=f'tiered-cache-{self.name}', daemon=True
+        )
+        thread.start()
+
+    def _listen(self, connection):
+        while True:
+            try:
+                pubsub = connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.listening = True
+                for message in pubsub.listen():
+                    self.handle_message(message['data'])
+            except Exception:
+                logger.warning("キャッシュ無効化の購読が切断されました。再接続します", exc_info=True)
+            # 切断中の通知を取りこぼしているため、すべて捨てる
+            self.listening = False
+            self.discard(_CLEAR_ALL)
+            time.sleep(_RETRY_SECONDS)
+
+    def handle_message(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, key = data.partition(':')
+        if origin != self.origin:
+            self.discard(key)
+
+    def publish(self, remote_alias, key):
+        connection = _get_redis_connection(remote_alias)
+        if connection is None:
+            return
+        try:
+            connection.publish(self.channel, f'{self.origin}:{key}')
+        except Exception:
+            logger.warning("キャッシュ無効化を通知できませんでした: %s", key, exc_info=True)
+
+
+def _get_redis_connection(alias):
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return None
+    try:
+        return get_redis_connection(alias)
+    except NotImplementedError:
+        # django_redis 以外のバックエンド
+        return None
+
+
+class TieredCache(BaseCache):
+    """
+    プロセス内LRU + 共有キャッシュの2層キャッシュ
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._remote_alias = options['REMOTE']
+        # LOCATION でプロセス内LRUを識別する（LocMemCache と同様）
+        name = name or self._remote_alias
+        with _tiers_lock:
+            if name not in _tiers:
+                _tiers[name] = LocalTier(
+                    name,
+                    max_entries=int(options.get('LOCAL_MAX_ENTRIES', 1000)),
+                    timeout=float(options.get('LOCAL_TIMEOUT', 60)),
+                    channel=options.get('CHANNEL', f'tiered-cache:{name}'),
+                )
+            self._tier = _tiers[name]
+
+    @property
+    def remote(self):
+        return caches[self._remote_alias]
+
+    def _local_key(self, key, version):
+        return self.remote.make_and_validate_key(key, version=version)
+
+    def _local_expiry(self, timeout=DEFAULT_TIMEOUT):
+        expires_at = time.time() + self._tier.timeout
+        remote_expiry = self.remote.get_backend_timeout(timeout)
+        if remote_expiry is not None:
+            expires_at = min(expires_at, remote_expiry)
+        return expires_at
+
+    def _remote_expiry(self, key, version):
+        # 共有キャッシュの残り有効期限（取得できるバックエンドのみ）
+        ttl = getattr(self.remote, 'ttl', None)
+        if ttl is None:
+            return time.time() + self._tier.timeout
+        remaining = ttl(key, version=version)
+        if remaining is None:
+            return time.time() + self._tier.timeout
+        return time.time() + min(remaining, self._tier.timeout)
+
+    def _use_local(self):
+        self._tier.ensure_listener(self._remote_alias)
+        return self._tier.listening
+
+    def _remember(self, local_key, value, expires_at, generation=None):
+        if expires_at > time.time():
+            self._tier.set(local_key, pickle.dumps(value, self.pickle_protocol), expires_at, generation)
+
+    def _invalidate(self, local_key):
+        self._tier.discard(local_key)
+        self._tier.publish(self._remote_alias, local_key)
+
+    # -- 読み取り --
+
+    def get(self, key, default=None, version=None):
+        local_key = self._local_key(key, version)
+        use_local = self._use_local()
+        if use_local:
+            entry = self._tier.get(local_key)
+            if entry is not None:
+                self._tier.count('local_hits')
+                return pickle.loads(entry[0])
+            self._tier.count('local_misses')
+
+        generation = self._tier.generation
+        sentinel = object()
+        value = self.remote.get(key, sentinel, version=version)
+        if value is sentinel:
+            self._tier.count('remote_misses')
+            return default
+        self._tier.count('remote_hits')
+        if use_local:
+            self._remember(local_key, value, self._remote_expiry(key, version), generation)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        use_local = self._use_local()
+        for key in keys:
+            entry = self._tier.get(self._local_key(key, version)) if use_local else None
+            if entry is None:
+                missing.append(key)
+            else:
+                found[key] = pickle.loads(entry[0])
+        self._tier.stats['local_hits'] += len(found)
+        if not missing:
+            return found
+        if use_local:
+            self._tier.stats['local_misses'] += len(missing)
+
+        generation = self._tier.generation
+        fetched = self.remote.get_many(missing, version=version)
+        self._tier.stats['remote_hits'] += len(fetched)
+        self._tier.stats['remote_misses'] += len(missing) - len(fetched)
+        if use_local:
+            # 残り有効期限を個別に問い合わせず、LOCAL_TIMEOUT で失効させる
+            expires_at = time.time() + self._tier.timeout
+            for key, value in fetched.items():
+                self._remember(self._local_key(key, version), value, expires_at, generation)
+        found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        if self._use_local() and self._tier.get(self._local_key(key, version)) is not None:
+            return True
+        return self.remote.has_key(key, version=version)
+
+    # -- 書き込み --
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self._local_key(key, version)
+        self.remote.set(key, value, timeout, version=version)
+        self._invalidate(local_key)
+        if self._use_local():
+            self._remember(local_key, value, self._local_expiry(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.remote.add(key, value, timeout, version=version)
+        if added:
+            self._invalidate(self._local_key(key, version))
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.remote.set_many(data, timeout, version=version)
+        for key in data:
+            self._invalidate(self._local_key(key, version))
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        touched = self.remote.touch(key, timeout, version=version)
+        self._invalidate(self._local_key(key, version))
+        return touched
+
+    def delete(self, key, version=None):
+        deleted = self.remote.delete(key, version=version)
+        self._invalidate(self._local_key(key, version))
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        self.remote.delete_many(keys, version=version)
+        for key in keys:
+            self._invalidate(self._local_key(key, version))
+
+    def incr(self, key, delta=1, version=None):
+        value = self.remote.incr(key, delta, version=version)
+        self._invalidate(self._local_key(key, version))
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self.remote.decr(key, delta, version=version)
+        self._invalidate(self._local_key(key, version))
+        return value
+
+    def clear(self):
+        self.remote.clear()
+        self._invalidate(_CLEAR_ALL)
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
+
+    def get_stats(self, reset=False):
+        """
+        このプロセスの階層ごとのヒット・ミス数
+        """
+        return self._tier.get_stats(reset)
+
+
+def get_cache_stats(reset=False):
+    """
+    2層キャッシュの統計（キャッシュ名ごと、このプロセス分）
+    """
+    return {name: tier.get_stats(reset) for name, tier in _tiers.items()}
@@ -1,13 +1,92 @@
 """
 Cloudflare Turnstile integration for Django forms.
 """
-import os
 import requests
+from asgiref.sync import sync_to_async
 from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
+try:
+    import httpx
+except ImportError:  # httpx is only needed in async mode
+    httpx = None
+
+
+DEFAULT_VERIFY_URL = 'https://challenges.cloudflare.com/turnstile/v0/siteverify'
+VERIFY_TIMEOUT = 5
+
+
+def _get_secret_key():
+    secret_key = getattr(settings, 'TURNSTILE_SECRET_KEY', '')
+    if not secret_key:
+        raise ValidationError(_('Turnstile is not properly configured.'))
+    return secret_key
+
+
+def _check_result(result):
+    """Raise a ValidationError for an unsuccessful siteverify response."""
+    if result.get('success', False):
+        return
+    error_codes = result.get('error-codes', [])
+    if 'missing-input-secret' in error_codes:
+        raise ValidationError(_('Turnstile configuration error.'))
+    elif 'invalid-input-response' in error_codes:
+        raise ValidationError(_('Invalid CAPTCHA response.'))
+    elif 'timeout-or-duplicate' in error_codes:
+        raise ValidationError(_('CAPTCHA timeout or duplicate.'))
+    else:
+        raise ValidationError(_('CAPTCHA verification failed.'))
+
+
+def verify_turnstile(token, verify_url=None):
+    """
+    Verify a Turnstile token with Cloudflare, blocking until it answers.
+
+    Raises ValidationError if the token is not valid.
+    """
+    secret_key = _get_secret_key()
+    try:
+        response = requests.post(
+            verify_url or DEFAULT_VERIFY_URL,
+            data={
+                'secret': secret_key,
+                'response': token,
+            },
+            timeout=VERIFY_TIMEOUT
+        )
+        result = response.json()
+    except Exception:
+        raise ValidationError(_('Unable to verify CAPTCHA. Please try again.'))
+    _check_result(result)
+
+
+async def averify_turnstile(token, verify_url=None):
+    """
+    Asynchronous version of verify_turnstile().
+
+    Uses httpx so the event loop keeps serving other requests while
+    Cloudflare answers; falls back to a thread when httpx is missing.
+    """
+    if httpx is None:
+        return await sync_to_async(verify_turnstile)(token, verify_url=verify_url)
+
+    secret_key = _get_secret_key()
+    try:
+        async with httpx.AsyncClient(timeout=VERIFY_TIMEOUT) as client:
+            response = await client.post(
+                verify_url or DEFAULT_VERIFY_URL,
+                data={
+                    'secret': secret_key,
+                    'response': token,
+                },
+            )
+        result = response.json()
+    except Exception:
+        raise ValidationError(_('Unable to verify CAPTCHA. Please try again.'))
+    _check_result(result)
+
 
 class TurnstileWidget(forms.Widget):
     """Custom widget for Cloudflare Turnstile."""
@@ -38,11 +117,14 @@ class TurnstileField(forms.CharField):
         self.verify_url = kwargs.pop('verify_url', None) or getattr(
             settings, 
             'TURNSTILE_VERIFY_URL', 
-            'https://challenges.cloudflare.com/turnstile/v0/siteverify'
+            DEFAULT_VERIFY_URL
         )
         super().__init__(*args, **kwargs)
         self.required = True
         self.error_messages['required'] = _('Please complete the CAPTCHA.')
+        # Outcome of an earlier asynchronous verification (see TurnstileMixin.averify_turnstile)
+        self.verified_token = None
+        self.verification_error = None
     
     def clean(self, value):
         """Validate the Turnstile token."""
@@ -53,37 +135,13 @@ class TurnstileField(forms.CharField):
         if getattr(settings, 'TESTING', False):
             return value
         
-        # Get secret key
-        secret_key = getattr(settings, 'TURNSTILE_SECRET_KEY', '')
-        if not secret_key:
-            raise ValidationError(_('Turnstile is not properly configured.'))
-        
-        # Verify with Cloudflare
-        try:
-            response = requests.post(
-                self.verify_url,
-                data={
-                    'secret': secret_key,
-                    'response': value,
-                },
-                timeout=5
-            )
-            result = response.json()
-            
-            if not result.get('success', False):
-                error_codes = result.get('error-codes', [])
-                if 'missing-input-secret' in error_codes:
-                    raise ValidationError(_('Turnstile configuration error.'))
-                elif 'invalid-input-response' in error_codes:
-                    raise ValidationError(_('Invalid CAPTCHA response.'))
-                elif 'timeout-or-duplicate' in error_codes:
-                    raise ValidationError(_('CAPTCHA timeout or duplicate.'))
-                else:
-                    raise ValidationError(_('CAPTCHA verification failed.'))
-                    
-        except requests.RequestException:
-            raise ValidationError(_('Unable to verify CAPTCHA. Please try again.'))
+        # Already verified by an async view; tokens are single-use, so never verify twice
+        if value == self.verified_token:
+            return value
+        if self.verification_error is not None:
+            raise self.verification_error
         
+        verify_turnstile(value, verify_url=self.verify_url)
         return value
 
 
@@ -96,4 +154,22 @@ class TurnstileMixin:
             self.fields['turnstile'] = TurnstileField(
                 label='',
                 help_text=_('Please verify you are human.')
-            )
\ No newline at end of file
+            )
+    
+    async def averify_turnstile(self):
+        """
+        Verify the submitted token without blocking the event loop.
+
+        Call this from an async view before is_valid(); the field then
+        reuses the outcome instead of calling Cloudflare synchronously.
+        """
+        field = self.fields.get('turnstile')
+        token = self.data.get(self.add_prefix('turnstile')) if self.is_bound else None
+        if field is None or not token or getattr(settings, 'TESTING', False):
+            return
+        try:
+            await averify_turnstile(token, verify_url=field.verify_url)
+        except ValidationError as error:
+            field.verification_error = error
+        else:
+            field.verified_token = token
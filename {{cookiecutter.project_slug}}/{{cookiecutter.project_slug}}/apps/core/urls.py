@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    # 静的ページ（利用規約、プライバシーポリシー等）
+    path('pages/<slug:slug>/', views.page_detail, name='page_detail'),
+    # お問い合わせフォーム
+    path('contact/', views.contact, name='contact'),
+    # ヘルスチェック
+    path('health/', views.health, name='health'),
+]
@@ -8,6 +8,9 @@ from .files import (
     get_file_mime_type,
     validate_file_size,
     get_upload_to_path,
+    sniff_mime_type,
+    inspect_file,
+    FileContentValidator,
 )
 
 __all__ = [
@@ -22,4 +25,7 @@ __all__ = [
     'get_file_mime_type',
     'validate_file_size',
     'get_upload_to_path',
+    'sniff_mime_type',
+    'inspect_file',
+    'FileContentValidator',
 ]
\ No newline at end of file
@@ -3,9 +3,84 @@ File handling utility functions.
 """
 import os
 import hashlib
+import threading
+import zipfile
+from typing import NamedTuple
+from django.core.exceptions import ValidationError
+from django.utils.deconstruct import deconstructible
 from django.utils.text import slugify
 from django.utils import timezone
-import magic
+from django.utils.translation import gettext_lazy as _
+
+try:
+    import magic
+except ImportError:
+    magic = None
+
+# MIMEタイプの判定に使う先頭のバイト数
+SNIFF_BYTES = 8192
+
+# Office文書はMIMEタイプではなく構造で判定する（libmagic は正しいOffice文書にも
+# application/octet-stream などを返すことがあり、MIMEタイプでは実行ファイルと区別できない）
+# OOXML: ZIPのシグネチャ + [Content_Types].xml と本文のディレクトリ
+OOXML_PARTS = {'docx': 'word/', 'xlsx': 'xl/', 'pptx': 'ppt/'}
+# 旧形式（OLE複合ドキュメント）: 先頭のシグネチャ
+OLE_EXTENSIONS = {'doc', 'xls', 'ppt'}
+_ZIP_SIGNATURE = b'PK\x03\x04'
+_OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# 拡張子ごとに許可する内容のMIMEタイプ（libmagic と簡易判定の両方の結果を含める）
+CONTENT_TYPES = {
+    'pdf': {'application/pdf'},
+    'txt': {'text/plain'},
+    'csv': {'text/csv', 'text/plain', 'application/csv'},
+    'zip': {'application/zip'},
+    'rar': {'application/x-rar', 'application/vnd.rar', 'application/x-rar-compressed'},
+    'jpg': {'image/jpeg'},
+    'jpeg': {'image/jpeg'},
+    'png': {'image/png'},
+    'gif': {'image/gif'},
+    'svg': {'image/svg+xml', 'text/xml', 'application/xml'},
+    'webp': {'image/webp'},
+    'mp4': {'video/mp4'},
+    'avi': {'video/x-msvideo', 'video/avi'},
+    'mov': {'video/quicktime'},
+    'wmv': {'video/x-ms-asf', 'video/x-ms-wmv'},
+    'mp3': {'audio/mpeg'},
+    'wav': {'audio/x-wav', 'audio/wav'},
+    'ogg': {'audio/ogg', 'video/ogg', 'application/ogg'},
+}
+
+# python-magic（libmagic）が無い場合の簡易判定（先頭のバイト列）
+_SIGNATURES = [
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'PK\x05\x06', 'application/zip'),
+    (0, b'Rar!\x1a\x07', 'application/x-rar'),
+    (0, _OLE_SIGNATURE, 'application/x-ole-storage'),
+    (0, b'OggS', 'audio/ogg'),
+    (0, b'ID3', 'audio/mpeg'),
+    (0, b'\x30\x26\xb2\x75\x8e\x66\xcf\x11', 'video/x-ms-asf'),
+    (4, b'ftypqt', 'video/quicktime'),
+    (4, b'ftyp', 'video/mp4'),
+]
+_RIFF_TYPES = {b'WEBP': 'image/webp', b'WAVE': 'audio/x-wav', b'AVI ': 'video/x-msvideo'}
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+class FileInfo(NamedTuple):
+    """
+    ファイルの内容から求めた情報
+    """
+    mime_type: str
+    size: int
+    sha256: str
 
 
 def get_unique_filename(filename):
@@ -37,8 +112,7 @@ def get_file_mime_type(file_path):
         MIMEタイプ文字列
     """
     try:
-        mime = magic.Magic(mime=True)
-        return mime.from_file(file_path)
+        return _get_detector().from_file(file_path)
     except Exception:
         # python-magicが利用できない場合は拡張子から推測
         ext = os.path.splitext(file_path)[1].lower()
@@ -107,4 +181,149 @@ def get_upload_to_path(instance, filename, base_dir='uploads'):
         model_name,
         date_path,
         unique_filename
-    )
\ No newline at end of file
+    )
+
+
+def _get_detector():
+    """
+    MIMEタイプ判定用の magic.Magic（プロセスで1つを使い回す。python-magic は内部でロックする）
+    """
+    global _detector
+    if magic is None:
+        raise RuntimeError("python-magic is not installed")
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = magic.Magic(mime=True)
+    return _detector
+
+
+def sniff_mime_type(head):
+    """
+    ファイルの先頭のバイト列からMIMEタイプを判定
+
+    python-magic（libmagic）が無い場合は、主な形式のシグネチャで簡易判定する。
+
+    Args:
+        head: ファイルの先頭（SNIFF_BYTES バイト程度）
+
+    Returns:
+        MIMEタイプ文字列
+    """
+    if magic is not None:
+        try:
+            return _get_detector().from_buffer(head)
+        except Exception:
+            pass
+    if head[:4] == b'RIFF' and head[8:12] in _RIFF_TYPES:
+        return _RIFF_TYPES[head[8:12]]
+    for offset, signature, mime_type in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    if head[:2] == b'\xff\xfb' or head[:2] == b'\xff\xf3':
+        return 'audio/mpeg'
+    if b'\x00' in head:
+        return 'application/octet-stream'
+    text = head.decode('utf-8', errors='ignore').lstrip('\ufeff').lstrip().lower()
+    if '<svg' in text[:1024]:
+        return 'image/svg+xml'
+    return 'text/plain'
+
+
+def inspect_file(file):
+    """
+    ファイルを1回読み込み、MIMEタイプ・サイズ・SHA-256を求める
+
+    Djangoのアップロードファイルは chunks() で読むため、メモリ上の小さなファイルは
+    一時ファイルに書き出さずに処理できる。結果はファイルオブジェクトに保存し、
+    同じファイルを再度読み込まない。
+
+    Args:
+        file: File / UploadedFile / FieldFile
+
+    Returns:
+        FileInfo
+    """
+    target = getattr(file, '_file', None) or file
+    info = getattr(target, '_inspection', None)
+    if info is not None:
+        return info
+
+    digest = hashlib.sha256()
+    head = b''
+    size = 0
+    file.seek(0)
+    for chunk in file.chunks():
+        if len(head) < SNIFF_BYTES:
+            head += chunk[:SNIFF_BYTES - len(head)]
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+
+    info = FileInfo(sniff_mime_type(head), size, digest.hexdigest())
+    target._inspection = info
+    return info
+
+
+def _read_head(file, size):
+    file.seek(0)
+    head = file.read(size)
+    file.seek(0)
+    return head
+
+
+def is_ooxml(file, part):
+    """
+    OOXML（docx / xlsx / pptx）かどうか
+
+    ZIPのシグネチャで始まり、[Content_Types].xml と part（'word/' など）の
+    エントリを含む場合に True。ZIPの中央ディレクトリ（末尾）のみを読む。
+    """
+    if _read_head(file, len(_ZIP_SIGNATURE)) != _ZIP_SIGNATURE:
+        return False
+    try:
+        with zipfile.ZipFile(file) as archive:
+            names = archive.namelist()
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return False
+    finally:
+        file.seek(0)
+    return '[Content_Types].xml' in names and any(name.startswith(part) for name in names)
+
+
+def is_ole(file):
+    """
+    OLE複合ドキュメント（doc / xls / ppt）かどうか
+    """
+    return _read_head(file, len(_OLE_SIGNATURE)) == _OLE_SIGNATURE
+
+
+@deconstructible
+class FileContentValidator:
+    """
+    ファイルの内容が拡張子と一致するかを検証するバリデーター
+
+    Office文書は構造（is_ooxml / is_ole）、それ以外はMIMEタイプ（CONTENT_TYPES）で判定する。
+    保存済みのファイルは検証しない（ストレージから読み直さない）。
+    どちらにも無い拡張子は検証しない。
+    """
+    message = _("ファイルの内容が拡張子（%(extension)s）と一致しません。")
+    code = 'invalid_content'
+
+    def __call__(self, value):
+        if getattr(value, '_committed', False):
+            return
+        extension = os.path.splitext(value.name)[1][1:].lower()
+        if extension in OOXML_PARTS:
+            valid = is_ooxml(value, OOXML_PARTS[extension])
+        elif extension in OLE_EXTENSIONS:
+            valid = is_ole(value)
+        elif extension in CONTENT_TYPES:
+            valid = inspect_file(value).mime_type in CONTENT_TYPES[extension]
+        else:
+            return
+        if not valid:
+            raise ValidationError(self.message, code=self.code, params={'extension': extension})
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__)
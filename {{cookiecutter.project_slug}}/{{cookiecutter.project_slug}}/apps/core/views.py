@@ -1,3 +1,95 @@
-from django.shortcuts import render
+import os
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db import DatabaseError, connection
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.shortcuts import redirect, render
+from django.utils.cache import add_never_cache_headers, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_http_methods, require_safe
+
+from .dbpool import get_pool_stats
+from .forms import ContactForm
+from .page_cache import get_rendered_page
+from .tiered_cache import get_cache_stats
+
+
+@require_safe
+def page_detail(request, slug):
+    """
+    静的ページ
+
+    描画済みのHTMLをキャッシュから返す。ユーザーごとの内容を含めないこと。
+    """
+    rendered = get_rendered_page(slug)
+    if rendered is None:
+        raise Http404
+
+    body, encoding = rendered.select(request.headers.get('Accept-Encoding', ''))
+    etag = rendered.etag_for(encoding)
+    # If-None-Match は弱い比較（W/ を無視）で、複数のETagや * も受け付ける
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if '*' in if_none_match or etag in (tag.removeprefix('W/') for tag in if_none_match):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='text/html; charset=utf-8')
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(rendered.last_modified)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=300)
+    return response
+
+
+@require_http_methods(['GET', 'POST'])
+async def contact(request):
+    """
+    お問い合わせフォーム
+
+    Turnstileの検証（Cloudflareへの問い合わせ）を非同期で行うため、
+    ASGIではレスポンス待ちの間もワーカーが他のリクエストを処理できる。
+    """
+    if request.method == 'POST':
+        form = ContactForm(request.POST)
+        await form.averify_turnstile()
+        if await sync_to_async(form.is_valid)():
+            user = await request.auser()
+            if user.is_authenticated:
+                form.instance.user = user
+            await form.instance.asave()
+            messages.success(request, 'お問い合わせを受け付けました。')
+            return redirect('core:contact')
+    else:
+        form = ContactForm()
+
+    # コンテキストプロセッサがユーザーを参照するため、描画は同期コンテキストで行う
+    return await sync_to_async(render)(request, 'core/contact.html', {'form': form})
+
+
+@require_safe
+def health(request):
+    """
+    ヘルスチェック（ロードバランサー・監視用）
+
+    データベースに接続できるかを確認する。スタッフまたは INTERNAL_IPS からの
+    アクセスには、応答したワーカーのコネクションプール・2層キャッシュの統計も返す。
+    """
+    try:
+        connection.ensure_connection()
+    except DatabaseError:
+        data, status = {'status': 'error'}, 503
+    else:
+        data, status = {'status': 'ok'}, 200
+
+    if request.user.is_staff or request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS:
+        data['pid'] = os.getpid()
+        data['db_pools'] = get_pool_stats()
+        data['caches'] = get_cache_stats()
+
+    response = JsonResponse(data, status=status)
+    add_never_cache_headers(response)
+    return response
@@ -0,0 +1,163 @@
+"""
+Process warm-up helpers.
+
+gunicorn の preload_app でマスタープロセスに読み込んだ状態は、fork 後の
+ワーカーにコピーオンライトで共有される。ここで重い初期化を済ませておくと、
+max_requests で再起動したワーカーも最初のリクエストから速く応答できる。
+"""
+import gc
+import logging
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.autoreload import get_template_directories
+from django.urls import get_resolver
+
+from apps.core.dbpool import close_pools, detach_pools
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def precompile_templates():
+    """
+    プロジェクトとアプリの全テンプレートをコンパイルしてキャッシュする
+
+    キャッシュ付きローダー（本番設定）の場合のみ効果がある。
+
+    Returns:
+        コンパイルしたテンプレート数
+    """
+    compiled = 0
+    for directory in get_template_directories():
+        if not directory.is_dir():
+            continue
+        for path in directory.rglob('*'):
+            if path.suffix not in TEMPLATE_SUFFIXES or not path.is_file():
+                continue
+            name = path.relative_to(directory).as_posix()
+            for engine in engines.all():
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as exc:
+                    # 未インストールのタグライブラリを使う外部アプリのテンプレート等。実際の描画時に改めてエラーになる
+                    logger.debug("テンプレートをコンパイルできませんでした: %s (%s)", name, exc)
+                else:
+                    compiled += 1
+    return compiled
+
+
+def prime_url_resolvers():
+    """
+    URLconfを読み込み、逆引き用の辞書を名前空間ごとに構築する
+
+    ビューとシリアライザーのモジュールもここでインポートされる。
+
+    Returns:
+        構築したリゾルバー数
+    """
+    def populate(resolver):
+        resolver.reverse_dict  # noqa: B018  アクセス時に構築される
+        return 1 + sum(populate(child) for _prefix, child in resolver.namespace_dict.values())
+
+    return populate(get_resolver())
+
+
+def prime_models():
+    """
+    全モデルの _meta のフィールドキャッシュを構築
+    """
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    return len(models)
+
+
+def prime_serializers():
+    """
+    プロジェクトのDRFシリアライザーのフィールドを一度構築する
+
+    モデルのフィールド情報や遅延インポートされるバリデーター等が読み込まれる。
+
+    Returns:
+        構築したシリアライザー数
+    """
+    try:
+        from rest_framework.serializers import BaseSerializer
+    except ImportError:
+        return 0
+
+    primed = 0
+    pending = list(BaseSerializer.__subclasses__())
+    while pending:
+        serializer_class = pending.pop()
+        pending.extend(serializer_class.__subclasses__())
+        if not serializer_class.__module__.startswith('apps.'):
+            continue
+        try:
+            serializer_class().fields
+        except Exception as exc:
+            logger.debug("シリアライザーを構築できませんでした: %s (%s)", serializer_class.__qualname__, exc)
+        else:
+            primed += 1
+    return primed
+
+
+def warm_up():
+    """
+    fork前にマスタープロセスで実行するウォームアップ
+
+    URLリゾルバー、モデル、テンプレート、シリアライザーを構築したあと、
+    接続を閉じてからGCの対象外（gc.freeze）にする。以降のGCで共有ページに
+    書き込みが発生せず、ワーカーのRSSが増えにくくなる。
+
+    Returns:
+        {項目: 件数}
+    """
+    stats = {
+        'resolvers': prime_url_resolvers(),
+        'models': prime_models(),
+        'templates': precompile_templates(),
+        'serializers': prime_serializers(),
+    }
+    close_connections()
+    gc.collect()
+    gc.freeze()
+    return stats
+
+
+def close_connections():
+    """
+    データベースとキャッシュの接続を閉じる
+
+    fork 前のマスターで呼び出し、ソケットがワーカーに引き継がれないようにする。
+    引き継がれたソケットを子プロセスで使うと、同じ接続を複数のプロセスで共有してしまう。
+    """
+    connections.close_all()
+    close_pools()
+    caches.close_all()
+
+
+# fork 時に引き継いだDB接続・コネクションプール
+# （解放すると親プロセスのセッションまで終了させてしまうため参照を保持する）
+_inherited_connections = []
+
+
+def reset_after_fork():
+    """
+    fork 直後のワーカーで呼び出し、引き継いだ接続を使わないようにする
+
+    通常はマスターが fork 前に close_connections() で閉じているため何もしない。
+    DB接続を子プロセスで close() するとサーバーに終了を通知してしまうので、
+    閉じずに切り離し、次のクエリで新しい接続を張らせる。
+    キャッシュ（Redis）はソケットを閉じるだけなので通常どおり閉じる。
+    """
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            _inherited_connections.append(connection.connection)
+            connection.connection = None
+    _inherited_connections.extend(detach_pools())
+    caches.close_all()
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "dashboard"
+    name = "apps.dashboard"
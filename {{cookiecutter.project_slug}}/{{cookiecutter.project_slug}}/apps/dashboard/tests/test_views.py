@@ -164,4 +164,40 @@ class DashboardAPITestCase(TestCase):
         """Test that API requires authentication."""
         # Test a hypothetical API endpoint
         response = self.client.get('/api/dashboard/stats/')
-        self.assertIn(response.status_code, [302, 401, 403])  # Redirect or forbidden
\ No newline at end of file
+        self.assertIn(response.status_code, [302, 401, 403])  # Redirect or forbidden
+
+
+class DashboardStatsViewTestCase(TestCase):
+    """Test cases for the async dashboard stats and SSE views."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+    
+    def test_stats_requires_login(self):
+        """Test that stats require authentication."""
+        response = self.client.get(reverse('dashboard:stats'))
+        self.assertEqual(response.status_code, 302)
+    
+    def test_stats_returns_counts(self):
+        """Test that stats are returned as JSON."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard:stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_users'], 1)
+        self.assertEqual(response.json()['total_contacts'], 0)
+    
+    def test_events_sends_single_event_in_sync_mode(self):
+        """Test that the SSE stream closes after one event under WSGI."""
+        self.client.force_login(self.user)
+        with self.settings(SERVER_MODE='sync', DASHBOARD_EVENTS_INTERVAL=5):
+            response = self.client.get(reverse('dashboard:events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.startswith('retry: 5000\nevent: stats\n'))
+        self.assertIn('"total_users": 1', body)
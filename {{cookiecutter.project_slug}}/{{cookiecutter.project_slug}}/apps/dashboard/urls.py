@@ -8,4 +8,6 @@ app_name = 'dashboard'
 
 urlpatterns = [
     path('', views.dashboard_index, name='index'),
+    path('stats/', views.dashboard_stats, name='stats'),
+    path('events/', views.dashboard_events, name='events'),
 ]
\ No newline at end of file
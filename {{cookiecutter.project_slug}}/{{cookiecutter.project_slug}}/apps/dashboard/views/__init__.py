@@ -2,7 +2,10 @@
 Dashboard views package.
 """
 from .index import dashboard_index
+from .stats import dashboard_events, dashboard_stats
 
 __all__ = [
     'dashboard_index',
-]
\ No newline at end of file
+    'dashboard_stats',
+    'dashboard_events',
+]
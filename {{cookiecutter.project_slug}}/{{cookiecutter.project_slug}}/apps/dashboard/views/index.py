@@ -9,9 +9,11 @@ from datetime import timedelta
 
 from apps.accounts.models import User
 from apps.core.models import Contact
+from apps.core.routers import replica_reads
 
 
 @login_required
+@replica_reads
 def dashboard_index(request):
     """
     ダッシュボードのメインページ
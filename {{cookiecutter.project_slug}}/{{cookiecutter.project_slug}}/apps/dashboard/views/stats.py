@@ -0,0 +1,88 @@
+"""
+Dashboard statistics views (async).
+
+データベースやネットワークの待ち時間が中心のビューなので、ASGI（SERVER_MODE=async）
+で動かすとワーカーを占有せずに多数の接続を処理できる。WSGIでもそのまま動作する。
+"""
+import asyncio
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_safe
+
+from apps.accounts.models import User
+from apps.core.models import Contact
+from apps.core.routers import replica_reads, use_replica
+
+
+async def get_dashboard_stats():
+    """
+    ダッシュボードの集計値を取得
+    """
+    week_ago = timezone.now() - timedelta(days=7)
+    month_ago = timezone.now() - timedelta(days=30)
+    return {
+        'total_users': await User.objects.acount(),
+        'active_users': await User.objects.filter(last_login__gte=week_ago).acount(),
+        'new_users_this_month': await User.objects.filter(date_joined__gte=month_ago).acount(),
+        'total_contacts': await Contact.objects.acount(),
+        'new_contacts': await Contact.objects.filter(status='new').acount(),
+        'in_progress_contacts': await Contact.objects.filter(status='in_progress').acount(),
+    }
+
+
+@require_safe
+@login_required
+@replica_reads
+async def dashboard_stats(request):
+    """
+    ダッシュボードの集計値（JSON）
+    """
+    return JsonResponse(await get_dashboard_stats())
+
+
+@require_safe
+@login_required
+@replica_reads
+async def dashboard_events(request):
+    """
+    ダッシュボードの集計値を Server-Sent Events で配信
+
+    ASGIでは接続を保ったまま DASHBOARD_EVENTS_INTERVAL 秒ごとに送信する。
+    WSGIでは1件送って切断し、retry でクライアント（EventSource）に再接続させる。
+    """
+    interval = settings.DASHBOARD_EVENTS_INTERVAL
+    retry = f'retry: {interval * 1000}\n'
+    stats = await get_dashboard_stats()
+
+    first = f'{retry}event: stats\ndata: {json.dumps(stats)}\n\n'
+
+    async def stream(previous):
+        yield first
+        while True:
+            await asyncio.sleep(interval)
+            # ストリームはビューを抜けた後に送信されるため、ここで改めてレプリカを指定する
+            with use_replica():
+                stats = await get_dashboard_stats()
+            if stats != previous:
+                yield f'event: stats\ndata: {json.dumps(stats)}\n\n'
+                previous = stats
+            else:
+                # プロキシに接続を切られないよう、変化が無くてもコメントを送る
+                yield ': keep-alive\n\n'
+
+    if settings.SERVER_MODE == 'async':
+        content = stream(stats)
+    else:
+        content = [first]
+
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginxのバッファリングを無効化
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
@@ -0,0 +1,7 @@
+# Celery is optional; config/celery.py is removed when the project is generated without it.
+try:
+    from .celery import app as celery_app
+except ImportError:  # pragma: no cover
+    celery_app = None
+
+__all__ = ("celery_app",)
@@ -1,16 +1,35 @@
 """
 Gunicorn configuration file for production deployment.
 """
-import multiprocessing
 import os
 
+from dotenv import load_dotenv
+
+from config.server import get_server_mode, get_worker_count
+
+# Read SERVER_MODE etc. from the same .env file as the Django settings
+load_dotenv()
+
 # Server socket
 bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
+# SERVER_MODE=sync: WSGI with one request per process. Every outbound call
+#   (Turnstile, SMTP) or long-lived connection (SSE) holds a whole worker.
+# SERVER_MODE=async: ASGI on uvicorn workers. Each process multiplexes many
+#   connections on its event loop, so fewer processes (and less RAM) serve
+#   more concurrent clients.
+SERVER_MODE = get_server_mode()
+
+if SERVER_MODE == 'async':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'sync'
+# Also used to size the database connection pool (see config/server.py)
+workers = get_worker_count(SERVER_MODE)
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -46,8 +65,15 @@ proc_name = '{{ cookiecutter.project_slug }}'
 def post_fork(server, worker):
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
+    if server.cfg.preload_app:
+        from apps.core.warmup import reset_after_fork
+        reset_after_fork()
+
 def pre_fork(server, worker):
-    pass
+    # Never hand the master's sockets to a worker
+    if server.cfg.preload_app:
+        from apps.core.warmup import close_connections
+        close_connections()
 
 def pre_exec(server):
     server.log.info("Forked child, re-executing.")
@@ -55,6 +81,16 @@ def pre_exec(server):
 def when_ready(server):
     server.log.info("Server is ready. Spawning workers")
 
+    # With preload_app the application is already loaded in the master, so
+    # everything primed here is inherited by every (re)spawned worker.
+    if server.cfg.preload_app:
+        from apps.core.warmup import warm_up
+        stats = warm_up()
+        server.log.info(
+            "Warm-up done: %s",
+            ", ".join(f"{name}={count}" for name, count in stats.items()),
+        )
+
 def worker_int(worker):
     worker.log.info("worker received INT or QUIT signal")
 
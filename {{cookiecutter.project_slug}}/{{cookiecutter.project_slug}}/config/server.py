@@ -0,0 +1,60 @@
+"""
+Server worker model shared by config/gunicorn.py and the settings.
+
+Both sides need the same answer to "how many processes run on this host
+and how many requests does each serve at once": gunicorn to spawn the
+workers, the settings to size the per-process database connection pool.
+"""
+import multiprocessing
+import os
+
+
+def get_server_mode():
+    return os.getenv("SERVER_MODE", "sync")
+
+
+def get_worker_count(server_mode=None):
+    """
+    Number of gunicorn worker processes per host.
+
+    WEB_CONCURRENCY overrides the default of CPU * 2 + 1 sync workers or
+    CPU + 1 uvicorn workers.
+    """
+    server_mode = server_mode or get_server_mode()
+    workers = _getenv("WEB_CONCURRENCY", None)
+    if workers:
+        return int(workers)
+    if server_mode == "async":
+        return multiprocessing.cpu_count() + 1
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def get_db_pool_options(server_mode=None):
+    """
+    psycopg connection pool options for one worker process.
+
+    A sync worker handles one request at a time, so it never needs more
+    than one connection. An async worker runs many requests concurrently
+    and gets an equal share of DB_MAX_CONNECTIONS_PER_HOST. DB_POOL_MIN_SIZE
+    and DB_POOL_MAX_SIZE override the computed sizes.
+    """
+    server_mode = server_mode or get_server_mode()
+    if server_mode == "async":
+        budget = int(_getenv("DB_MAX_CONNECTIONS_PER_HOST", 40))
+        max_size = max(2, budget // get_worker_count(server_mode))
+    else:
+        max_size = 1
+    max_size = int(_getenv("DB_POOL_MAX_SIZE", max_size))
+    return {
+        "min_size": min(int(_getenv("DB_POOL_MIN_SIZE", 1)), max_size),
+        "max_size": max_size,
+        # Close connections idle for longer than this (seconds)
+        "max_idle": float(_getenv("DB_POOL_MAX_IDLE", 300)),
+        # Raise instead of queueing forever when the pool is exhausted
+        "timeout": float(_getenv("DB_POOL_TIMEOUT", 10)),
+    }
+
+
+def _getenv(name, default):
+    # Treat empty values in .env as unset
+    return os.getenv(name) or default
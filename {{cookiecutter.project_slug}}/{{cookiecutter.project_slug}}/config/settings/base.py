@@ -39,7 +39,6 @@ THIRD_PARTY_APPS = [
     "rest_framework",
     "django_filters",
     "django_extensions",
-    "django_browser_reload",
 ]
 
 LOCAL_APPS = [
@@ -52,13 +51,14 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.RateLimitMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django_browser_reload.middleware.BrowserReloadMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -74,12 +74,14 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "apps.core.context_processors.navigation",
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -94,6 +96,25 @@ DATABASES = {
     }
 }
 
+# Read replica
+# POSTGRES_REPLICA_HOST を設定すると、読み取り専用ビューのクエリをレプリカへ振り分ける
+# （apps/core/routers.py）。接続情報はホスト・ポート以外プライマリと同じ
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["apps.core.routers.ReplicaRouter"]
+# この秒数を超えて遅延しているレプリカは使わない
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+# レプリカの遅延を確認する間隔（秒）
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+# 書き込み後、そのクライアントの読み取りをプライマリに固定する秒数
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "15"))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -111,6 +132,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (apps/accounts/hashers.py)
+# 新しいハッシュには PASSWORD_HASHER のアルゴリズムを使い、他のアルゴリズムの既存ハッシュも検証できる。
+# コストは `python manage.py calibrate_password_hasher` で計測して決める（未設定ならDjangoの既定値）
+_PASSWORD_HASHERS = {
+    "argon2": "apps.accounts.hashers.Argon2PasswordHasher",
+    "scrypt": "apps.accounts.hashers.ScryptPasswordHasher",
+    "pbkdf2": "apps.accounts.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+PASSWORD_ARGON2_TIME_COST = os.getenv("PASSWORD_ARGON2_TIME_COST")
+PASSWORD_ARGON2_MEMORY_COST = os.getenv("PASSWORD_ARGON2_MEMORY_COST")  # KiB
+PASSWORD_ARGON2_PARALLELISM = os.getenv("PASSWORD_ARGON2_PARALLELISM")
+PASSWORD_SCRYPT_WORK_FACTOR = os.getenv("PASSWORD_SCRYPT_WORK_FACTOR")
+PASSWORD_PBKDF2_ITERATIONS = os.getenv("PASSWORD_PBKDF2_ITERATIONS")
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 LANGUAGE_CODE = os.getenv("LANGUAGE_CODE", "ja")
@@ -140,9 +179,25 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom user model
 AUTH_USER_MODEL = "accounts.User"
 
+# セッションからのユーザー取得をキャッシュ経由で行う（apps/accounts/user_cache.py）
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.CachedModelBackend"]
+# シグナルを発行しない変更（QuerySet.update など）がキャッシュに反映されるまでの秒数
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", "300"))
+
+# Avatars (apps/accounts/avatars.py)
+# アップロード後に生成する正方形のWebPの一辺（px）。表示サイズの2倍を目安にする
+AVATAR_SIZES = sorted(int(size) for size in os.getenv("AVATAR_SIZES", "64,160").split(","))
+AVATAR_WEBP_QUALITY = int(os.getenv("AVATAR_WEBP_QUALITY", "80"))
+
 # Sites framework
 SITE_ID = int(os.getenv("SITE_ID", "1"))
 
+# Sessions (apps.core.sessions)
+# 変更の無いセッションは、有効期限のこの割合を過ぎるまで書き直さない
+SESSION_REFRESH_RATIO = float(os.getenv("SESSION_REFRESH_RATIO", "0.5"))
+# 匿名セッションを署名付きCookieに載せる上限（超えた分はキャッシュに保存）
+SESSION_SIGNED_MAX_LENGTH = int(os.getenv("SESSION_SIGNED_MAX_LENGTH", "2048"))
+
 # Email configuration
 EMAIL_BACKEND = os.getenv(
     "EMAIL_BACKEND",
@@ -164,6 +219,16 @@ CELERY_ENABLE_UTC = True
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+CELERY_BEAT_SCHEDULE = {
+    "archive-contacts": {
+        "task": "apps.core.tasks.archive_contacts",
+        "schedule": 60 * 60 * 24,  # daily
+    },
+    "sync-publication-state": {
+        "task": "apps.core.tasks.sync_publication_state",
+        "schedule": 60,  # every minute
+    },
+}
 
 # Django REST Framework
 REST_FRAMEWORK = {
@@ -175,11 +240,44 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
+        "apps.api.filters.FullTextSearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "apps.api.throttling.SlidingWindowThrottle",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
+}
+
+# リバースプロキシの段数（X-Forwarded-For の右から数えたアドレスをクライアントIPとみなす）
+NUM_PROXIES = REST_FRAMEWORK["NUM_PROXIES"]
+# 一覧（API・管理画面）の総件数をキャッシュする秒数（apps/core/paginators.py）
+COUNT_CACHE_TIMEOUT = int(os.getenv("COUNT_CACHE_TIMEOUT", "60"))
+# 絞り込み無しでこの件数以上のテーブルは、PostgreSQLの統計情報の推定値を総件数とする
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+# 管理画面でこの件数を超えるテーブルは date_hierarchy を表示しない（年・月の集計で全件を走査するため）
+ADMIN_DATE_HIERARCHY_MAX_ROWS = int(os.getenv("ADMIN_DATE_HIERARCHY_MAX_ROWS", "100000"))
+
+# Rate limiting (apps/core/ratelimit.py)
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "True") == "True"
+RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND", "apps.core.ratelimit.MemoryBackend")
+# RedisBackend が使う django_redis のキャッシュ名
+RATELIMIT_CACHE_ALIAS = "redis"
+RATELIMIT_RATES = {
+    "login": "20/m",  # IPごと
+    "login-account": "10/15m",  # メールアドレスごと
+    "signup": "10/h",
+    "password-reset": "5/h",  # IP・メールアドレスごと
+    "password-change": "10/h",
+    "accounts": "60/m",  # /accounts/ への書き込み（RateLimitMiddleware）
+    "api": "300/m",  # ユーザーまたはIPごと
+}
+# RateLimitMiddleware で制限するパス（前方一致）とグループ
+RATELIMIT_PATHS = {
+    "/accounts/": "accounts",
+    "/admin/login/": "login",
 }
 
 # Internal IPs for django-browser-reload
@@ -201,6 +299,34 @@ ENABLE_SOCIAL_AUTH = os.getenv("ENABLE_SOCIAL_AUTH", "False") == "True"
 ENABLE_2FA = os.getenv("ENABLE_2FA", "False") == "True"
 MAINTENANCE_MODE = os.getenv("MAINTENANCE_MODE", "False") == "True"
 
+# Contact archive
+# 解決済み・クローズのお問い合わせをアーカイブテーブルへ移動するまでの日数
+CONTACT_ARCHIVE_AFTER_DAYS = int(os.getenv("CONTACT_ARCHIVE_AFTER_DAYS", "180"))
+CONTACT_ARCHIVE_BATCH_SIZE = int(os.getenv("CONTACT_ARCHIVE_BATCH_SIZE", "1000"))
+
+# Full-text search
+# PostgreSQLで全文検索に一致が無い場合にpg_trgmの類似度検索を行う
+SEARCH_TRIGRAM_FALLBACK = os.getenv("SEARCH_TRIGRAM_FALLBACK", "True") == "True"
+
+# Fragment cache
+# サイドバー・ヘッダーのフラグメントキャッシュの秒数
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "600"))
+
+# Rendered-page cache
+# 描画済みの静的ページをキャッシュする秒数（ページ更新時はバージョン切り替えで即時無効化）
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "86400"))
+# 設定するとページ更新時にnginx配信用の静的ファイルを書き出す（例: /home/app/<project>/page_export）
+PAGE_EXPORT_ROOT = os.getenv("PAGE_EXPORT_ROOT", "")
+
+# Server mode
+# sync: gunicorn sync workers (WSGI) / async: gunicorn + uvicorn workers (ASGI)
+# config/gunicorn.py も同じ環境変数を参照してワーカーの種類と数を切り替える
+SERVER_MODE = os.getenv("SERVER_MODE", "sync")
+if SERVER_MODE not in ("sync", "async"):
+    raise ValueError("SERVER_MODE must be 'sync' or 'async'")
+# ダッシュボードのSSEで集計値を送信する間隔（秒）
+DASHBOARD_EVENTS_INTERVAL = int(os.getenv("DASHBOARD_EVENTS_INTERVAL", "15"))
+
 # Logging
 LOGGING = {
     "version": 1,
@@ -16,6 +16,10 @@ if os.getenv("DJANGO_DEBUG_TOOLBAR", "True") == "True":
         "SHOW_TOOLBAR_CALLBACK": lambda request: DEBUG,
     }
 
+# Django Browser Reload (development only)
+INSTALLED_APPS += ["django_browser_reload"]
+MIDDLEWARE += ["django_browser_reload.middleware.BrowserReloadMiddleware"]
+
 # Email backend for development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
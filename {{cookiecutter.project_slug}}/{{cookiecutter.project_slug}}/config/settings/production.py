@@ -7,6 +7,21 @@ from .base import *
 # Security settings
 DEBUG = False
 
+# Templates
+# Keep compiled templates in memory. They are precompiled in the gunicorn
+# master (see config/gunicorn.py) and shared with workers copy-on-write.
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["debug"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
 # HTTPS/SSL Settings
 SECURE_SSL_REDIRECT = os.getenv("SECURE_SSL_REDIRECT", "True") == "True"
 SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "True") == "True"
@@ -28,22 +43,73 @@ if not ALLOWED_HOSTS or ALLOWED_HOSTS == [""]:
     raise ValueError("ALLOWED_HOSTS must be set in production")
 
 # Database connection pooling
-DATABASES["default"]["CONN_MAX_AGE"] = 60
+# DB_POOL=True keeps a psycopg connection pool in every worker process, sized
+# from the gunicorn worker model (see config/server.py). Requires psycopg[pool].
+# Otherwise fall back to persistent connections, which Django recommends
+# disabling under ASGI (each request's ORM calls run in their own thread).
+# The same applies to the read replica, if configured.
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+if DB_POOL:
+    from config.server import get_db_pool_options
+
+for database in DATABASES.values():
+    if DB_POOL:
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"] = {"pool": get_db_pool_options(SERVER_MODE)}
+    else:
+        database["CONN_MAX_AGE"] = 0 if SERVER_MODE == "async" else int(os.getenv("CONN_MAX_AGE", "60"))
+        # Check a reused connection before the first query of each request, so a
+        # connection dropped while idle fails over to a reconnect instead of a 500
+        database["CONN_HEALTH_CHECKS"] = True
 
 # Cache configuration with Redis
+# "default" keeps a small per-process LRU in front of Redis for hot keys;
+# other processes are told to drop changed keys via Redis pub/sub
+# (see apps/core/tiered_cache.py). "redis" is the shared cache itself.
 CACHES = {
     "default": {
+        "BACKEND": "apps.core.tiered_cache.TieredCache",
+        "LOCATION": "default",
+        "OPTIONS": {
+            "REMOTE": "redis",
+            "LOCAL_MAX_ENTRIES": int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000")),
+            "LOCAL_TIMEOUT": int(os.getenv("CACHE_LOCAL_TIMEOUT", "60")),
+        }
+    },
+    "redis": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         }
-    }
+    },
+    # Sessions get their own Redis (or at least their own DB) so that memory
+    # pressure on the general cache cannot evict them and log users out.
+    # Run that instance with maxmemory-policy noeviction.
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": os.getenv("SESSION_REDIS_URL")
+        or f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/2",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        }
+    },
 }
 
-# Session configuration with Redis
-SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-SESSION_CACHE_ALIAS = "default"
+# Session configuration
+# Signed-in sessions live in the "sessions" cache; anonymous ones are signed
+# cookies. Unchanged sessions are only rewritten once SESSION_REFRESH_RATIO of
+# their lifetime has passed, so saving on every request (sliding expiry) costs
+# no Redis write on most requests (see apps/core/sessions.py).
+SESSION_ENGINE = "apps.core.sessions"
+SESSION_CACHE_ALIAS = "sessions"
+SESSION_SAVE_EVERY_REQUEST = os.getenv("SESSION_SAVE_EVERY_REQUEST", "True") == "True"
+
+# Django runs behind nginx, so REMOTE_ADDR is always the proxy.
+# Rate limiting counts the client address nginx appends to X-Forwarded-For.
+NUM_PROXIES = int(os.getenv("NUM_PROXIES", "1"))
+REST_FRAMEWORK["NUM_PROXIES"] = NUM_PROXIES
+RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND", "apps.core.ratelimit.RedisBackend")
 
 # Email configuration for production
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -54,4 +54,6 @@ DEBUG = False
 # Disable Turnstile in tests
 TESTING = True
 TURNSTILE_SITE_KEY = ""
-TURNSTILE_SECRET_KEY = ""
\ No newline at end of file
+TURNSTILE_SECRET_KEY = ""
+# Rate limiting is tested explicitly (apps/core/tests/test_ratelimit.py)
+RATELIMIT_ENABLED = False
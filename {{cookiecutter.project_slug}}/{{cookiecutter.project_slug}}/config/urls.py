@@ -15,14 +15,16 @@ urlpatterns = [
     path("accounts/", include("apps.accounts.urls")),
     path("dashboard/", include("apps.dashboard.urls")),
     path("api/", include("apps.api.urls")),
+    path("", include("apps.core.urls")),
     
     # Root redirect to dashboard
     path("", RedirectView.as_view(url="/dashboard/", permanent=False)),
-    
-    # Django Browser Reload
-    path("__reload__/", include("django_browser_reload.urls")),
 ]
 
+# Django Browser Reload (installed in local settings only)
+if "django_browser_reload" in settings.INSTALLED_APPS:
+    urlpatterns += [path("__reload__/", include("django_browser_reload.urls"))]
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)